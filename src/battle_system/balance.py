@@ -0,0 +1,288 @@
+# battle_system/balance.py
+
+import argparse
+import copy
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+# Tuned table written by the balancer and read by the generators at runtime
+BALANCE_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'balance_table.json')
+
+TIERS = ("low", "mid", "high")
+
+# Hand-tuned defaults, used whenever no tuned table is present
+DEFAULT_BALANCE = {
+    "enemy": {
+        "health_ranges": {"low": [10, 30], "mid": [40, 80], "high": [80, 120]},
+        "evade_ch_ranges": {"low": [0, 5], "mid": [5, 10], "high": [10, 15]},
+        "crit_ch_ranges": {"low": [5, 8], "mid": [8, 12], "high": [12, 20]},
+        "armor_ranges": {"low": [0, 2], "mid": [2, 6], "high": [6, 12]},
+        # Per-cycle growth: stat * (1 + factor * cycle)
+        "cycle_factors": {"health": 0.2, "evade_ch": 0.1, "crit_ch": 0.1, "armor": 0.1},
+        # Growth per boss defeated within a cycle, on health, armor and damage: stat * (1 + factor * bosses)
+        "boss_factor": 0.2,
+    },
+    "weapon": {
+        "damage_ranges": {"low": [3, 6], "mid": [7, 12], "high": [13, 20]},
+        "value_ranges": {"low": [5, 10], "mid": [15, 25], "high": [30, 50]},
+        "cycle_factors": {"damage": 0.2, "value": 0.2},
+    },
+    # Per tier and cycle multipliers found by the balancer: {"low": {"1": {"health": 1.0, "damage": 1.0}}}
+    "tuned": {},
+}
+
+# Win rate and fight length (in rounds) the balancer aims for, per enemy tier
+DEFAULT_TARGETS = {
+    "low": {"win_rate": 0.95, "rounds": 3},
+    "mid": {"win_rate": 0.80, "rounds": 5},
+    "high": {"win_rate": 0.60, "rounds": 7},
+}
+
+# Hero level expected when meeting each tier, plus levels gained per cycle
+REFERENCE_LEVELS = {"low": 1, "mid": 3, "high": 5}
+LEVELS_PER_CYCLE = 2
+
+COUNTER_CHANCE = 20  # Mirrors Character.counter_ch
+MAX_ROUNDS = 100  # Fights still running after this many rounds count as a loss
+
+_balance_table = None
+
+
+def load_balance_table(path: str = BALANCE_TABLE_PATH) -> dict:
+    """Loads a balance table from disk, falling back to the defaults."""
+    table = copy.deepcopy(DEFAULT_BALANCE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        for section, values in loaded.items():
+            if isinstance(values, dict) and section in table:
+                table[section].update(values)
+            else:
+                table[section] = values
+    return table
+
+
+def get_balance_table() -> dict:
+    """Returns the active balance table, loading it on first use."""
+    global _balance_table
+    if _balance_table is None:
+        _balance_table = load_balance_table()
+    return _balance_table
+
+
+def set_balance_table(table: dict = None) -> None:
+    """Replaces the active balance table; None reloads it from disk on next use."""
+    global _balance_table
+    _balance_table = table
+
+
+def tuned_multipliers(table: dict, tier: str, cycle: int):
+    """Returns the (health, damage) multipliers for a tier and cycle.
+
+    Cycles past the last tuned one reuse the highest tuned cycle.
+    """
+    per_cycle = table["tuned"].get(tier)
+    if not per_cycle:
+        return 1.0, 1.0
+    known = [int(c) for c in per_cycle if int(c) <= cycle]
+    if not known:
+        return 1.0, 1.0
+    entry = per_cycle[str(max(known))]
+    return entry.get("health", 1.0), entry.get("damage", 1.0)
+
+
+def roll_enemy_stats(table: dict, tier: str, cycle: int, rng=random, boss_defeated: int = 0) -> dict:
+    """Rolls enemy stats for a tier and cycle, cycle and boss scaling included."""
+    enemy = table["enemy"]
+    factors = enemy["cycle_factors"]
+    level = 1 + enemy.get("boss_factor", 0.0) * boss_defeated
+    health = rng.randint(*enemy["health_ranges"][tier])
+    evade_ch = rng.randint(*enemy["evade_ch_ranges"][tier])
+    crit_ch = rng.randint(*enemy["crit_ch_ranges"][tier])
+    armor = rng.randint(*enemy["armor_ranges"][tier])
+
+    health_mult, damage_mult = tuned_multipliers(table, tier, cycle)
+    return {
+        "health": max(int(health * (1 + factors["health"] * cycle) * health_mult * level), 1),
+        "evade_ch": int(evade_ch * (1 + factors["evade_ch"] * cycle)),
+        "crit_ch": int(crit_ch * (1 + factors["crit_ch"] * cycle)),
+        "armor": int(armor * (1 + factors["armor"] * cycle) * level),
+        "damage_mult": damage_mult * level,
+    }
+
+
+def roll_weapon_stats(table: dict, tier: str, cycle: int, rng=random):
+    """Rolls weapon (damage, value) for a tier and cycle."""
+    weapon = table["weapon"]
+    factors = weapon["cycle_factors"]
+    damage = rng.randint(*weapon["damage_ranges"][tier])
+    value = rng.randint(*weapon["value_ranges"][tier])
+    return int(damage * (1 + factors["damage"] * cycle)), int(value * (1 + factors["value"] * cycle))
+
+
+def reference_hero(table: dict, tier: str, cycle: int):
+    """Builds the stats of the hero expected to face a tier at a given cycle.
+
+    Returns a (health, evade_ch, crit_ch, armor, damage) tuple following Hero.level_up,
+    wielding an average weapon of the same tier and cycle.
+    """
+    levels = REFERENCE_LEVELS[tier] - 1 + LEVELS_PER_CYCLE * cycle
+    low, high = table["weapon"]["damage_ranges"][tier]
+    damage = int((low + high) / 2 * (1 + table["weapon"]["cycle_factors"]["damage"] * cycle))
+    return 150 + 10 * levels, 10 + levels, 15 + levels, 5 + levels, damage
+
+
+def _swing(rng, damage, crit_ch, target_evade, target_armor) -> int:
+    """Resolves a single swing with Character.attack rules, returning damage dealt."""
+    if rng.randint(1, 100) <= target_evade:
+        return 0
+    min_damage = int(damage * 0.8)
+    max_damage = int(damage * 1.2)
+    if max_damage <= min_damage:
+        max_damage = min_damage + 1
+    dealt = rng.randint(min_damage, max_damage)
+    if rng.randint(1, 100) <= crit_ch:
+        dealt = int(dealt * 1.5)
+    return max(dealt - target_armor, 1)
+
+
+def simulate_fight(hero, enemy, rng, max_rounds: int = MAX_ROUNDS):
+    """Runs one headless fight between stat tuples, returning (hero_won, rounds).
+
+    Both tuples are (health, evade_ch, crit_ch, armor, damage). Each round the hero
+    attacks, then the enemy answers if alive; either side may counter-attack.
+    """
+    hero_hp, hero_ev, hero_cr, hero_ar, hero_dmg = hero
+    enemy_hp, enemy_ev, enemy_cr, enemy_ar, enemy_dmg = enemy
+
+    for rounds in range(1, max_rounds + 1):
+        enemy_hp -= _swing(rng, hero_dmg, hero_cr, enemy_ev, enemy_ar)
+        if enemy_hp > 0 and rng.randint(1, 100) <= COUNTER_CHANCE:
+            hero_hp -= _swing(rng, enemy_dmg, enemy_cr, hero_ev, hero_ar)
+        if hero_hp <= 0:
+            return False, rounds
+        if enemy_hp <= 0:
+            return True, rounds
+
+        hero_hp -= _swing(rng, enemy_dmg, enemy_cr, hero_ev, hero_ar)
+        if hero_hp > 0 and rng.randint(1, 100) <= COUNTER_CHANCE:
+            enemy_hp -= _swing(rng, hero_dmg, hero_cr, enemy_ev, enemy_ar)
+        if hero_hp <= 0:
+            return False, rounds
+        if enemy_hp <= 0:
+            return True, rounds
+    return False, max_rounds
+
+
+def evaluate_candidate(task):
+    """Simulates a batch of fights for one candidate (process pool entry point).
+
+    `task` is (table, tier, cycle, health_mult, damage_mult, fights, seed); returns
+    (win_rate, mean_rounds).
+    """
+    table, tier, cycle, health_mult, damage_mult, fights, seed = task
+    rng = random.Random(seed)
+    candidate = copy.deepcopy(table)
+    candidate["tuned"].setdefault(tier, {})[str(cycle)] = {"health": health_mult, "damage": damage_mult}
+
+    hero = reference_hero(candidate, tier, cycle)
+    wins = 0
+    total_rounds = 0
+    for _ in range(fights):
+        stats = roll_enemy_stats(candidate, tier, cycle, rng)
+        damage, _ = roll_weapon_stats(candidate, tier, cycle, rng)
+        enemy = (stats["health"], stats["evade_ch"], stats["crit_ch"], stats["armor"],
+                 int(damage * stats["damage_mult"]))
+        won, rounds = simulate_fight(hero, enemy, rng)
+        wins += won
+        total_rounds += rounds
+    return wins / fights, total_rounds / fights
+
+
+def score_candidate(win_rate: float, mean_rounds: float, target: dict) -> float:
+    """Scores a candidate against a target; lower is better."""
+    win_error = win_rate - target["win_rate"]
+    length_error = (mean_rounds - target["rounds"]) / target["rounds"]
+    return 4 * win_error * win_error + length_error * length_error
+
+
+def _grid(center: float, step: float, size: int = 3):
+    """Returns `2 * size + 1` positive multipliers spaced `step` apart around `center`."""
+    return [round(max(center + step * i, 0.1), 4) for i in range(-size, size + 1)]
+
+
+def tune(cycles=(0, 1, 2, 3), targets=None, fights: int = 300, workers: int = None,
+         refinements: int = 2, seed: int = 0, base_table: dict = None) -> dict:
+    """Searches health and damage multipliers per tier and cycle on a process pool.
+
+    Every (tier, cycle) pair starts from a coarse grid around 1.0 and is refined
+    around its best candidate `refinements` times. Returns the tuned table.
+    """
+    targets = targets or DEFAULT_TARGETS
+    table = copy.deepcopy(base_table or DEFAULT_BALANCE)
+    table["tuned"] = {}
+
+    keys = [(tier, cycle) for tier in TIERS for cycle in cycles]
+    best = {key: (1.0, 1.0) for key in keys}
+    step = 0.5
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for _ in range(refinements + 1):
+            tasks = []
+            for tier, cycle in keys:
+                health_center, damage_center = best[(tier, cycle)]
+                for health_mult in _grid(health_center, step):
+                    for damage_mult in _grid(damage_center, step):
+                        tasks.append((table, tier, cycle, health_mult, damage_mult, fights, seed))
+
+            scores = {}
+            for task, (win_rate, mean_rounds) in zip(tasks, pool.map(evaluate_candidate, tasks, chunksize=8)):
+                _, tier, cycle, health_mult, damage_mult, _, _ = task
+                score = score_candidate(win_rate, mean_rounds, targets[tier])
+                if (tier, cycle) not in scores or score < scores[(tier, cycle)][0]:
+                    scores[(tier, cycle)] = (score, health_mult, damage_mult, win_rate, mean_rounds)
+
+            for key, (_, health_mult, damage_mult, _, _) in scores.items():
+                best[key] = (health_mult, damage_mult)
+            step /= 3
+
+    for (tier, cycle), (_, health_mult, damage_mult, win_rate, mean_rounds) in sorted(scores.items()):
+        table["tuned"].setdefault(tier, {})[str(cycle)] = {
+            "health": health_mult,
+            "damage": damage_mult,
+            "win_rate": round(win_rate, 3),
+            "rounds": round(mean_rounds, 2),
+        }
+    return table
+
+
+def save_balance_table(table: dict, path: str = BALANCE_TABLE_PATH) -> None:
+    """Writes a balance table to disk as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune enemy tiers and New Game+ scaling by simulated combat.")
+    parser.add_argument("--cycles", type=int, nargs="+", default=[0, 1, 2, 3], help="Cycles to tune")
+    parser.add_argument("--fights", type=int, default=300, help="Simulated fights per candidate")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--refinements", type=int, default=2, help="Grid refinement passes")
+    parser.add_argument("--seed", type=int, default=0, help="Simulation seed")
+    parser.add_argument("--output", default=BALANCE_TABLE_PATH, help="Where to write the tuned table")
+    args = parser.parse_args(argv)
+
+    table = tune(cycles=args.cycles, fights=args.fights, workers=args.workers,
+                 refinements=args.refinements, seed=args.seed)
+    save_balance_table(table, args.output)
+    for tier, per_cycle in table["tuned"].items():
+        for cycle, entry in sorted(per_cycle.items(), key=lambda item: int(item[0])):
+            print(f"{tier:>4} cycle {cycle}: health x{entry['health']:.3f} damage x{entry['damage']:.3f} "
+                  f"-> win rate {entry['win_rate']:.0%}, {entry['rounds']:.1f} rounds")
+    print(f"Balance table written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
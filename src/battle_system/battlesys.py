@@ -129,7 +129,7 @@ class BattleSystem:
             return
 
         # For simplicity, we'll use the first item
-        item = self.hero.items.pop(0)
+        item = self.hero.items.take(0)
         if isinstance(item, Cure):
             item.use(self.hero)
         elif isinstance(item, Throwable):
@@ -150,7 +150,8 @@ class BattleSystem:
 
     def enemy_attack(self):
         """Handles the enemy's attack action."""
-        damage_info = self.enemy.attack(self.hero)
+        action = self.enemy.choose_action(self.hero)
+        damage_info = self.enemy.perform_action(action, self.hero)
         self.battle_log.append(damage_info)
 
     def calculate_experience(self, enemy):
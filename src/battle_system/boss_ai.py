@@ -0,0 +1,153 @@
+# battle_system/boss_ai.py
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from battle_system.character import Character
+    from battle_system.enemy import Boss
+
+WIN_VALUE = 10.0   # Value of a state where the hero is defeated
+LOSS_VALUE = -10.0  # Value of a state where the boss is defeated
+DISCOUNT = 0.95  # Per boss turn, so sooner wins and later losses are preferred
+
+
+class _BudgetExhausted(Exception):
+    """Raised inside the search when the per-turn node budget runs out."""
+
+
+def swing_outcomes(damage: float, crit_ch: int, evade_ch: int, armor: int,
+                   ignore_armor: bool = False, can_evade: bool = True) -> List[Tuple[float, int]]:
+    """Collapses one swing into (probability, damage) buckets: miss, hit and crit.
+
+    Mirrors Character.attack: a normal swing rolls between 80% and 120% of the weapon
+    damage, crits deal 150%, and armor reduces every hit to a minimum of 1.
+    """
+    min_damage = int(damage * 0.8)
+    max_damage = int(damage * 1.2)
+    if max_damage <= min_damage:
+        max_damage = min_damage + 1
+    armor = 0 if ignore_armor else armor
+    rolls = range(min_damage, max_damage + 1)
+    hit = round(sum(max(roll - armor, 1) for roll in rolls) / len(rolls))
+    crit = round(sum(max(int(roll * 1.5) - armor, 1) for roll in rolls) / len(rolls))
+
+    evade = evade_ch / 100 if can_evade else 0.0
+    crit_p = (1 - evade) * crit_ch / 100
+    outcomes = [(evade, 0), (1 - evade - crit_p, hit), (crit_p, crit)]
+    return [(p, dmg) for p, dmg in outcomes if p > 0]
+
+
+class BossAI:
+    """Expectimax action picker for bosses, bounded by a per-turn node budget.
+
+    The boss is a max node, every swing is a chance node and the hero is assumed to
+    answer each boss action with a normal attack. Search deepens one boss turn at a
+    time until the budget of expanded decision nodes runs out; the deepest completed
+    search decides. Values are kept in a transposition cache keyed on the compact
+    combat state, which is cleared for every decision.
+
+    Counting nodes instead of time keeps decisions a pure function of the combat
+    state, so a replayed fight plays out the same on any machine or load.
+    """
+
+    def __init__(self, boss: 'Boss', node_budget: int = 200, max_depth: int = 8):
+        self.boss = boss
+        self.node_budget = node_budget  # Decision nodes per turn, a few milliseconds of search
+        self.max_depth = max_depth
+        self.cache: Dict[tuple, float] = {}  # (state, depth) -> value, valid for one decision
+        self._stats_key = None
+        self._nodes_left = 0
+        self.last_depth = 0
+
+    def _prepare(self, hero: 'Character') -> None:
+        """Precomputes swing outcomes and leaf scales; redone whenever combat stats change."""
+        boss = self.boss
+        stats_key = (boss.weapon.damage, boss.crit_ch, boss.evade_ch, boss.armor, boss.health_max,
+                     hero.weapon.damage, hero.crit_ch, hero.evade_ch, hero.armor, hero.health_max)
+        if stats_key == self._stats_key:
+            return
+        self._stats_key = stats_key
+
+        self.actions = ["attack"] + [name for name in boss.skills if name in boss.skill_rules]
+        self.cooldowns = [0] + [boss.skill_rules[name]["cooldown"] for name in self.actions[1:]]
+        self.outcomes = [swing_outcomes(boss.weapon.damage, boss.crit_ch, hero.evade_ch, hero.armor)]
+        for name in self.actions[1:]:
+            rule = boss.skill_rules[name]
+            self.outcomes.append(swing_outcomes(boss.weapon.damage * rule["power"], boss.crit_ch,
+                                                hero.evade_ch, hero.armor,
+                                                ignore_armor=rule["ignore_armor"],
+                                                can_evade=rule["can_evade"]))
+        self.hero_outcomes = swing_outcomes(hero.weapon.damage, hero.crit_ch, boss.evade_ch, boss.armor)
+        self.boss_max = boss.health_max
+        self.hero_max = hero.health_max
+
+    def choose(self, hero: 'Character') -> str:
+        """Returns the best action name for the boss against `hero`."""
+        self._prepare(hero)
+        # Each decision searches from scratch, so the budget reaches the same depth whatever earlier turns cached
+        self.cache.clear()
+        self._nodes_left = self.node_budget
+
+        cooldowns = tuple(self.boss.skill_cooldowns.get(name, 0) for name in self.actions[1:])
+        state = (self.boss.health, hero.health, cooldowns)
+
+        best_action = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                # The first iteration only scores leaves, so it always completes
+                best_action = self._root(state, depth)
+                self.last_depth = depth
+            except _BudgetExhausted:
+                break
+        return self.actions[best_action]
+
+    def _root(self, state, depth) -> int:
+        best_index, best_value = 0, float("-inf")
+        for index in self._legal(state[2]):
+            value = self._action_value(state, index, depth)
+            if value > best_value:
+                best_index, best_value = index, value
+        return best_index
+
+    def _legal(self, cooldowns):
+        """Indexes of the actions that are off cooldown."""
+        return [0] + [i + 1 for i, remaining in enumerate(cooldowns) if remaining == 0]
+
+    def _action_value(self, state, index, depth) -> float:
+        """Expected value of playing action `index` followed by the hero's reply."""
+        boss_hp, hero_hp, cooldowns = state
+        # Cooldowns tick once per boss turn; the chosen skill is then locked out
+        next_cooldowns = tuple(
+            self.cooldowns[i + 1] if i + 1 == index else max(remaining - 1, 0)
+            for i, remaining in enumerate(cooldowns)
+        )
+        expected = 0.0
+        for p_boss, boss_damage in self.outcomes[index]:
+            new_hero_hp = hero_hp - boss_damage
+            if new_hero_hp <= 0:
+                expected += p_boss * WIN_VALUE
+                continue
+            for p_hero, hero_damage in self.hero_outcomes:
+                expected += p_boss * p_hero * DISCOUNT * self._value(
+                    (boss_hp - hero_damage, new_hero_hp, next_cooldowns), depth - 1)
+        return expected
+
+    def _value(self, state, depth) -> float:
+        """Value of a boss decision node, memoized per state and remaining depth."""
+        boss_hp, hero_hp, _ = state
+        if boss_hp <= 0:
+            return LOSS_VALUE
+        if depth == 0:
+            return boss_hp / self.boss_max - hero_hp / self.hero_max
+
+        key = (state, depth)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        self._nodes_left -= 1
+        if self._nodes_left < 0:
+            raise _BudgetExhausted()
+
+        value = max(self._action_value(state, index, depth) for index in self._legal(state[2]))
+        self.cache[key] = value
+        return value
@@ -7,6 +7,7 @@ from typing import Tuple, TYPE_CHECKING
 
 from battle_system.weapon import Weapon, generate_weapon
 from battle_system.health_bar import HealthBar
+from battle_system.combat_profile import CombatProfile
 
 if TYPE_CHECKING:
     from battle_system.enemy import Enemy
@@ -16,23 +17,49 @@ if TYPE_CHECKING:
 class Character(ABC):
     """Base class for all characters in the game."""
 
+    __slots__ = ("_profile", "_health_bar", "name", "health", "health_max", "evade_ch", "crit_ch", "armor", "weapon")
+
     counter_ch: int = 20  # Counter-attack chance percentage
+    health_bar_color = (0, 255, 0)  # Default health bar color
 
-    def __init__(self, name: str, health: int, evade_ch: int, crit_ch: int, armor: int) -> None:
+    def __init__(self, name: str, health: int, evade_ch: int, crit_ch: int, armor: int, weapon: Weapon = None) -> None:
+        self._profile = None  # Compiled CombatProfile, built on first use
+        self._health_bar = None  # Created on first use
         self.name = name
         self.health = health
         self.health_max = health
         self.evade_ch = evade_ch  # Evade chance percentage
         self.crit_ch = crit_ch  # Critical hit chance percentage
         self.armor = armor  # Damage reduction
-        self.weapon = generate_weapon("low")  # Default weapon
-        self.health_bar = HealthBar(self, color=(0, 255, 0))  # Default health bar color
+        self.weapon = weapon if weapon is not None else generate_weapon("low")  # Default weapon
 
     @property
     def alive(self) -> bool:
         """Returns True if the character is alive."""
         return self.health > 0
 
+    @property
+    def health_bar(self) -> HealthBar:
+        """Returns the health bar, creating it on first use."""
+        if self._health_bar is None:
+            self._health_bar = HealthBar(self, color=self.health_bar_color)
+        return self._health_bar
+
+    @health_bar.setter
+    def health_bar(self, health_bar: HealthBar) -> None:
+        self._health_bar = health_bar
+
+    @property
+    def profile(self) -> CombatProfile:
+        """Returns the compiled combat profile, building it if needed."""
+        if self._profile is None:
+            self._profile = CombatProfile.for_character(self)
+        return self._profile
+
+    def invalidate_profile(self) -> None:
+        """Drops the combat profile after the weapon, crit, evade or armor changed."""
+        self._profile = None
+
     def attack(self, target: 'Character', attack_type="normal", is_counter: bool = False) -> str:
         """Performs an attack on the target."""
         messages = []
@@ -41,7 +68,8 @@ class Character(ABC):
             messages.append(f"{self.name} cannot attack because they are defeated.")
             return "\n".join(messages)
 
-        if self.roll_event(target.evade_ch):
+        target_profile = target.profile
+        if self.roll_event(target_profile.evade_threshold):
             messages.append(f"{target.name} evaded the attack!")
             return "\n".join(messages)
 
@@ -49,7 +77,7 @@ class Character(ABC):
         damage_after_crit, crit_message = self.deal_crit(base_damage)
         if crit_message:
             messages.append(crit_message)
-        final_damage = max(damage_after_crit - target.armor, 1)
+        final_damage = target_profile.mitigate(damage_after_crit)
 
         target.take_damage(final_damage)
         messages.append(f"{self.name} attacked {target.name} with {self.weapon.name} for {final_damage} damage.")
@@ -64,10 +92,8 @@ class Character(ABC):
 
     def calculate_base_damage(self, attack_type="normal") -> int:
         """Calculates base damage based on attack type."""
-        min_damage = int(self.weapon.damage * 0.6) if attack_type == "quick" else int(self.weapon.damage * 0.8)
-        max_damage = int(self.weapon.damage * 1.5) if attack_type == "heavy" else int(self.weapon.damage * 1.2)
-        if max_damage <= min_damage:
-            max_damage = min_damage + 1
+        damage_ranges = self.profile.damage_ranges
+        min_damage, max_damage = damage_ranges.get(attack_type) or damage_ranges["normal"]
         return random.randint(min_damage, max_damage)
 
     @staticmethod
@@ -77,8 +103,9 @@ class Character(ABC):
 
     def deal_crit(self, base_damage: int) -> Tuple[int, str]:
         """Calculates critical hit damage."""
-        if self.roll_event(self.crit_ch):
-            crit_damage = int(base_damage * 1.5)
+        profile = self.profile
+        if self.roll_event(profile.crit_threshold):
+            crit_damage = profile.crit(base_damage)
             crit_message = f"Critical hit! {self.name} deals {crit_damage} damage!"
             return crit_damage, crit_message
         return base_damage, ""
@@ -87,4 +114,5 @@ class Character(ABC):
         """Applies damage to the character."""
         self.health -= damage
         self.health = max(self.health, 0)
-        self.health_bar.update()
\ No newline at end of file
+        if self._health_bar is not None:
+            self._health_bar.update()
\ No newline at end of file
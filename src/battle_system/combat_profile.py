@@ -0,0 +1,60 @@
+# battle_system/combat_profile.py
+
+from typing import Dict, List, Tuple
+
+# Damage range multipliers on the weapon damage per attack type: (min, max)
+ATTACK_TYPE_RANGES = {
+    "normal": (0.8, 1.2),
+    "quick": (0.6, 1.2),
+    "heavy": (0.8, 1.5),
+}
+CRIT_MULTIPLIER = 1.5
+TABLE_SIZE = 512  # Entries per lookup table; larger values are computed directly
+
+
+class CombatProfile:
+    """Derived combat numbers for a character, compiled once and reused for every swing.
+
+    Holds per-attack-type damage ranges, the crit and evade roll thresholds, the crit
+    damage for base rolls and an armor table mapping incoming raw damage to damage
+    taken. The tables cover the first TABLE_SIZE values, so a profile stays small however
+    strong the weapon. Owners rebuild it through Character.invalidate_profile() when
+    stats change.
+    """
+
+    __slots__ = ("damage_ranges", "crit_threshold", "evade_threshold", "armor", "crit_damage", "damage_taken")
+
+    def __init__(self, weapon_damage: int, crit_ch: int, evade_ch: int, armor: int) -> None:
+        self.damage_ranges: Dict[str, Tuple[int, int]] = {}
+        for attack_type, (low, high) in ATTACK_TYPE_RANGES.items():
+            min_damage = int(weapon_damage * low)
+            max_damage = int(weapon_damage * high)
+            if max_damage <= min_damage:
+                max_damage = min_damage + 1
+            self.damage_ranges[attack_type] = (min_damage, max_damage)
+
+        self.crit_threshold = crit_ch  # A roll of 1-100 at or below this crits
+        self.evade_threshold = evade_ch  # A roll of 1-100 at or below this evades
+        self.armor = armor
+
+        top_roll = max(high for _, high in self.damage_ranges.values())
+        self.crit_damage: List[int] = [int(roll * CRIT_MULTIPLIER) for roll in range(min(top_roll + 1, TABLE_SIZE))]
+        top_hit = int(top_roll * CRIT_MULTIPLIER)
+        self.damage_taken: List[int] = [max(raw - armor, 1) for raw in range(min(top_hit + 1, TABLE_SIZE))]
+
+    @classmethod
+    def for_character(cls, character) -> 'CombatProfile':
+        """Compiles the profile of a character from its current weapon and stats."""
+        return cls(character.weapon.damage, character.crit_ch, character.evade_ch, character.armor)
+
+    def crit(self, base_damage: int) -> int:
+        """Returns crit damage for a base roll."""
+        if 0 <= base_damage < len(self.crit_damage):
+            return self.crit_damage[base_damage]
+        return int(base_damage * CRIT_MULTIPLIER)
+
+    def mitigate(self, raw_damage: int) -> int:
+        """Returns the damage this character takes from a raw hit after armor (at least 1)."""
+        if 0 <= raw_damage < len(self.damage_taken):
+            return self.damage_taken[raw_damage]
+        return max(raw_damage - self.armor, 1)
@@ -7,6 +7,8 @@ import random
 
 from battle_system.character import Character
 from battle_system.weapon import Weapon, generate_weapon
+from battle_system.balance import get_balance_table, roll_enemy_stats
+from battle_system.boss_ai import BossAI
 from battle_system.item import create_item_from_name
 from battle_system.health_bar import HealthBar
 
@@ -61,43 +63,70 @@ enemy_names = {
     ]
 }
 
+TILE_SIZE = 16
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'assets')
+
+# Sprites shared by every enemy of a tier, keyed by (tier, size)
+_tier_images = {}
+
+
+def get_enemy_image(tier: str, size: int = TILE_SIZE):
+    """Returns the shared sprite for an enemy tier, loading and scaling it once."""
+    key = (tier, size)
+    image = _tier_images.get(key)
+    if image is None:
+        image_path = os.path.join(ASSETS_DIR, f"{tier}_enemy.png")
+        if os.path.exists(image_path):
+            image = pygame.image.load(image_path)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+        else:
+            print(f"Warning: Enemy image file {tier}_enemy.png not found.")
+            image = pygame.Surface((32, 32))
+            image.fill((255, 0, 255))  # Use magenta color to indicate missing texture
+        if size:
+            image = pygame.transform.scale(image, (size, size))  # Scale to tile size
+        _tier_images[key] = image
+    return image
+
+
 class Enemy(Character):
     """Enemy characters controlled by the game."""
 
+    __slots__ = ("tier", "pos", "underlying_tile", "image_filename")
+
+    health_bar_color = (255, 0, 0)
+
     def __init__(self, name: str, health: int, weapon: Weapon, evade_ch: int, crit_ch: int, armor: int, tier: str) -> None:
-        super().__init__(name=name, health=health, evade_ch=evade_ch, crit_ch=crit_ch, armor=armor)
-        self.weapon = weapon
-        self.health_bar = HealthBar(self, color=(255, 0, 0))
+        super().__init__(name=name, health=health, evade_ch=evade_ch, crit_ch=crit_ch, armor=armor, weapon=weapon)
         self.tier = tier  # Enemy's tier (low, mid, high)
         self.pos = None  # Position on the map
         self.underlying_tile = None  # Tile beneath the enemy (for map updates)
+        self.image_filename = f"{tier}_enemy.png"
 
-        assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'png')
-        
-        enemy_image_name = f"{self.tier}_enemy.png"
-        image_path = os.path.join(assets_dir, enemy_image_name)
-
-        TILE_SIZE = 16
+    @property
+    def image(self):
+        """Map sprite, shared by all enemies of the same tier."""
+        return get_enemy_image(self.tier)
 
-        # Load the enemy sprite image based on the tier
-        assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'png')
-        enemy_image_name = f"{self.tier}_enemy.png"
-        image_path = os.path.join(assets_dir, enemy_image_name)
-
-        if os.path.exists(image_path):
-            self.image = pygame.image.load(image_path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (TILE_SIZE, TILE_SIZE))  # Scale to tile size
-        else:
-            print(f"Warning: Enemy image file {enemy_image_name} not found.")
-            # Use a placeholder image if the specific enemy image is missing
-            self.image = pygame.Surface((32, 32))
-            self.image.fill((255, 0, 255))  # Use magenta color to indicate missing texture
+    @property
+    def sprite(self):
+        """Unscaled battle sprite, shared by all enemies of the same tier."""
+        return get_enemy_image(self.tier, size=0)
 
     def set_position(self, x: int, y: int, underlying_tile):
         """Sets the enemy's position on the map."""
         self.pos = (x, y)
         self.underlying_tile = underlying_tile
 
+    def choose_action(self, target=None) -> str:
+        """Chooses an action for the enemy to take; regular enemies always attack."""
+        return "attack"
+
+    def perform_action(self, action: str, target) -> str:
+        """Performs a chosen action against the target and returns the battle message."""
+        return self.attack(target)
+
     def drop_loot(self):
         """Defines the loot dropped by the enemy upon defeat."""
         return self.weapon
@@ -108,60 +137,34 @@ class Enemy(Character):
         self.health_max = self.health
         self.weapon.damage = int(self.weapon.damage * multiplier)
         self.armor = int(self.armor * multiplier)
+        self.invalidate_profile()
 
 
-def generate_enemy(tier: str, cycle: int = 0) -> Enemy:
-    """Generates an enemy based on the specified tier."""
+def generate_enemy(tier: str, cycle: int = 0, rng=random, boss_defeated: int = 0) -> Enemy:
+    """Generates an enemy based on the specified tier, using the active balance table.
+
+    Enemies grow stronger with the cycle and with the bosses already defeated in it.
+    Pass a seeded random.Random as `rng` to build the same enemy deterministically.
+    """
     names = enemy_names.get(tier)
     if not names:
         raise ValueError("Invalid tier for enemy generation")
-    name = choice(names)
-    health_ranges = {
-        "low": (10, 30),
-        "mid": (40, 80),
-        "high": (80, 120)
-    }
-    evade_ch_ranges = {
-        "low": (0, 5),
-        "mid": (5, 10),
-        "high": (10, 15)
-    }
-    crit_ch_ranges = {
-        "low": (5, 8),
-        "mid": (8, 12),
-        "high": (12, 20)
-    }
-    armor_ranges = {
-        "low": (0, 2),
-        "mid": (2, 6),
-        "high": (6, 12)
-    }
-
-    # Assign initial values
-    health = randint(*health_ranges[tier])
-    evade_ch = randint(*evade_ch_ranges[tier])
-    crit_ch = randint(*crit_ch_ranges[tier])
-    armor = randint(*armor_ranges[tier])
+    name = rng.choice(names)
 
-
-     # Scale stats based on cycle
-    health = int(health * (1 + 0.2 * cycle))
-    evade_ch = int(evade_ch * (1 + 0.1 * cycle))
-    crit_ch = int(crit_ch * (1 + 0.1 * cycle))
-    armor = int(armor * (1 + 0.1 * cycle))
-    weapon = generate_weapon(tier, cycle)
+    # Roll stats (cycle and boss scaling and tuned multipliers included)
+    stats = roll_enemy_stats(get_balance_table(), tier, cycle, rng, boss_defeated)
+    weapon = generate_weapon(tier, cycle, rng)
+    weapon.damage = int(weapon.damage * stats["damage_mult"])
     # Create the enemy with adjusted stats
     enemy = Enemy(
         name=name,
-        health=health,
+        health=stats["health"],
         weapon=weapon,
-        evade_ch=evade_ch,
-        crit_ch=crit_ch,
-        armor=armor,
+        evade_ch=stats["evade_ch"],
+        crit_ch=stats["crit_ch"],
+        armor=stats["armor"],
         tier=tier
     )
-    # Set image filename for the enemy based on tier
-    enemy.image_filename = f"{tier}_enemy.png"
     return enemy
 
 
@@ -169,10 +172,20 @@ def generate_enemy(tier: str, cycle: int = 0) -> Enemy:
 class Boss(Enemy):
     """Boss characters with special abilities."""
 
+    sprite = None  # Per-boss sprite loaded in __init__, replaces the shared tier sprite
+
+    # Skill rules: damage multiplier on the weapon, armor/evade handling and cooldown in boss turns
+    skill_rules = {
+        'Firestorm': {'power': 1.6, 'ignore_armor': True, 'can_evade': True, 'cooldown': 3},
+        'Tail Swipe': {'power': 0.9, 'ignore_armor': False, 'can_evade': False, 'cooldown': 2},
+    }
+
     def __init__(self, name, health, weapon, evade_ch, crit_ch, armor, tier, skills, drops):
         super().__init__(name, health, weapon, evade_ch, crit_ch, armor, tier)
         self.skills = skills
         self.drops = drops
+        self.skill_cooldowns = {name: 0 for name in skills}
+        self.ai = BossAI(self)
 
         # Load boss sprite
         try:
@@ -181,18 +194,38 @@ class Boss(Enemy):
             print("Warning: Boss sprite not found. Using default placeholder.")
             self.sprite = None
 
-    def choose_action(self):
-        """Chooses an action for the boss to take."""
-        # For now, the boss only attacks
-        actions = ["attack"]  # You can expand this list to include more actions like 'skill' in the future
-        return random.choice(actions)
-
-    def take_damage(self, damage):
-        """Reduces the boss's health by the specified damage."""
-        self.health -= damage
-        if self.health <= 0:
-            self.health = 0
-            self.alive = False
+    def choose_action(self, target=None):
+        """Chooses an action for the boss by expectimax lookahead against the target."""
+        if target is None or not self.skills:
+            return "attack"
+        return self.ai.choose(target)
+
+    def perform_action(self, action, target):
+        """Performs an attack or one of the boss skills against the target."""
+        # Skill cooldowns tick down once per boss turn
+        for name, remaining in self.skill_cooldowns.items():
+            self.skill_cooldowns[name] = max(remaining - 1, 0)
+        if action in self.skill_rules and action in self.skills:
+            return self.use_skill(action, target)
+        return self.attack(target)
+
+    def use_skill(self, name, target):
+        """Uses a boss skill on the target, putting it on cooldown."""
+        rule = self.skill_rules[name]
+        self.skill_cooldowns[name] = rule["cooldown"]
+
+        if rule["can_evade"] and self.roll_event(target.evade_ch):
+            return f"{self.name} used {name}, but {target.name} evaded it!"
+
+        base_damage = int(self.calculate_base_damage() * rule["power"])
+        damage, crit_message = self.deal_crit(base_damage)
+        if not rule["ignore_armor"]:
+            damage -= target.armor
+        damage = max(damage, 1)
+        target.take_damage(damage)
+
+        message = f"{self.name} used {name} on {target.name} for {damage} damage!"
+        return f"{crit_message}\n{message}" if crit_message else message
 
 boss_list = [
     {
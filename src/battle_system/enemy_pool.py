@@ -0,0 +1,182 @@
+# battle_system/enemy_pool.py
+
+import random
+from array import array
+
+from battle_system.balance import get_balance_table, roll_enemy_stats, roll_weapon_stats
+from battle_system.enemy import Enemy, enemy_names
+from battle_system.weapon import Weapon, weapon_display_name
+from battle_system.weapon_catalog import get_catalog
+
+TIER_NAMES = ("low", "mid", "high")
+TIER_IDS = {tier: tier_id for tier_id, tier in enumerate(TIER_NAMES)}
+
+
+class EnemyView:
+    """Lightweight handle on one enemy stored in an EnemyPool."""
+
+    __slots__ = ("pool", "index")
+
+    def __init__(self, pool: 'EnemyPool', index: int) -> None:
+        self.pool = pool
+        self.index = index
+
+    @property
+    def tier(self) -> str:
+        return TIER_NAMES[self.pool.tier_id[self.index]]
+
+    @property
+    def name(self) -> str:
+        return enemy_names[self.tier][self.pool.name_id[self.index]]
+
+    @property
+    def health(self) -> int:
+        return self.pool.health[self.index]
+
+    @property
+    def alive(self) -> bool:
+        return self.pool.health[self.index] > 0
+
+    @property
+    def pos(self):
+        return self.pool.x[self.index], self.pool.y[self.index]
+
+    @property
+    def weapon_name(self) -> str:
+        pool = self.pool
+        return weapon_display_name(get_catalog().names[pool.weapon_id[self.index]], pool.cycle[self.index])
+
+    def materialize(self) -> Enemy:
+        """Builds a full Enemy from the stored stats."""
+        return self.pool.materialize(self.index)
+
+
+class EnemyPool:
+    """Stores large enemy populations as parallel arrays instead of Enemy objects.
+
+    Slot `i` of every array describes one enemy; removed slots are recycled. Use
+    views for read access and materialize() when an enemy enters battle.
+
+    Game maps keep their few enemies as SpawnDescriptors in an OccupancyGrid; the
+    pool is for populations too large for per-enemy objects, such as simulations.
+    """
+
+    def __init__(self) -> None:
+        self.health = array('i')
+        self.health_max = array('i')
+        self.evade_ch = array('h')
+        self.crit_ch = array('h')
+        self.armor = array('h')
+        self.damage = array('i')
+        self.value = array('i')
+        self.tier_id = array('B')
+        self.cycle = array('H')  # New Game+ cycles keep counting past 255
+        self.name_id = array('H')
+        self.weapon_id = array('H')  # Weapon catalog id
+        self.x = array('h')
+        self.y = array('h')
+        self.live = bytearray()
+        self._free = []  # Recycled slot indexes
+        self._columns = (self.health, self.health_max, self.evade_ch, self.crit_ch, self.armor, self.damage,
+                         self.value, self.tier_id, self.cycle, self.name_id, self.weapon_id, self.x, self.y)
+
+    def __len__(self) -> int:
+        return len(self.live) - len(self._free)
+
+    def __iter__(self):
+        for index, live in enumerate(self.live):
+            if live:
+                yield EnemyView(self, index)
+
+    def _store(self, values) -> int:
+        """Writes one row of column values and returns its slot."""
+        if self._free:
+            index = self._free.pop()
+            for column, value in zip(self._columns, values):
+                column[index] = value
+            self.live[index] = 1
+        else:
+            index = len(self.live)
+            for column, value in zip(self._columns, values):
+                column.append(value)
+            self.live.append(1)
+        return index
+
+    def spawn(self, tier: str, cycle: int = 0, pos=(-1, -1), rng=random) -> int:
+        """Rolls a new enemy of a tier straight into the arrays and returns its slot."""
+        tier_id = TIER_IDS[tier]
+        table = get_balance_table()
+        name_id = rng.randrange(len(enemy_names[tier]))
+        stats = roll_enemy_stats(table, tier, cycle, rng)
+        weapon_id = get_catalog().sample(tier, rng)
+        damage, value = roll_weapon_stats(table, tier, cycle, rng)
+        damage = int(damage * stats["damage_mult"])
+        return self._store((stats["health"], stats["health"], stats["evade_ch"], stats["crit_ch"], stats["armor"],
+                            damage, value, tier_id, cycle, name_id, weapon_id, pos[0], pos[1]))
+
+    def add(self, enemy: Enemy) -> int:
+        """Stores an existing Enemy and returns its slot.
+
+        Raises ValueError for a weapon the catalog doesn't know, since the pool keeps only its catalog id.
+        """
+        tier_id = TIER_IDS[enemy.tier]
+        names = enemy_names[enemy.tier]
+        name_id = names.index(enemy.name) if enemy.name in names else 0
+        weapon_name = enemy.weapon.name.split('+')[0]
+        weapon_id = get_catalog().find(weapon_name)
+        if weapon_id is None:
+            raise ValueError(f"Weapon '{weapon_name}' is not in the weapon catalog")
+        x, y = enemy.pos if enemy.pos is not None else (-1, -1)
+        return self._store((enemy.health, enemy.health_max, enemy.evade_ch, enemy.crit_ch, enemy.armor,
+                            enemy.weapon.damage, enemy.weapon.value, tier_id, enemy.weapon.cycle,
+                            name_id, weapon_id, x, y))
+
+    def remove(self, index: int) -> None:
+        """Frees a slot for reuse."""
+        if self.live[index]:
+            self.live[index] = 0
+            self._free.append(index)
+
+    def move(self, index: int, x: int, y: int) -> None:
+        self.x[index] = x
+        self.y[index] = y
+
+    def view(self, index: int) -> EnemyView:
+        return EnemyView(self, index)
+
+    def materialize(self, index: int) -> Enemy:
+        """Builds a full Enemy (with weapon) from slot `index`."""
+        tier_id = self.tier_id[index]
+        tier = TIER_NAMES[tier_id]
+        cycle = self.cycle[index]
+        catalog = get_catalog()
+        weapon_id = self.weapon_id[index]
+        weapon = Weapon(
+            name=weapon_display_name(catalog.names[weapon_id], cycle),
+            weapon_type=catalog.weapon_type(weapon_id),
+            damage=self.damage[index],
+            value=self.value[index],
+            tier=tier,
+            cycle=cycle
+        )
+        enemy = Enemy(
+            name=enemy_names[tier][self.name_id[index]],
+            health=self.health_max[index],
+            weapon=weapon,
+            evade_ch=self.evade_ch[index],
+            crit_ch=self.crit_ch[index],
+            armor=self.armor[index],
+            tier=tier
+        )
+        enemy.health = self.health[index]
+        if self.x[index] >= 0:
+            enemy.pos = (self.x[index], self.y[index])
+        return enemy
+
+    def store_back(self, index: int, enemy: Enemy) -> None:
+        """Copies battle results (health) from a materialized enemy into its slot."""
+        self.health[index] = enemy.health
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the arrays."""
+        return sum(c.itemsize * len(c) for c in self._columns) + len(self.live)
@@ -4,17 +4,18 @@ import pygame
 from battle_system.character import Character
 from battle_system.weapon import Weapon
 from battle_system.health_bar import HealthBar
+from battle_system.inventory import Inventory
 
 
 class Hero(Character):
     """Player-controlled hero character."""
 
     def __init__(self, name: str, health: int):
-        super().__init__(name=name, health=health, evade_ch=10, crit_ch=15, armor=5)
+        super().__init__(name=name, health=health, evade_ch=10, crit_ch=15, armor=5,
+                         weapon=Weapon(name="Fists", weapon_type="blunt", damage=2, value=0))
         self.cashpile = 0
-        self.items = []         # Inventory for consumable items
+        self.items = Inventory()  # Stacks of consumable items
         self.equipment = []     # Inventory for equipment (armor, accessories)
-        self.weapon = Weapon(name="Fists", weapon_type="blunt", damage=2, value=0)
         self.health_bar = HealthBar(self, color=(0, 255, 0))
         self.player_pos = (1, 1)
         self.level = 1
@@ -45,6 +46,7 @@ class Hero(Character):
         self.evade_ch += 1
         self.crit_ch += 1
         self.armor += 1
+        self.invalidate_profile()
         print(f"{self.name} leveled up to level {self.level}!")
         print("Stats increased: Health +10, Evade Chance +1%, Crit Chance +1%, Armor +1")
 
@@ -55,6 +57,7 @@ class Hero(Character):
         print(f"Scrapped your previous weapon '{self.weapon.name}' for {self.weapon.value} gold.")
         # Equip the new weapon
         self.weapon = new_weapon
+        self.invalidate_profile()
         print(f"You equipped '{self.weapon.name}' (Tier: {self.get_weapon_tier(self.weapon)})")
 
     def get_weapon_tier(self, weapon: Weapon) -> str:
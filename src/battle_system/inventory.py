@@ -0,0 +1,82 @@
+# battle_system/inventory.py
+
+from array import array
+
+from battle_system.item import ITEM_REGISTRY, Item
+
+
+class Inventory:
+    """Consumable items held as stacks of registry prototypes.
+
+    Each stack is an item id with a count, so holding hundreds of potions costs one
+    counter instead of hundreds of objects. Stacks keep the order their item was first
+    added in, and indexes used by menus refer to stacks.
+    """
+
+    __slots__ = ("registry", "counts", "order")
+
+    def __init__(self, registry=ITEM_REGISTRY):
+        self.registry = registry
+        self.counts = array('I', [0]) * len(registry)  # Count per item id
+        self.order = []  # Item ids of the non-empty stacks
+
+    def __len__(self):
+        """Total number of items."""
+        return sum(self.counts)
+
+    def __bool__(self):
+        return bool(self.order)
+
+    def __iter__(self):
+        """Yields each stacked item once."""
+        for item_id in self.order:
+            yield self.registry.by_id(item_id)
+
+    def count(self, item) -> int:
+        """How many of an item are held; 0 for names the registry doesn't know."""
+        try:
+            item_id = self._id(item)
+        except KeyError:
+            return 0
+        return self.counts[item_id] if item_id < len(self.counts) else 0
+
+    def stacks(self):
+        """Returns (item, count) pairs in display order."""
+        return [(self.registry.by_id(item_id), self.counts[item_id]) for item_id in self.order]
+
+    def _id(self, item) -> int:
+        """Item id of a prototype or name; raises KeyError for an unknown name."""
+        if isinstance(item, Item):
+            return item.item_id
+        prototype = self.registry.get(item)
+        if prototype is None:
+            raise KeyError(item)
+        return prototype.item_id
+
+    def add(self, item, count: int = 1) -> None:
+        """Adds `count` of an item, given as prototype or name."""
+        item_id = self._id(item)
+        if item_id >= len(self.counts):
+            # Registry grew after this inventory was created
+            self.counts.extend([0] * (len(self.registry) - len(self.counts)))
+        if self.counts[item_id] == 0:
+            self.order.append(item_id)
+        self.counts[item_id] += count
+
+    def take(self, index: int) -> Item:
+        """Removes one item from the stack at `index` and returns its prototype."""
+        item_id = self.order[index]
+        self.counts[item_id] -= 1
+        if self.counts[item_id] == 0:
+            del self.order[index]
+        return self.registry.by_id(item_id)
+
+    def remove(self, item, count: int = 1) -> bool:
+        """Removes `count` of an item; returns False if there are not enough."""
+        if self.count(item) < count:
+            return False
+        item_id = self._id(item)
+        self.counts[item_id] -= count
+        if self.counts[item_id] == 0:
+            self.order.remove(item_id)
+        return True
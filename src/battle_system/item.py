@@ -1,38 +1,59 @@
-
-
 # battle_system/item.py
 
 import pygame
 import os
 
+ITEMS_ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'png', 'items')
+
+_item_images = {}  # Item name -> loaded image (or None), shared by every prototype and copy
+
+
+def get_item_image(name: str):
+    """Returns the shared image for an item, probing the disk only once per name."""
+    if name not in _item_images:
+        image_path = os.path.join(ITEMS_ASSETS_DIR, f"{name.lower().replace(' ', '_')}.png")
+        image = None
+        if os.path.exists(image_path):
+            image = pygame.image.load(image_path)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+        _item_images[name] = image
+    return _item_images[name]
+
+
 class Item:
-    """Base class for all items."""
+    """Base class for all items.
+
+    Items are immutable prototypes kept in the ItemRegistry; inventories and shops
+    hold references to them instead of building copies.
+    """
+
+    __slots__ = ("item_id", "name", "description", "tier", "value")
 
     def __init__(self, name: str, description: str, tier: str, value: int):
+        self.item_id = -1  # Assigned by the registry
         self.name = name
         self.description = description
         self.tier = tier
         self.value = value
-        self.image = self.load_image()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+    @property
+    def image(self):
+        return get_item_image(self.name)
 
     def use(self, target):
         """Defines what happens when the item is used."""
         pass
 
-    def load_image(self):
-        """Loads the item's image."""
-        assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'png', 'items')
-        image_path = os.path.join(assets_dir, f"{self.name.lower().replace(' ', '_')}.png")
-        if os.path.exists(image_path):
-            return pygame.image.load(image_path).convert_alpha()
-        else:
-            # Return a default image or None
-            return None
-
 
 class Cure(Item):
     """Cure items that heal the target."""
 
+    __slots__ = ("heal_percent",)
+
     heal_percentages = {
         "small": 15,
         "mids": 30,
@@ -56,6 +77,8 @@ class Cure(Item):
 class Throwable(Item):
     """Throwable items that deal damage to the enemy."""
 
+    __slots__ = ("damage",)
+
     def __init__(self, name: str, description: str, tier: str, value: int, damage: int):
         super().__init__(name, description, tier, value)
         self.damage = damage
@@ -66,64 +89,91 @@ class Throwable(Item):
         print(f"{target.name} took {self.damage} damage from {self.name}!")
 
 
+cure_names = {
+    "small": "Small Health Potion",
+    "mids": "Medium Health Potion",
+    "midh": "Strong Health Potion",
+    "large": "Large Health Potion",
+    "superior": "Superior Health Potion"
+}
+cure_values = {"small": 10, "mids": 20, "midh": 35, "large": 50, "superior": 75}
+
+throwable_names = {
+    "small": "Throwing Knife",
+    "mids": "Bomb",
+    "midh": "Fire Flask",
+    "large": "Poison Dart",
+    "superior": "Explosive Charge"
+}
+throwable_damage = {"small": 10, "mids": 20, "midh": 35, "large": 50, "superior": 75}
+
+# Item names stocked by the item shop, in display order
+ITEM_SHOP_STOCK = ("Small Health Potion", "Medium Health Potion", "Strong Health Potion", "Throwing Knife", "Bomb")
+
+
+class ItemRegistry:
+    """Holds one prototype per item, looked up by name or by id."""
+
+    def __init__(self):
+        self.items = []  # Prototype per item id
+        self.by_name = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def register(self, item: Item) -> Item:
+        """Adds a prototype and assigns its id; names must be unique."""
+        if item.name in self.by_name:
+            raise ValueError(f"Item '{item.name}' is already registered")
+        item.item_id = len(self.items)
+        self.items.append(item)
+        self.by_name[item.name] = item
+        return item
+
+    def get(self, name: str, default=None):
+        return self.by_name.get(name, default)
+
+    def by_id(self, item_id: int) -> Item:
+        return self.items[item_id]
+
+
+def build_item_registry() -> ItemRegistry:
+    """Builds the registry with every cure and throwable."""
+    registry = ItemRegistry()
+    for tier, name in cure_names.items():
+        description = f"Heals {Cure.heal_percentages.get(tier, 0)}% of max health."
+        registry.register(Cure(name, description, tier, cure_values[tier]))
+    for tier, name in throwable_names.items():
+        damage = throwable_damage[tier]
+        registry.register(Throwable(name, "Deals damage to an enemy.", tier, damage, damage))  # Value equals damage
+    return registry
+
+
+ITEM_REGISTRY = build_item_registry()
+_shop_stock = None
+
+
+def get_item_shop_stock() -> tuple:
+    """Returns the item shop stock, resolved from the registry once."""
+    global _shop_stock
+    if _shop_stock is None:
+        _shop_stock = tuple(ITEM_REGISTRY.get(name) for name in ITEM_SHOP_STOCK)
+    return _shop_stock
+
+
 def generate_cure(tier: str) -> Cure:
-    """Generates a cure item based on the tier."""
-    cure_names = {
-        "small": "Small Health Potion",
-        "mids": "Medium Health Potion",
-        "midh": "Strong Health Potion",
-        "large": "Large Health Potion",
-        "superior": "Superior Health Potion"
-    }
-    name = cure_names.get(tier, "Unknown Potion")
-    description = f"Heals {Cure.heal_percentages.get(tier, 0)}% of max health."
-    value = {
-        "small": 10,
-        "mids": 20,
-        "midh": 35,
-        "large": 50,
-        "superior": 75
-    }.get(tier, 0)
-    return Cure(name, description, tier, value)
+    """Returns the cure item of a tier."""
+    return ITEM_REGISTRY.get(cure_names.get(tier))
 
 
 def generate_throwable(tier: str) -> Throwable:
-    """Generates a throwable item based on the tier."""
-    throwable_names = {
-        "small": "Throwing Knife",
-        "mids": "Bomb",
-        "midh": "Fire Flask",
-        "large": "Poison Dart",
-        "superior": "Explosive Charge"
-    }
-    name = throwable_names.get(tier, "Unknown Throwable")
-    description = "Deals damage to an enemy."
-    damage = {
-        "small": 10,
-        "mids": 20,
-        "midh": 35,
-        "large": 50,
-        "superior": 75
-    }.get(tier, 0)
-    value = damage  # For simplicity, value equals damage
-    return Throwable(name, description, tier, value, damage)    
+    """Returns the throwable item of a tier."""
+    return ITEM_REGISTRY.get(throwable_names.get(tier))
+
 
 def create_item_from_name(name):
-    """Creates an item instance based on the item name."""
-    # Map item names to generated items
-    name_to_item = {
-        # Cures
-        "Small Health Potion": generate_cure("small"),
-        "Medium Health Potion": generate_cure("mids"),
-        "Strong Health Potion": generate_cure("midh"),
-        "Large Health Potion": generate_cure("large"),
-        "Superior Health Potion": generate_cure("superior"),
-        # Throwables
-        "Throwing Knife": generate_throwable("small"),
-        "Bomb": generate_throwable("mids"),
-        "Fire Flask": generate_throwable("midh"),
-        "Poison Dart": generate_throwable("large"),
-        "Explosive Charge": generate_throwable("superior"),
-        # Add more items as needed
-    }
-    return name_to_item.get(name)
\ No newline at end of file
+    """Returns the item prototype with that name, or None if there is no such item."""
+    return ITEM_REGISTRY.get(name)
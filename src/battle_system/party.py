@@ -0,0 +1,122 @@
+# battle_system/party.py
+
+import random
+from array import array
+from typing import List
+
+HEROES = 0
+ENEMIES = 1
+
+
+class PartyBattle:
+    """Several heroes against an enemy group, resolved one batched round at a time.
+
+    Combat stats are copied into parallel arrays when the battle starts. Every round
+    each side scores all opposing targets in one pass, spreads its attackers over
+    them, resolves every swing against the arrays and applies the damage at once.
+    Counter-attacks are not part of group rounds.
+    """
+
+    def __init__(self, heroes: list, enemies: list, rng=random):
+        self.combatants = list(heroes) + list(enemies)
+        self.n_heroes = len(heroes)
+        self.rng = rng
+        self.round = 0
+
+        profiles = [c.profile for c in self.combatants]
+        self.side = bytearray([HEROES] * len(heroes) + [ENEMIES] * len(enemies))
+        self.health = array('i', (c.health for c in self.combatants))
+        self.health_max = array('i', (c.health_max for c in self.combatants))
+        self.armor = array('i', (p.armor for p in profiles))
+        self.evade = array('i', (p.evade_threshold for p in profiles))
+        self.crit = array('i', (p.crit_threshold for p in profiles))
+        self.dmg_min = array('i', (p.damage_ranges["normal"][0] for p in profiles))
+        self.dmg_max = array('i', (p.damage_ranges["normal"][1] for p in profiles))
+
+    def alive_indexes(self, side: int) -> List[int]:
+        """Indexes of the living combatants on one side."""
+        health, sides = self.health, self.side
+        return [i for i in range(len(sides)) if sides[i] == side and health[i] > 0]
+
+    @property
+    def finished(self) -> bool:
+        return not self.alive_indexes(HEROES) or not self.alive_indexes(ENEMIES)
+
+    @property
+    def heroes_won(self) -> bool:
+        return self.finished and bool(self.alive_indexes(HEROES))
+
+    def _assign_targets(self, attackers: List[int], targets: List[int]) -> List[int]:
+        """Assigns each attacker a target, focusing fire and spreading once a kill is covered.
+
+        Targets are scored by the hits needed to drop them from the side's average swing,
+        with stronger hitters ranked as bigger threats.
+        """
+        health, armor, evade = self.health, self.armor, self.evade
+        dmg_min, dmg_max = self.dmg_min, self.dmg_max
+        average_swing = sum(dmg_min[a] + dmg_max[a] for a in attackers) / (2 * len(attackers))
+
+        expected = [max(average_swing - armor[t], 1) * (100 - evade[t]) / 100 for t in targets]
+        scores = [health[t] / max(hit, 0.01) - dmg_max[t] / 100 for t, hit in zip(targets, expected)]
+        order = sorted(range(len(targets)), key=scores.__getitem__)
+
+        projected = [health[targets[k]] for k in order]
+        assignments = []
+        slot = 0
+        for a in attackers:
+            assignments.append(targets[order[slot]])
+            projected[slot] -= expected[order[slot]]
+            # Move on to the next target once this one is expected to fall
+            if projected[slot] <= 0 and slot + 1 < len(order):
+                slot += 1
+        return assignments
+
+    def resolve_round(self) -> List[str]:
+        """Resolves one round for both sides and returns the log lines."""
+        if self.finished:
+            return []
+        self.round += 1
+        rng = self.rng
+        health, armor, evade, crit = self.health, self.armor, self.evade, self.crit
+        dmg_min, dmg_max = self.dmg_min, self.dmg_max
+        incoming = array('i', [0]) * len(health)
+        log = []
+
+        for side, other in ((HEROES, ENEMIES), (ENEMIES, HEROES)):
+            attackers = self.alive_indexes(side)
+            targets = self.alive_indexes(other)
+            if not attackers or not targets:
+                continue
+            for a, t in zip(attackers, self._assign_targets(attackers, targets)):
+                attacker, target = self.combatants[a], self.combatants[t]
+                if rng.randint(1, 100) <= evade[t]:
+                    log.append(f"{target.name} evaded {attacker.name}'s attack!")
+                    continue
+                damage = rng.randint(dmg_min[a], dmg_max[a])
+                if rng.randint(1, 100) <= crit[a]:
+                    damage = int(damage * 1.5)
+                damage = max(damage - armor[t], 1)
+                incoming[t] += damage
+                log.append(f"{attacker.name} hit {target.name} for {damage} damage.")
+
+        # Damage lands simultaneously for the whole round
+        for i, damage in enumerate(incoming):
+            if damage:
+                health[i] = max(health[i] - damage, 0)
+                if health[i] == 0:
+                    log.append(f"{self.combatants[i].name} has been defeated!")
+        self.sync()
+        return log
+
+    def sync(self) -> None:
+        """Writes health back to the combatant objects."""
+        for combatant, hp in zip(self.combatants, self.health):
+            if combatant.health != hp:
+                combatant.health = hp
+                combatant.health_bar.update()
+
+    def run(self, max_rounds: int = 200) -> bool:
+        """Resolves rounds until one side falls, returning True if the heroes won."""
+        while not self.finished and self.round < max_rounds:
+            self.resolve_round()
+        return self.heroes_won
@@ -0,0 +1,172 @@
+# battle_system/weapon_catalog.py
+
+import os
+import random
+import re
+import struct
+from array import array
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CATALOG_SOURCE = os.path.join(PROJECT_ROOT, 'docs', 'weapons_600_list.txt')
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__', 'weapon_catalog.bin')
+
+TIERS = ("low", "mid", "high")
+
+_CACHE_MAGIC = b'WCAT'
+_CACHE_VERSION = 1
+# magic, version, source mtime_ns, source size, weapon count, string table size
+_CACHE_HEADER = struct.Struct('<4sHqqII')
+
+_SECTION_RE = re.compile(r'^(low|mid|high)_tier_weapons_(norm|nat)\s*=\s*\[')
+_WEAPON_RE = re.compile(r'Weapon\(name="([^"]+)",\s*weapon_type="([^"]+)"\)')
+
+
+class WeaponCatalog:
+    """Every weapon template from the weapon list, indexed by tier, type and natural flag.
+
+    Templates are identified by an integer id; names, types and tiers are stored in
+    parallel arrays. The index arrays are built once, so sampling is a single choice.
+    """
+
+    def __init__(self, names, type_names, type_ids, tier_ids, natural):
+        self.names = names  # Weapon name per id
+        self.type_names = type_names  # Weapon type name per type id
+        self.type_ids = type_ids  # array('B'): type id per weapon id
+        self.tier_ids = tier_ids  # array('B'): tier index per weapon id
+        self.natural = natural  # bytearray: 1 for natural weapons (claws, breath...)
+
+        self.by_tier = {tier: array('H') for tier in TIERS}
+        self.by_tier_type = {}
+        self.by_tier_natural = {}
+        self.by_tier_type_natural = {}
+        self.ids_by_name = {}
+        for weapon_id, name in enumerate(names):
+            tier = TIERS[tier_ids[weapon_id]]
+            weapon_type = type_names[type_ids[weapon_id]]
+            self.by_tier[tier].append(weapon_id)
+            is_natural = bool(natural[weapon_id])
+            self.by_tier_type.setdefault((tier, weapon_type), array('H')).append(weapon_id)
+            self.by_tier_natural.setdefault((tier, is_natural), array('H')).append(weapon_id)
+            self.by_tier_type_natural.setdefault((tier, weapon_type, is_natural), array('H')).append(weapon_id)
+            self.ids_by_name.setdefault(name, weapon_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def weapon_type(self, weapon_id: int) -> str:
+        return self.type_names[self.type_ids[weapon_id]]
+
+    def tier(self, weapon_id: int) -> str:
+        return TIERS[self.tier_ids[weapon_id]]
+
+    def find(self, name: str, default=None):
+        """Returns the id of the first weapon with that name."""
+        return self.ids_by_name.get(name, default)
+
+    def ids(self, tier: str, weapon_type: str = None, natural: bool = None):
+        """Returns the index array of weapon ids matching the filters."""
+        if tier not in self.by_tier:
+            raise ValueError("Invalid tier for weapon generation")
+        if weapon_type is not None and natural is not None:
+            return self.by_tier_type_natural.get((tier, weapon_type, natural), array('H'))
+        if weapon_type is not None:
+            return self.by_tier_type.get((tier, weapon_type), array('H'))
+        if natural is not None:
+            return self.by_tier_natural.get((tier, natural), array('H'))
+        return self.by_tier[tier]
+
+    def sample(self, tier: str, rng=random, weapon_type: str = None, natural: bool = None) -> int:
+        """Picks a random weapon id from the index."""
+        candidates = self.ids(tier, weapon_type, natural)
+        if not candidates:
+            raise ValueError(f"No {tier} tier weapons match the requested filters")
+        return rng.choice(candidates)
+
+    # --- Binary cache ---
+
+    def to_bytes(self, source_mtime_ns: int, source_size: int) -> bytes:
+        strings = '\0'.join(self.names + ['\x01'] + self.type_names).encode('utf-8')
+        header = _CACHE_HEADER.pack(_CACHE_MAGIC, _CACHE_VERSION, source_mtime_ns, source_size,
+                                    len(self.names), len(strings))
+        return header + strings + self.type_ids.tobytes() + self.tier_ids.tobytes() + bytes(self.natural)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, source_mtime_ns: int, source_size: int):
+        """Rebuilds a catalog from cache bytes, or returns None if the cache is stale."""
+        if len(data) < _CACHE_HEADER.size:
+            return None
+        magic, version, mtime_ns, size, count, strings_size = _CACHE_HEADER.unpack_from(data)
+        if magic != _CACHE_MAGIC or version != _CACHE_VERSION or (mtime_ns, size) != (source_mtime_ns, source_size):
+            return None
+        offset = _CACHE_HEADER.size
+        strings = data[offset:offset + strings_size].decode('utf-8').split('\0')
+        separator = strings.index('\x01')
+        names, type_names = strings[:separator], strings[separator + 1:]
+        offset += strings_size
+        type_ids = array('B', data[offset:offset + count])
+        tier_ids = array('B', data[offset + count:offset + 2 * count])
+        natural = bytearray(data[offset + 2 * count:offset + 3 * count])
+        if len(names) != count or len(natural) != count:
+            return None
+        return cls(names, type_names, type_ids, tier_ids, natural)
+
+
+def parse_weapon_list(path: str = CATALOG_SOURCE) -> WeaponCatalog:
+    """Parses the weapon list text file into a catalog."""
+    names, type_names = [], []
+    type_lookup = {}
+    type_ids, tier_ids, natural = array('B'), array('B'), bytearray()
+    tier = kind = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            section = _SECTION_RE.match(line)
+            if section:
+                tier, kind = section.groups()
+                continue
+            if line.strip().startswith(']'):
+                tier = kind = None
+                continue
+            weapon = _WEAPON_RE.search(line)
+            if weapon and tier is not None:
+                name, weapon_type = weapon.groups()
+                if weapon_type not in type_lookup:
+                    type_lookup[weapon_type] = len(type_names)
+                    type_names.append(weapon_type)
+                names.append(name)
+                type_ids.append(type_lookup[weapon_type])
+                tier_ids.append(TIERS.index(tier))
+                natural.append(1 if kind == "nat" else 0)
+    return WeaponCatalog(names, type_names, type_ids, tier_ids, natural)
+
+
+def load_catalog(source: str = CATALOG_SOURCE, cache_path: str = CACHE_PATH) -> WeaponCatalog:
+    """Loads the catalog from the binary cache, reparsing the list when it changed."""
+    stat = os.stat(source)
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            catalog = WeaponCatalog.from_bytes(f.read(), stat.st_mtime_ns, stat.st_size)
+        if catalog is not None:
+            return catalog
+
+    catalog = parse_weapon_list(source)
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temp_path = cache_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(catalog.to_bytes(stat.st_mtime_ns, stat.st_size))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write weapon catalog cache: {e}")
+    return catalog
+
+
+_catalog = None
+
+
+def get_catalog() -> WeaponCatalog:
+    """Returns the shared weapon catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = load_catalog()
+    return _catalog
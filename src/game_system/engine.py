@@ -0,0 +1,778 @@
+# game_system/engine.py
+
+import random
+from collections import deque
+
+from game_system.levels import LevelPregenerator, build_level
+from game_system.save import SaveWriter, capture, read_save, restore
+from game_system.scheduler import FixedStepClock, TurnScheduler, initiative_order, turn_delay
+from battle_system.enemy import generate_boss, boss_list
+from battle_system.health_bar import HealthBar
+from battle_system.hero import Hero
+from battle_system.item import create_item_from_name, generate_cure, get_item_shop_stock
+from battle_system.party import PartyBattle
+from battle_system.weapon import generate_weapon
+from map_system.tiles import treasure_empty
+
+MAX_SEED_VALUE = 1000000  # Maximum integer value allowed for seed
+AUTO_TRAVEL_STEP = 0.08  # Seconds per tile while auto-travelling
+GROUP_RADIUS = 1.5  # Enemies this close to the one the player runs into join the fight
+
+
+class Observation:
+    """Snapshot of what a client needs after a command: mode, hero stats and new messages."""
+
+    __slots__ = ("mode", "prompt", "player_pos", "health", "health_max", "cashpile", "cycle",
+                 "boss_defeated", "enemy", "messages", "battle_messages")
+
+    def __init__(self, engine: 'GameEngine', messages, battle_messages) -> None:
+        hero = engine.hero
+        self.mode = engine.mode
+        self.prompt = engine.prompt
+        self.player_pos = hero.player_pos
+        self.health = hero.health
+        self.health_max = hero.health_max
+        self.cashpile = hero.cashpile
+        self.cycle = engine.cycle
+        self.boss_defeated = engine.boss_defeated
+        enemy = engine.current_enemy if engine.in_battle and engine.party_battle is None else None
+        self.enemy = (enemy.name, enemy.health, enemy.health_max) if enemy is not None else None
+        self.messages = messages  # Log lines added since the previous observation
+        self.battle_messages = battle_messages  # Battle log lines added since the previous observation
+
+    def __repr__(self):
+        return f"Observation({self.mode!r}, prompt={self.prompt!r}, pos={self.player_pos}, hp={self.health})"
+
+
+class GameEngine:
+    """Game rules and state, driven by commands instead of window events.
+
+    Every command (move, choose, battle_action, use_item, travel...) changes the
+    state and returns an Observation. Battles, prompts and level changes are modes
+    of the engine rather than nested loops, so a client only has to call commands
+    and render. With `realtime=False` enemy turns resolve as soon as the hero has
+    acted and auto-travel walks the whole path at once; with `realtime=True` they
+    wait for advance(dt), which the pygame front end calls every frame.
+    """
+
+    # Command name -> method, for apply(("move", 0, 1)) style scripting
+    COMMANDS = {
+        "new_game": "new_game",
+        "load": "load_state",
+        "move": "move",
+        "choose": "choose",
+        "submit": "submit",
+        "attack": "attack",
+        "battle": "battle_action",
+        "use_item": "use_item",
+        "inventory": "open_inventory",
+        "travel": "travel",
+        "cancel_travel": "cancel_travel",
+        "wait": "advance",
+    }
+
+    def __init__(self, screen=None, realtime: bool = False, save_path: str = None) -> None:
+        self.screen = screen  # Surface the map draws on; None when headless
+        self.realtime = realtime
+        self.save_path = save_path  # Autosave target; None disables autosaving
+        self.save_writer = SaveWriter() if save_path else None
+
+        self.map_width = 30
+        self.map_height = 15
+        self.seed = None
+        self.game_map = None
+        self.next_seed = None  # Seed of the level after the boss, drawn when the shrine is entered
+        self.pregenerator = LevelPregenerator()
+        self.hero = Hero(name="Hero", health=150)
+        self.hero.health_bar = HealthBar(self.hero, color="green")
+        self.cycle = 1
+        self.boss_defeated = 0
+        self.total_bosses = 1  # Total bosses to defeat
+        self.running = False
+        self.outcome = None  # "victory" or "defeat" once the game is over
+
+        self.log_messages = []
+        self.prompt = None  # Pending choice: "loot", "inventory", "village", "rest", "weapon_shop", "item_shop", ...
+        self.loot_weapon = None
+        self.weapons_for_sale = []
+        self.items_for_sale = []
+
+        self.in_battle = False
+        self.battle_log = []
+        self.current_enemy = None
+        self.party_battle = None
+        self.hero_turn = False
+        self.battle_scheduler = TurnScheduler()
+        self.battle_clock = FixedStepClock()
+        self._on_battle_end = None  # Resolves the encounter that started the battle
+
+        self.travel_path = deque()  # Remaining auto-travel steps
+        self.travel_clock = FixedStepClock(AUTO_TRAVEL_STEP, max_steps=4)
+        self._log_mark = 0
+        self._battle_mark = 0
+
+    # --- State ---
+
+    @property
+    def mode(self) -> str:
+        if self.outcome is not None:
+            return self.outcome
+        if self.in_battle:
+            return "battle"
+        if self.prompt is not None:
+            return "prompt"
+        return "explore"
+
+    @property
+    def accepting_input(self) -> bool:
+        """Whether the game waits for typed input (a battle action or a prompt answer)."""
+        return self.in_battle or self.prompt is not None
+
+    def observe(self) -> Observation:
+        """Returns the current state and the messages logged since the last observation."""
+        messages = self.log_messages[self._log_mark:]
+        battle_messages = self.battle_log[self._battle_mark:]
+        self._log_mark = len(self.log_messages)
+        self._battle_mark = len(self.battle_log)
+        return Observation(self, messages, battle_messages)
+
+    def apply(self, command) -> Observation:
+        """Runs a command tuple such as ("move", 0, 1), ("choose", "p") or ("battle", "run")."""
+        name, *args = command
+        if name not in self.COMMANDS:
+            raise ValueError(f"Unknown command: {name}")
+        return getattr(self, self.COMMANDS[name])(*args)
+
+    # --- Game and level flow ---
+
+    def new_game(self, seed: int = None) -> Observation:
+        """Starts a new game with a fresh hero."""
+        self.hero = Hero(name="Hero", health=150)
+        self.hero.health_bar = HealthBar(self.hero, color="green")
+        self.boss_defeated = 0
+        self.cycle = 1
+        self.outcome = None
+        self.next_seed = None
+        self.pregenerator.cancel()
+        self.start_level(seed)
+        return self.observe()
+
+    def start_level(self, seed: int = None) -> None:
+        """Swaps in the map for the current cycle, pregenerated if possible, and places the hero."""
+        self.seed = seed if seed is not None else random.randint(0, MAX_SEED_VALUE)
+        params = (self.map_width, self.map_height, self.seed, self.boss_defeated, self.cycle)
+        game_map = self.pregenerator.take(*params)
+        if game_map is None:
+            game_map = build_level(self.screen, *params)
+        if self.game_map is not None and self.game_map is not game_map:
+            self.pregenerator.recycle(self.game_map)  # The next level is generated into its buffers
+        self.game_map = game_map
+        self.game_map.place_player(self.hero)
+        self.game_map.enable_fog()
+
+        self.running = True
+        self.travel_path.clear()
+        self.autosave()
+
+    def start_new_level(self) -> None:
+        """Starts a new level with increased difficulty."""
+        self.cycle += 1
+        self.log_messages.append(f"Starting New Game+{self.cycle}")
+        seed = self.next_seed if self.next_seed is not None else random.randint(0, MAX_SEED_VALUE)
+        self.next_seed = None
+        self.log_messages.append(f"Generating new map with seed: {seed}")
+        self.start_level(seed)
+
+    def load_save(self, path: str = None) -> bool:
+        """Resumes from a save file, returning False if it can't be read."""
+        try:
+            data = read_save(path or self.save_path)
+        except OSError as e:
+            print(f"Warning: Could not load saved game: {e}")
+            return False
+        return self.load_state(data) is not None
+
+    def load_state(self, data: bytes):
+        """Resumes from save bytes; returns an Observation, or None if they can't be loaded."""
+        try:
+            restore(self, data)
+        except ValueError as e:
+            print(f"Warning: Could not load saved game: {e}")
+            return None
+        self.outcome = None
+        self.next_seed = None
+        self.pregenerator.cancel()
+        self.running = True
+        self.log_messages.append("Saved game loaded.")
+        return self.observe()
+
+    def autosave(self) -> None:
+        """Packs the game state and writes it in the background."""
+        if self.save_writer is not None:
+            self.save_writer.submit(self.save_path, capture(self))
+
+    def close(self) -> None:
+        """Saves and waits for pending writes, e.g. before quitting."""
+        if self.save_writer is not None and self.game_map is not None:
+            self.autosave()
+            self.save_writer.wait()
+
+    def game_over(self) -> None:
+        """Handles the game-over logic."""
+        self.log_messages.append("Game Over!")
+        self.outcome = "defeat"
+        self.running = False
+
+    def victory(self) -> None:
+        """Ends the game after the last boss."""
+        self.log_messages.append("Congratulations! You have defeated all the bosses and completed the game!")
+        self.outcome = "victory"
+        self.running = False
+
+    # --- Time ---
+
+    def advance(self, dt: float) -> Observation:
+        """Advances real-time simulation by `dt` seconds: pending enemy turns and auto-travel."""
+        if self.in_battle:
+            for _ in range(self.battle_clock.advance(dt)):
+                self.battle_scheduler.step(self.battle_clock.step)
+        elif self.travel_path:
+            self._walk_travel(self.travel_clock.advance(dt))
+        return self.observe()
+
+    def _settle(self) -> None:
+        """Outside real time, runs every pending turn straight away."""
+        if not self.realtime and self.in_battle:
+            self.battle_scheduler.run_until_idle()
+
+    # --- Exploration ---
+
+    def move(self, dx: int, dy: int) -> Observation:
+        """Moves the player one step and handles encounters."""
+        if self.running and not self.accepting_input:
+            self.travel_path.clear()
+            self._step(dx, dy)
+        return self.observe()
+
+    def _step(self, dx, dy):
+        x, y = self.hero.player_pos
+        new_x, new_y = x + dx, y + dy
+
+        # Validate movement within map bounds
+        if new_x < 0 or new_x >= self.game_map.height or new_y < 0 or new_y >= self.game_map.width:
+            self.log_messages.append("Invalid move. Stay within bounds.")
+            return
+
+        tile_symbol = self.game_map.map_data[new_x][new_y].symbol_raw
+        if self.game_map.enemy_at(new_x, new_y) is not None:
+            self.enemy_encounter(new_x, new_y, advance_enemies=True)
+            return
+        if tile_symbol == 'S':
+            self.shrine_encounter()
+            return
+        if tile_symbol in ('~', '#'):
+            self.log_messages.append("You cannot move there.")
+            return
+        if tile_symbol == 'V':
+            self.village_encounter(new_x, new_y)
+        elif tile_symbol == 'T':
+            self.treasure_encounter(new_x, new_y)
+            return  # Player does not move on until the decision is made
+        else:
+            self.move_hero(new_x, new_y)
+        self.advance_roaming_enemies()
+
+    def move_hero(self, x, y):
+        """Moves the player marker and the hero to (x, y)."""
+        self.game_map.update_player_position(self.hero.player_pos[0], self.hero.player_pos[1], x, y)
+        self.hero.player_pos = (x, y)
+
+    def advance_roaming_enemies(self):
+        """Lets roaming enemies near the player take their step; a chaser that reaches the player attacks."""
+        if not self.hero.alive or self.in_battle:
+            return
+        reached = self.game_map.advance_enemies()
+        if reached:
+            self.enemy_encounter(*reached[0].pos)
+
+    def travel(self, landmark_name: str) -> Observation:
+        """Plans a path to the nearest explored landmark of a kind (village, shrine, treasure)."""
+        if not self.running or self.accepting_input:
+            return self.observe()
+        x, y = self.hero.player_pos
+        # Only landmarks the player has already seen through the fog
+        landmark = self.game_map.nearest_landmark(x, y, landmark_name,
+                                                  predicate=lambda l: self.game_map.is_explored(*l.pos))
+        if landmark is None:
+            self.log_messages.append(f"You haven't found a {landmark_name} yet.")
+            return self.observe()
+        path = self.game_map.get_pathfinder().find_path((x, y), landmark.pos)
+        if not path:
+            self.log_messages.append(f"You can't find a way to the {landmark_name}.")
+            return self.observe()
+        self.travel_path = deque(path)
+        self.travel_clock.accumulator = 0.0
+        self.log_messages.append(f"Travelling to the nearest {landmark_name}...")
+        if not self.realtime:
+            self._walk_travel(len(self.travel_path))
+        return self.observe()
+
+    def cancel_travel(self) -> None:
+        self.travel_path.clear()
+
+    def _walk_travel(self, steps):
+        """Steps along the travel path; stops at the destination, on any encounter or prompt, or if a step fails."""
+        for _ in range(steps):
+            if not self.travel_path or self.accepting_input or not self.running:
+                self.travel_path.clear()
+                return
+            next_x, next_y = self.travel_path.popleft()
+            x, y = self.hero.player_pos
+            self._step(next_x - x, next_y - y)
+            if self.hero.player_pos != (next_x, next_y) or self.accepting_input:
+                self.travel_path.clear()
+
+    # --- Encounters ---
+
+    def enemy_encounter(self, x, y, advance_enemies=False):
+        """Starts a battle with the enemy at (x, y).
+
+        Spawn descriptors are materialized into a full Enemy only for the battle.
+        """
+        spawn = self.game_map.enemy_at(x, y)
+        if not spawn:
+            self.log_messages.append("Error: Enemy not found at this position.")
+            return
+        group = [spawn] + [other for other in self.game_map.enemies_near(x, y, GROUP_RADIUS) if other is not spawn]
+        if len(group) > 1:
+            self.group_encounter(group, x, y, advance_enemies)
+            return
+        enemy = spawn.materialize() if hasattr(spawn, "materialize") else spawn
+        self.log_messages.append(f"Enemy encountered: {enemy.name}")
+        self.start_battle(enemy, lambda: self._resolve_enemy_battle(spawn, enemy, x, y, advance_enemies))
+
+    def group_encounter(self, spawns, x, y, advance_enemies=False):
+        """Starts a group battle with the enemy at (x, y) and the enemies standing next to it."""
+        enemies = [spawn.materialize() if hasattr(spawn, "materialize") else spawn for spawn in spawns]
+        self.log_messages.append(f"Enemy group encountered: {', '.join(enemy.name for enemy in enemies)}")
+        self.start_party_battle(enemies, lambda: self._resolve_group_battle(spawns, enemies, x, y, advance_enemies))
+
+    def _resolve_enemy_battle(self, spawn, enemy, x, y, advance_enemies):
+        if not self.hero.alive:
+            self.game_over()
+            return
+        if enemy.alive:
+            return
+        self.log_messages.append(f"You have defeated the {enemy.name}!")
+        self.game_map.remove_enemy(spawn)
+        self.handle_loot(enemy)  # Autosaved once the loot decision is made
+        # Move the player onto the enemy's position
+        self.move_hero(x, y)
+        if advance_enemies:
+            self.advance_roaming_enemies()
+
+    def _resolve_group_battle(self, spawns, enemies, x, y, advance_enemies):
+        if not self.hero.alive:
+            self.game_over()
+            return
+        for spawn, enemy in zip(spawns, enemies):
+            if not enemy.alive:
+                self.game_map.remove_enemy(spawn)
+        if any(enemy.alive for enemy in enemies):
+            return  # The party retreated; the survivors stay on the map
+        self.log_messages.append(f"You have defeated the group of {len(enemies)} enemies!")
+        # The best weapon of the group is offered as loot
+        self.handle_loot(max(enemies, key=lambda enemy: enemy.weapon.damage))
+        self.move_hero(x, y)
+        if advance_enemies:
+            self.advance_roaming_enemies()
+
+    def handle_loot(self, enemy):
+        """Handles looting after defeating an enemy."""
+        # Handle random item drop
+        item = self.enemy_drop_item(enemy)
+        if item:
+            self.log_messages.append(f"The enemy dropped {item.name}!")
+            self.hero.items.add(item)
+        else:
+            self.log_messages.append("The enemy did not drop any items.")
+
+        # Weapon loot
+        self.log_messages.append(f"You found {enemy.weapon.name} (Tier: {enemy.tier.capitalize()}) (Damage: {enemy.weapon.damage}). Value: {enemy.weapon.value} gold.")
+        self.log_messages.append("Do you want to pick it up or scrap it for gold? (p/s)")
+        self.prompt = "loot"
+        self.loot_weapon = enemy.weapon
+
+    def enemy_drop_item(self, enemy):
+        """Determines if an enemy drops an item and returns it."""
+        if random.randint(1, 100) <= 50:
+            return generate_cure("small")
+        return None
+
+    def shrine_encounter(self):
+        """Handles the shrine encounter leading to a boss battle."""
+        self.log_messages.append("You have discovered the shrine!")
+        self.prepare_next_level()
+        # Generate the boss based on the boss defeated count
+        boss = generate_boss(self.boss_defeated % len(boss_list))
+        self.start_battle(boss, lambda: self._resolve_boss_battle(boss))
+
+    def prepare_next_level(self):
+        """Draws the next level's seed and generates the level in the background during the boss fight."""
+        if self.next_seed is None:
+            self.next_seed = random.randint(0, MAX_SEED_VALUE)
+        self.pregenerator.request(self.screen, self.map_width, self.map_height, self.next_seed,
+                                  *self.next_level_params())
+
+    def next_level_params(self):
+        """(boss_defeated, cycle) of the level after the current boss; beating the last one starts over at 0."""
+        boss_defeated = self.boss_defeated + 1
+        return (boss_defeated if boss_defeated < self.total_bosses else 0), self.cycle + 1
+
+    def _resolve_boss_battle(self, boss):
+        if not self.hero.alive:
+            self.game_over()
+            return
+        if boss.alive:
+            return
+        self.log_messages.append(f"You have defeated {boss.name}!")
+        # Handle boss drops
+        for item_name in boss.drops:
+            item = create_item_from_name(item_name)
+            if item is None:
+                print(f"Warning: Boss drop '{item_name}' is not a registered item.")
+                continue
+            self.hero.items.add(item)
+            self.log_messages.append(f"You received {item.name}!")
+        self.boss_defeated += 1
+        self.log_messages.append(f"You have defeated {self.boss_defeated} out of {self.total_bosses} bosses.")
+        if self.boss_defeated >= self.total_bosses:
+            self.log_messages.append("Congratulations! You have defeated all the bosses!")
+            self.log_messages.append("Continue into New Game+ with your hero? (y/n)")
+            self.prompt = "new_game_plus"
+        else:
+            self.log_messages.append("Prepare yourself for the next challenge!")
+            self.start_new_level()
+
+    def village_encounter(self, x, y):
+        """Handles encounters with villages."""
+        self.log_messages.append("You enter a village.")
+        self.village_menu()
+        self.move_hero(x, y)
+
+    def village_menu(self):
+        """Displays the village menu."""
+        self.log_messages.append("Welcome to the village!")
+        self.log_messages.append("1. Rest")
+        self.log_messages.append("2. Visit Weapon Shop")
+        self.log_messages.append("3. Visit Item Shop")
+        self.log_messages.append("4. Leave Village")
+        self.prompt = "village"
+
+    def treasure_encounter(self, x, y):
+        """Handles encounters with treasures."""
+        self.log_messages.append("You found a treasure chest!")
+        random_roll = random.randint(1, 100)
+        if random_roll <= 60:
+            weapon_tier = "low"
+        elif random_roll <= 90:
+            weapon_tier = "mid"
+        else:
+            weapon_tier = "high"
+
+        weapon = generate_weapon(weapon_tier, natural=False)
+        self.log_messages.append(f"You found a {weapon.name} (Tier: {weapon_tier.capitalize()})!")
+        self.log_messages.append("Do you want to pick it up or scrap it for gold? (p/s)")
+        self.prompt = "loot"
+        self.loot_weapon = weapon
+        # Emptied before the decision, so a save made while it is pending can't reopen the chest
+        self.game_map.set_tile(x, y, treasure_empty)
+        self.move_hero(x, y)
+
+    # --- Prompts ---
+
+    def open_inventory(self) -> Observation:
+        """Lists the inventory and waits for the number of the item to use."""
+        if self.running and not self.accepting_input:
+            self.travel_path.clear()
+            self.log_messages.append("Inventory:")
+            for idx, (item, count) in enumerate(self.hero.items.stacks(), 1):
+                self.log_messages.append(f"{idx}. {item.name} x{count} - {item.description}")
+            self.log_messages.append("Type the number of the item to use it, or 'b' to go back.")
+            self.prompt = "inventory"
+        return self.observe()
+
+    def use_item(self, index: int) -> Observation:
+        """Uses the inventory stack at `index` (0-based) on the hero."""
+        if 0 <= index < len(self.hero.items.order):
+            item = self.hero.items.take(index)
+            self.log_messages.append(f"You used {item.name}.")
+            item.use(self.hero)
+        else:
+            self.log_messages.append("Invalid item number.")
+        return self.observe()
+
+    def submit(self, text: str) -> Observation:
+        """Routes a line of typed input to the battle or the pending prompt."""
+        if self.in_battle:
+            return self.battle_action(text)
+        return self.choose(text)
+
+    def choose(self, option: str) -> Observation:
+        """Answers the pending prompt (loot, inventory, village, rest, shop or New Game+)."""
+        option = str(option)
+        handler = getattr(self, f"_choose_{self.prompt}", None) if self.prompt else None
+        if handler is None:
+            self.log_messages.append("No action to process.")
+        else:
+            handler(option)
+        return self.observe()
+
+    def _choose_loot(self, option):
+        if option.lower() == 'p':
+            self.log_messages.append(f"You picked up {self.loot_weapon.name}.")
+            self.hero.equip_weapon(self.loot_weapon)
+        elif option.lower() == 's':
+            self.log_messages.append(f"Scrapped {self.loot_weapon.name} for {self.loot_weapon.value} gold.")
+            self.hero.cashpile += self.loot_weapon.value
+            self.log_messages.append(f"Your cashpile now contains {self.hero.cashpile} gold.")
+        else:
+            self.log_messages.append("Invalid input. Please enter 'p' or 's'.")
+            return
+        self.loot_weapon = None
+        self.prompt = None
+        self.autosave()  # After the hero has moved on and the loot is settled
+
+    def _choose_new_game_plus(self, option):
+        if option.lower() == 'y':
+            self.prompt = None
+            self.boss_defeated = 0  # A new cycle of bosses, tougher enemies
+            self.start_new_level()
+        elif option.lower() == 'n':
+            self.prompt = None
+            self.victory()
+        else:
+            self.log_messages.append("Invalid input. Please enter 'y' or 'n'.")
+
+    def _choose_inventory(self, option):
+        if option.lower() == 'b':
+            self.prompt = None
+        elif option.isdigit():
+            self.use_item(int(option) - 1)
+        else:
+            self.log_messages.append("Invalid input.")
+
+    def _choose_village(self, option):
+        if option == '1':
+            self.rest_menu()
+        elif option == '2':
+            self.weapon_shop()
+        elif option == '3':
+            self.item_shop()
+        elif option == '4':
+            self.log_messages.append("Leaving the village.")
+            self.prompt = None
+        else:
+            self.log_messages.append("Invalid choice. Try again.")
+
+    def rest_menu(self):
+        """Displays rest options in the village."""
+        self.log_messages.append("Resting Options:")
+        self.log_messages.append("1. Stanza Lercia (30% HP for 15 gold)")
+        self.log_messages.append("2. Stanza (50% HP for 25 gold)")
+        self.log_messages.append("3. Stanza Pregio (100% HP for 35 gold)")
+        self.prompt = "rest"
+
+    def _choose_rest(self, option):
+        if option == '1' and self.hero.cashpile >= 15:
+            heal_amount = int(self.hero.health_max * 0.3)
+            self.hero.health = min(self.hero.health + heal_amount, self.hero.health_max)
+            self.hero.cashpile -= 15
+            self.log_messages.append("You rested badly in a Stanza Lercia and healed 30% of your HP.")
+        elif option == '2' and self.hero.cashpile >= 25:
+            heal_amount = int(self.hero.health_max * 0.5)
+            self.hero.health = min(self.hero.health + heal_amount, self.hero.health_max)
+            self.hero.cashpile -= 25
+            self.log_messages.append("You rested in a Stanza and healed 50% of your HP.")
+        elif option == '3' and self.hero.cashpile >= 35:
+            self.hero.health = self.hero.health_max
+            self.hero.cashpile -= 35
+            self.log_messages.append("You rested well in a Stanza Pregio and healed completely.")
+        else:
+            self.log_messages.append("You don't have enough gold for this option.")
+        self.prompt = None
+
+    def weapon_shop(self):
+        """Lists the weapons for sale."""
+        self.log_messages.append("Welcome to the Weapon Shop!")
+        self.weapons_for_sale = (
+            [generate_weapon("low", natural=False) for _ in range(5)] +
+            [generate_weapon("mid", natural=False) for _ in range(4)] +
+            [generate_weapon("high", natural=False) for _ in range(2)]
+        )
+        for idx, weapon in enumerate(self.weapons_for_sale, 1):
+            self.log_messages.append(f"{idx}. {weapon.name} (Tier: {weapon.tier.capitalize()}) - Damage: {weapon.damage} - {weapon.value} gold")
+        self.log_messages.append("Select a weapon to buy or 'b' to go back:")
+        self.prompt = "weapon_shop"
+
+    def _choose_weapon_shop(self, option):
+        if option.isdigit():
+            idx = int(option) - 1
+            if 0 <= idx < len(self.weapons_for_sale):
+                weapon = self.weapons_for_sale[idx]
+                if self.hero.cashpile >= weapon.value:
+                    self.hero.cashpile -= weapon.value
+                    self.hero.equip_weapon(weapon)
+                    self.log_messages.append(f"You bought and equipped {weapon.name}.")
+                else:
+                    self.log_messages.append("You don't have enough gold.")
+            else:
+                self.log_messages.append("Invalid selection.")
+            self.prompt = None
+        elif option.lower() == 'b':
+            self.prompt = None
+        else:
+            self.log_messages.append("Invalid input.")
+
+    def item_shop(self):
+        """Lists the items for sale."""
+        self.log_messages.append("Welcome to the Item Shop!")
+        self.items_for_sale = get_item_shop_stock()
+        for idx, item in enumerate(self.items_for_sale, 1):
+            self.log_messages.append(f"{idx}. {item.name} - {item.description} - {item.value} gold")
+        self.log_messages.append("Select an item to buy or 'b' to go back:")
+        self.prompt = "item_shop"
+
+    def _choose_item_shop(self, option):
+        if option.isdigit():
+            idx = int(option) - 1
+            if 0 <= idx < len(self.items_for_sale):
+                item = self.items_for_sale[idx]
+                if self.hero.cashpile >= item.value:
+                    self.hero.cashpile -= item.value
+                    self.hero.items.add(item)
+                    self.log_messages.append(f"You bought {item.name}.")
+                else:
+                    self.log_messages.append("You don't have enough gold.")
+            else:
+                self.log_messages.append("Invalid selection.")
+            self.prompt = None
+        elif option.lower() == 'b':
+            self.prompt = None
+        else:
+            self.log_messages.append("Invalid input.")
+
+    # --- Battles ---
+
+    def start_battle(self, enemy, on_end=None):
+        """Enters battle mode; `on_end` runs once the battle is over.
+
+        Turns run on a TurnScheduler; the more agile combatant opens the battle.
+        """
+        self.travel_path.clear()
+        self.in_battle = True
+        self.battle_log = []
+        self._battle_mark = 0
+        self.current_enemy = enemy
+        self.battle_scheduler = TurnScheduler()
+        self.battle_clock = FixedStepClock()
+        self.hero_turn = False
+        self._on_battle_end = on_end
+
+        if initiative_order([self.hero, enemy])[0] is self.hero:
+            self.hero_turn = True
+        else:
+            self.battle_scheduler.schedule(turn_delay(enemy), self.enemy_turn)
+        self._settle()
+
+    def start_party_battle(self, enemies, on_end=None):
+        """Enters a group battle; each 'attack' resolves one batched round for everyone."""
+        self.travel_path.clear()
+        self.party_battle = PartyBattle([self.hero], enemies)
+        self.in_battle = True
+        self.battle_log = [f"{len(enemies)} enemies attack!"]
+        self._battle_mark = 0
+        self._on_battle_end = on_end
+
+    def attack(self) -> Observation:
+        return self.battle_action("attack")
+
+    def battle_action(self, action: str) -> Observation:
+        """Runs the hero's battle action: attack, defend, item or run."""
+        if not self.in_battle:
+            return self.observe()
+        action = action.lower()
+        if self.party_battle is not None:
+            self._party_battle_action(action)
+            return self.observe()
+
+        enemy = self.current_enemy
+        if not self.hero_turn:
+            self.battle_log.append(f"The {enemy.name} is acting, wait for your turn.")
+            return self.observe()
+        if action == 'attack':
+            self.battle_log.extend(self.hero.attack(enemy).split("\n"))
+            if not enemy.alive:
+                self.battle_log.append(f"You defeated the {enemy.name}!")
+                self.end_battle()
+                return self.observe()
+        elif action == 'defend':
+            self.battle_log.append("You brace yourself for the next attack.")
+        elif action == 'item':
+            self.battle_log.append("You use an item.")
+        elif action == 'run':
+            self.battle_log.append("You attempt to run away.")
+            self.end_battle()
+            return self.observe()
+        else:
+            self.battle_log.append("Invalid action. Choose 'attack', 'defend', 'item', or 'run'.")
+            return self.observe()
+
+        # Enemy's turn comes after its turn delay
+        self.end_hero_turn()
+        self._settle()
+        return self.observe()
+
+    def _party_battle_action(self, action):
+        if action == 'attack':
+            self.battle_log.extend(self.party_battle.resolve_round())
+            if self.party_battle.finished:
+                if self.party_battle.heroes_won:
+                    self.battle_log.append("The enemy group has been defeated!")
+                else:
+                    self.battle_log.append("Your party has been defeated!")
+                self.end_battle()
+        elif action == 'run':
+            self.battle_log.append("Your party retreats.")
+            self.end_battle()
+        else:
+            self.battle_log.append("Invalid action. Choose 'attack' or 'run'.")
+
+    def enemy_turn(self):
+        """Runs the enemy's scheduled turn, then hands the turn back to the hero."""
+        if not self.in_battle:
+            return
+        enemy = self.current_enemy
+        enemy_action = enemy.choose_action(self.hero)
+        self.battle_log.extend(enemy.perform_action(enemy_action, self.hero).split("\n"))
+        if not self.hero.alive:
+            self.battle_log.append("You have been defeated!")
+            self.end_battle()
+            return
+        self.hero_turn = True
+
+    def end_hero_turn(self):
+        """Ends the hero's turn and schedules the enemy's reply."""
+        self.hero_turn = False
+        if self.in_battle:
+            self.battle_scheduler.schedule(turn_delay(self.current_enemy), self.enemy_turn)
+
+    def end_battle(self):
+        """Leaves battle mode, drops pending turns and resolves the encounter."""
+        self.in_battle = False
+        self.hero_turn = False
+        self.party_battle = None
+        self.battle_scheduler.clear()
+        on_end, self._on_battle_end = self._on_battle_end, None
+        if on_end is not None:
+            on_end()
@@ -0,0 +1,71 @@
+# game_system/levels.py
+
+import threading
+
+from map_system.map import Map
+
+
+def build_level(screen, width: int, height: int, seed: int, boss_defeated: int, cycle: int, game_map=None) -> Map:
+    """Generates a level's map and places its enemies.
+
+    Everything random comes from the map's own RNG, so this is safe to run off the
+    main thread and gives the same level for the same arguments. A finished level's
+    map of the same size can be passed in to be regenerated in place.
+    """
+    if game_map is None or (game_map.width, game_map.height) != (width, height):
+        game_map = Map(screen, width=width, height=height, seed=seed)
+    else:
+        game_map.screen = screen
+        game_map.reset_map(seed)
+    game_map.place_enemies_on_map(game_map.select_enemies(boss_defeated, cycle))
+    return game_map
+
+
+class LevelPregenerator:
+    """Builds the next level on a background thread while the current one is played.
+
+    request() starts generating a level as soon as its parameters are known; take()
+    hands it over, waiting for the thread if it hasn't finished, or returns None if
+    nothing was prepared for those parameters so the caller builds the level itself.
+    An error in the background build is raised again by take().
+    """
+
+    def __init__(self) -> None:
+        self._pending = None  # (parameters, thread, result list)
+        self.spare = None  # Map of a finished level, reused by the next build
+
+    def recycle(self, game_map) -> None:
+        """Keeps a map that is no longer played to generate the next level into."""
+        self.spare = game_map
+
+    def request(self, screen, width: int, height: int, seed: int, boss_defeated: int, cycle: int) -> None:
+        key = (width, height, seed, boss_defeated, cycle)
+        if self._pending is not None and self._pending[0] == key:
+            return
+        result = []
+        thread = threading.Thread(target=self._run, args=(result, self.spare, screen) + key, name="level-pregen",
+                                  daemon=True)
+        self.spare = None
+        self._pending = (key, thread, result)
+        thread.start()
+
+    def _run(self, result, spare, screen, *key):
+        try:
+            result.append(build_level(screen, *key, game_map=spare))
+        except Exception as e:  # Handed to the main thread by take()
+            result.append(e)
+
+    def take(self, width: int, height: int, seed: int, boss_defeated: int, cycle: int):
+        """Returns the prepared map for these parameters, or None."""
+        pending, self._pending = self._pending, None
+        if pending is None or pending[0] != (width, height, seed, boss_defeated, cycle):
+            return None
+        key, thread, result = pending
+        thread.join()
+        if isinstance(result[0], Exception):
+            raise result[0]
+        return result[0]
+
+    def cancel(self) -> None:
+        """Drops the prepared level, e.g. when a new game starts."""
+        self._pending = None
@@ -4,8 +4,25 @@ import pygame
 import sys
 import os
 
-# Initialize Pygame font
-pygame.font.init()
+from game_system.startup import profiler as startup_profiler
+
+MENU_TEXT = [
+    "1. New Game",
+    "2. Set Seed Game",
+    "3. Exit",
+    "4. Continue Saved Game"
+]
+_menu_surfaces = None  # Rendered menu lines, built on first use
+
+
+def get_menu_surfaces():
+    """Renders the menu lines once and reuses them every frame."""
+    global _menu_surfaces
+    if _menu_surfaces is None:
+        pygame.font.init()
+        font = pygame.font.Font(None, 36)
+        _menu_surfaces = [font.render(line, True, (255, 255, 255)) for line in MENU_TEXT]
+    return _menu_surfaces
 
 def handle_menu_input():
     """Handles menu input using Pygame with a framerate limit."""
@@ -17,19 +34,13 @@ def handle_menu_input():
         pygame.display.get_surface().fill((100, 100, 100))  # Changed to a shade of gray for visibility
 
         # Display menu options
-        font = pygame.font.Font(None, 36)
-        menu_text = [
-            "1. New Game",
-            "2. Set Seed Game",
-            "3. Exit"
-        ]
         y = 150
-        for line in menu_text:
-            text_surface = font.render(line, True, (255, 255, 255))
+        for text_surface in get_menu_surfaces():
             pygame.display.get_surface().blit(text_surface, (100, y))
             y += 50
 
         pygame.display.flip()  # Update the display
+        startup_profiler.first_frame()
 
         # Handle events
         for event in pygame.event.get():
@@ -43,6 +54,8 @@ def handle_menu_input():
                     return "2"
                 elif event.key == pygame.K_3:
                     return "3"
+                elif event.key == pygame.K_4:
+                    return "4"
 
         # Limit the framerate to avoid excessive CPU usage
         clock.tick(30)  # Limit to 30 frames per second
\ No newline at end of file
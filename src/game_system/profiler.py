@@ -0,0 +1,190 @@
+# game_system/profiler.py
+
+import csv
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.path.join(PROJECT_ROOT, 'profiles')
+
+FRAME_WINDOW = 240  # Frames kept in the rolling window
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class _NullScope:
+    """Shared do-nothing scope handed out while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: 'FrameProfiler', name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        self.profiler._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        profiler._depth -= 1
+        profiler._events.append((self.name, self.start, perf_counter() - self.start, profiler._depth))
+        return False
+
+
+class FrameProfiler:
+    """Times named scopes per frame and keeps the last `window` frames.
+
+    Wrap work in `with profiler.scope("name"):` and bracket each frame with
+    begin_frame()/end_frame(). While disabled every call returns immediately.
+    Scopes closed outside a frame (e.g. map generation before the first one) are
+    attached to the next frame. Only the thread that created the profiler is timed,
+    so background work such as level pregeneration doesn't mix into the frames.
+    """
+
+    def __init__(self, window: int = FRAME_WINDOW) -> None:
+        self.enabled = False
+        self.frames = deque(maxlen=window)  # (start, duration, [(name, start, duration, depth), ...])
+        self.origin = perf_counter()
+        self._events = []
+        self._depth = 0
+        self._frame_start = None
+        self._thread = threading.get_ident()
+
+    def toggle(self) -> bool:
+        """Switches profiling (and the overlay) on or off; turning it on starts a fresh window."""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.clear()
+        return self.enabled
+
+    def clear(self) -> None:
+        self.frames.clear()
+        self._events = []
+        self._depth = 0
+        self._frame_start = None
+        self.origin = perf_counter()
+
+    def scope(self, name: str):
+        """Context manager timing one named section."""
+        if not self.enabled or threading.get_ident() != self._thread:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self._frame_start = perf_counter()
+
+    def end_frame(self) -> None:
+        if not self.enabled or self._frame_start is None:
+            return
+        start = self._frame_start
+        self.frames.append((start, perf_counter() - start, self._events))
+        self._events = []
+        self._frame_start = None
+
+    # --- Statistics ---
+
+    def frame_times_ms(self):
+        return [duration * 1000 for _, duration, _ in self.frames]
+
+    def scope_averages_ms(self):
+        """Average milliseconds per frame spent in each scope over the window."""
+        if not self.frames:
+            return {}
+        totals = {}
+        for _, _, events in self.frames:
+            for name, _, duration, _ in events:
+                totals[name] = totals.get(name, 0.0) + duration
+        return {name: total * 1000 / len(self.frames) for name, total in totals.items()}
+
+    # --- Overlay ---
+
+    def draw_overlay(self, surface, font) -> None:
+        """Draws the frame-time graph and per-scope breakdown in the top-right corner."""
+        if not self.enabled or not self.frames:
+            return
+        import pygame
+
+        times = self.frame_times_ms()
+        averages = sorted(self.scope_averages_ms().items(), key=lambda item: -item[1])
+        graph_height = 60
+        line_height = font.get_linesize()
+        width = max(len(times), 120)
+        height = graph_height + line_height * (len(averages) + 1) + 12
+        x0 = surface.get_width() - width - 10
+        y0 = 10
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        # One bar per frame, scaled so two frame budgets fill the graph
+        scale = graph_height / (FRAME_BUDGET_MS * 2)
+        for i, ms in enumerate(times):
+            bar = min(int(ms * scale), graph_height)
+            color = (80, 220, 80) if ms <= FRAME_BUDGET_MS else (230, 70, 70)
+            pygame.draw.line(panel, color, (i, graph_height), (i, graph_height - bar))
+        budget_y = graph_height - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(panel, (255, 255, 0), (0, budget_y), (width, budget_y))
+        surface.blit(panel, (x0, y0))
+
+        y = y0 + graph_height + 6
+        lines = [f"frame {sum(times) / len(times):.2f} ms  max {max(times):.2f} ms"]
+        lines += [f"{name}: {ms:.2f} ms" for name, ms in averages]
+        for line in lines:
+            surface.blit(font.render(line, True, (255, 255, 255)), (x0 + 4, y))
+            y += line_height
+
+    # --- Export ---
+
+    def export_csv(self, path: str) -> None:
+        """Writes one row per scope per frame: frame, scope, start_ms, duration_ms, depth."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "scope", "start_ms", "duration_ms", "depth"])
+            for index, (start, duration, events) in enumerate(self.frames):
+                writer.writerow([index, "frame", f"{(start - self.origin) * 1000:.3f}", f"{duration * 1000:.3f}", -1])
+                for name, event_start, event_duration, depth in events:
+                    writer.writerow([index, name, f"{(event_start - self.origin) * 1000:.3f}",
+                                     f"{event_duration * 1000:.3f}", depth])
+
+    def export_chrome_trace(self, path: str) -> None:
+        """Writes the window in the Chrome trace event format (chrome://tracing, Perfetto)."""
+        trace = []
+        for start, duration, events in self.frames:
+            trace.append(self._trace_event("frame", start, duration))
+            for name, event_start, event_duration, _ in events:
+                trace.append(self._trace_event(name, event_start, event_duration))
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+    def _trace_event(self, name, start, duration):
+        return {"name": name, "ph": "X", "pid": 1, "tid": 1,
+                "ts": round((start - self.origin) * 1e6, 1), "dur": round(duration * 1e6, 1)}
+
+    def export(self, directory: str = PROFILE_DIR):
+        """Writes both the CSV and the Chrome trace into a directory, returning their paths."""
+        os.makedirs(directory, exist_ok=True)
+        csv_path = os.path.join(directory, 'frames.csv')
+        trace_path = os.path.join(directory, 'frames.trace.json')
+        self.export_csv(csv_path)
+        self.export_chrome_trace(trace_path)
+        return csv_path, trace_path
+
+
+frame_profiler = FrameProfiler()
@@ -0,0 +1,245 @@
+# game_system/replay.py
+
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_system.engine import GameEngine
+from game_system.save import PROJECT_ROOT, capture, write_save
+
+RECORDING_PATH = os.path.join(PROJECT_ROOT, 'saves', 'session.rec')
+RECORD_ENV = "DESGOBLIN_RECORD"  # Set to 0 to turn session recording off
+
+RECORDING_MAGIC = b'DGRC'
+RECORDING_VERSION = 1
+NO_SEED = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<4sHBI')  # magic, version, realtime flag, seed of the global RNG
+_MOVE = struct.Struct('<bb')
+_WAIT = struct.Struct('<HH')  # frame milliseconds, number of consecutive frames
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_CHECKPOINT = struct.Struct('<II')  # map seed, CRC of the global RNG state
+
+# Record opcodes; append new ones to keep old recordings readable
+(OP_NEW_GAME, OP_LOAD, OP_MOVE, OP_CHOOSE, OP_SUBMIT, OP_ATTACK, OP_BATTLE, OP_USE_ITEM,
+ OP_INVENTORY, OP_TRAVEL, OP_CANCEL_TRAVEL, OP_WAIT, OP_CHECKPOINT, OP_END) = range(14)
+
+# GameEngine command name -> opcode
+COMMAND_OPS = {"new_game": OP_NEW_GAME, "load": OP_LOAD, "move": OP_MOVE, "choose": OP_CHOOSE, "submit": OP_SUBMIT,
+               "attack": OP_ATTACK, "battle": OP_BATTLE, "use_item": OP_USE_ITEM, "inventory": OP_INVENTORY,
+               "travel": OP_TRAVEL, "cancel_travel": OP_CANCEL_TRAVEL}
+OP_COMMANDS = {op: name for name, op in COMMAND_OPS.items()}
+_TEXT_OPS = frozenset((OP_CHOOSE, OP_SUBMIT, OP_BATTLE, OP_TRAVEL))
+_PLAIN_OPS = frozenset((OP_ATTACK, OP_INVENTORY, OP_CANCEL_TRAVEL))
+
+
+def rng_fingerprint() -> int:
+    """CRC of the global random state, i.e. where the shared RNG stream currently is."""
+    state = random.getstate()[1]
+    return zlib.crc32(struct.pack(f'<{len(state)}I', *state))
+
+
+def state_digest(engine) -> int:
+    """CRC of the packed game state, used to check that a replay ended where the run did."""
+    return zlib.crc32(capture(engine)) if engine.game_map is not None else 0
+
+
+class InputRecorder:
+    """Records the commands a client sends to the engine into a compact log.
+
+    Together with the recorded seed of the global RNG, the commands reproduce a
+    session exactly. Frames are only recorded while they matter (battles and
+    auto-travel), runs of equal frame times are merged and the body is compressed.
+    """
+
+    def __init__(self, realtime: bool = True, rng_seed: int = None) -> None:
+        self.realtime = realtime
+        self.rng_seed = rng_seed if rng_seed is not None else int.from_bytes(os.urandom(4), 'little')
+        random.seed(self.rng_seed)
+        self.records = bytearray()
+        self._wait = None  # (milliseconds, count) of the pending run of frames
+
+    def record(self, name: str, args) -> None:
+        """Appends one command, as passed to GameEngine.apply()."""
+        if name == "wait":
+            ms = min(int(round(args[0] * 1000)), 0xFFFF)
+            if self._wait is not None and self._wait[0] == ms and self._wait[1] < 0xFFFF:
+                self._wait = (ms, self._wait[1] + 1)
+            else:
+                self._flush_wait()
+                self._wait = (ms, 1)
+            return
+        if name not in COMMAND_OPS:
+            raise ValueError(f"Cannot record command: {name}")
+        self._flush_wait()
+        op = COMMAND_OPS[name]
+        out = self.records
+        out.append(op)
+        if op == OP_MOVE:
+            out += _MOVE.pack(*args)
+        elif op in _TEXT_OPS:
+            data = str(args[0]).encode('utf-8')
+            out += _U16.pack(len(data))
+            out += data
+        elif op == OP_USE_ITEM:
+            out += _U16.pack(args[0])
+        elif op == OP_NEW_GAME:
+            out += _U32.pack(args[0] if args and args[0] is not None else NO_SEED)
+        elif op == OP_LOAD:
+            out += _U32.pack(len(args[0]))
+            out += args[0]
+
+    def checkpoint(self, engine) -> None:
+        """Records the map seed and RNG position so a replay can tell where it diverged."""
+        self._flush_wait()
+        self.records.append(OP_CHECKPOINT)
+        self.records += _CHECKPOINT.pack(engine.seed or 0, rng_fingerprint())
+
+    def finish(self, engine) -> None:
+        """Records the final state digest."""
+        self._flush_wait()
+        self.records.append(OP_END)
+        self.records += _U32.pack(state_digest(engine))
+
+    def _flush_wait(self):
+        if self._wait is not None:
+            self.records.append(OP_WAIT)
+            self.records += _WAIT.pack(*self._wait)
+            self._wait = None
+
+    def to_bytes(self) -> bytes:
+        self._flush_wait()
+        return _HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, self.realtime, self.rng_seed) + zlib.compress(self.records)
+
+    def save(self, path: str = RECORDING_PATH, writer=None) -> None:
+        """Writes the recording, through a background SaveWriter when given one."""
+        if writer is not None:
+            writer.submit(path, self.to_bytes())
+        else:
+            write_save(path, self.to_bytes())
+
+
+def iter_records(data: bytes):
+    """Yields (opcode, args) from a recording body."""
+    offset, size = 0, len(data)
+    while offset < size:
+        op = data[offset]
+        offset += 1
+        if op == OP_MOVE:
+            args = _MOVE.unpack_from(data, offset)
+            offset += _MOVE.size
+        elif op in _TEXT_OPS:
+            length, = _U16.unpack_from(data, offset)
+            offset += _U16.size
+            args = (data[offset:offset + length].decode('utf-8'),)
+            offset += length
+        elif op in _PLAIN_OPS:
+            args = ()
+        elif op == OP_USE_ITEM:
+            args = _U16.unpack_from(data, offset)
+            offset += _U16.size
+        elif op == OP_NEW_GAME:
+            seed, = _U32.unpack_from(data, offset)
+            offset += _U32.size
+            args = (None if seed == NO_SEED else seed,)
+        elif op == OP_LOAD:
+            length, = _U32.unpack_from(data, offset)
+            offset += _U32.size
+            args = (bytes(data[offset:offset + length]),)
+            offset += length
+        elif op == OP_WAIT:
+            args = _WAIT.unpack_from(data, offset)
+            offset += _WAIT.size
+        elif op == OP_CHECKPOINT:
+            args = _CHECKPOINT.unpack_from(data, offset)
+            offset += _CHECKPOINT.size
+        elif op == OP_END:
+            args = _U32.unpack_from(data, offset)
+            offset += _U32.size
+        else:
+            raise ValueError(f"Unknown record opcode {op} at offset {offset - 1}")
+        yield op, args
+
+
+def read_recording(data: bytes):
+    """Returns (realtime, rng_seed, body) of a recording."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Recording is truncated")
+    magic, version, realtime, rng_seed = _HEADER.unpack_from(data)
+    if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+        raise ValueError("Not a Desgoblin recording or unsupported version")
+    return bool(realtime), rng_seed, zlib.decompress(data[_HEADER.size:])
+
+
+class ReplayResult:
+    __slots__ = ("engine", "commands", "frames", "seconds", "mismatches")
+
+    def __init__(self, engine, commands, frames, seconds, mismatches):
+        self.engine = engine
+        self.commands = commands
+        self.frames = frames
+        self.seconds = seconds
+        self.mismatches = mismatches  # Descriptions of checkpoints that didn't match
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+def replay(data: bytes) -> ReplayResult:
+    """Runs a recording through a fresh headless engine as fast as possible, without rendering."""
+    realtime, rng_seed, body = read_recording(data)
+    engine = GameEngine(realtime=realtime)
+    random.seed(rng_seed)  # The recorder seeds it once the client's engine exists
+    apply = engine.apply
+    commands = frames = 0
+    mismatches = []
+    start = time.perf_counter()
+    for op, args in iter_records(body):
+        if op == OP_WAIT:
+            ms, count = args
+            for _ in range(count):
+                engine.advance(ms / 1000)
+            frames += count
+            continue
+        if op == OP_CHECKPOINT:
+            seed, fingerprint = args
+            if (engine.seed or 0, rng_fingerprint()) != (seed, fingerprint):
+                mismatches.append(f"checkpoint after command {commands}: map seed {engine.seed}, expected {seed}")
+            continue
+        if op == OP_END:
+            if state_digest(engine) != args[0]:
+                mismatches.append(f"final state differs after command {commands}")
+            continue
+        apply((OP_COMMANDS[op],) + args)
+        commands += 1
+    return ReplayResult(engine, commands, frames, time.perf_counter() - start, mismatches)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else RECORDING_PATH
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Error: Could not read recording {path}: {e}")
+        return 2
+    result = replay(data)
+    engine = result.engine
+    rate = (result.commands + result.frames) / max(result.seconds, 1e-9)
+    print(f"Replayed {result.commands} commands and {result.frames} frames in {result.seconds:.3f}s ({rate:.0f} steps/s)")
+    print(f"Final state: mode {engine.mode}, cycle {engine.cycle}, seed {engine.seed}, hp {engine.hero.health}")
+    for mismatch in result.mismatches:
+        print(f"Mismatch: {mismatch}")
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# game_system/save.py
+
+import os
+import queue
+import struct
+import threading
+import zlib
+
+from battle_system.hero import Hero
+from battle_system.item import ITEM_REGISTRY
+from battle_system.weapon import Weapon
+from map_system.map import Map
+from map_system.spawns import SpawnDescriptor
+from map_system.tiles import TILE_IDS, TILE_TABLE
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SAVE_PATH = os.path.join(PROJECT_ROOT, 'saves', 'autosave.sav')
+
+SAVE_MAGIC = b'DGSV'
+SAVE_VERSION = 2
+
+SAVE_TILES = TILE_TABLE  # Terrain tiles by save id
+TIERS = ("low", "mid", "high")
+BEHAVIORS = ("idle", "chase", "flee")
+
+_HEADER = struct.Struct('<4sH')
+_GAME = struct.Struct('<IHH')  # seed, cycle, bosses defeated
+_MAP = struct.Struct('<HHHHB')  # width, height, player x, player y, tile under the player
+_HERO = struct.Struct('<9i')  # health, health max, evade, crit, armor, cash, level, experience, experience to next
+_WEAPON = struct.Struct('<iiH')  # damage, value, cycle
+_DELTA = struct.Struct('<HHB')  # x, y, tile id
+_SPAWN = struct.Struct('<BHIHHB')  # tier, cycle, seed, x, y, behavior
+_COUNT = struct.Struct('<I')
+
+
+def _pack_str(out: bytearray, text: str) -> None:
+    data = text.encode('utf-8')
+    out += struct.pack('<H', len(data))
+    out += data
+
+
+class _Reader:
+    """Sequential reader over save bytes."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct):
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def count(self) -> int:
+        return self.unpack(_COUNT)[0]
+
+    def string(self) -> str:
+        size = struct.unpack_from('<H', self.data, self.offset)[0]
+        self.offset += 2
+        text = self.data[self.offset:self.offset + size].decode('utf-8')
+        self.offset += size
+        return text
+
+    def raw(self, size: int) -> bytes:
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+
+def capture(game) -> bytes:
+    """Packs a game into save bytes: the map seed plus changed cells, spawns, fog and the hero."""
+    game_map, hero = game.game_map, game.hero
+    out = bytearray(_HEADER.pack(SAVE_MAGIC, SAVE_VERSION))
+    out += _GAME.pack(game.seed, game.cycle, game.boss_defeated)
+
+    x, y = game_map.player_pos
+    under = game_map.map_data[x][y]
+    if under.symbol_raw == 'P':
+        under = game_map.player_previous_tile
+    out += _MAP.pack(game_map.width, game_map.height, x, y, TILE_IDS[under])
+
+    _pack_str(out, hero.name)
+    out += _HERO.pack(hero.health, hero.health_max, hero.evade_ch, hero.crit_ch, hero.armor, hero.cashpile,
+                      hero.level, hero.experience, hero.experience_to_next_level)
+    weapon = hero.weapon
+    _pack_str(out, weapon.name)
+    _pack_str(out, weapon.weapon_type)
+    _pack_str(out, weapon.tier)
+    out += _WEAPON.pack(weapon.damage, weapon.value, weapon.cycle)
+
+    stacks = hero.items.stacks()
+    out += _COUNT.pack(len(stacks))
+    for item, count in stacks:
+        _pack_str(out, item.name)
+        out += _COUNT.pack(count)
+
+    out += _COUNT.pack(len(game_map.deltas))
+    for (dx, dy), tile in game_map.deltas.items():
+        out += _DELTA.pack(dx, dy, TILE_IDS[tile])
+
+    spawns = [e for e in game_map.enemies if isinstance(e, SpawnDescriptor)]
+    out += _COUNT.pack(len(spawns))
+    for spawn in spawns:
+        out += _SPAWN.pack(TIERS.index(spawn.tier), spawn.cycle, spawn.seed, spawn.pos[0], spawn.pos[1],
+                           BEHAVIORS.index(spawn.behavior))
+
+    explored = zlib.compress(bytes(game_map.fov.explored)) if game_map.fov is not None else b''
+    out += _COUNT.pack(len(explored))
+    out += explored
+    return bytes(out)
+
+
+def restore(game, data: bytes) -> None:
+    """Rebuilds the map from its seed, applies the saved changes and restores the hero onto `game`."""
+    reader = _Reader(data)
+    magic, version = reader.unpack(_HEADER)
+    if magic != SAVE_MAGIC or version != SAVE_VERSION:
+        raise ValueError("Not a Desgoblin save file or unsupported version")
+    game.seed, game.cycle, game.boss_defeated = reader.unpack(_GAME)
+    width, height, player_x, player_y, under_id = reader.unpack(_MAP)
+
+    name = reader.string()
+    (health, health_max, evade_ch, crit_ch, armor, cashpile,
+     level, experience, experience_to_next_level) = reader.unpack(_HERO)
+    hero = Hero(name=name, health=health_max)
+    hero.health, hero.evade_ch, hero.crit_ch, hero.armor = health, evade_ch, crit_ch, armor
+    hero.cashpile, hero.level = cashpile, level
+    hero.experience, hero.experience_to_next_level = experience, experience_to_next_level
+    weapon_name, weapon_type, weapon_tier = reader.string(), reader.string(), reader.string()
+    damage, value, cycle = reader.unpack(_WEAPON)
+    hero.weapon = Weapon(name=weapon_name, weapon_type=weapon_type, damage=damage, value=value,
+                         tier=weapon_tier, cycle=cycle)
+    hero.invalidate_profile()
+    for _ in range(reader.count()):
+        item_name, count = reader.string(), reader.count()
+        if item_name in ITEM_REGISTRY:
+            hero.items.add(item_name, count)
+        else:
+            print(f"Warning: Saved item '{item_name}' no longer exists.")
+    hero.health_bar.update()
+
+    game_map = Map(game.screen, width, height, seed=game.seed)
+    for _ in range(reader.count()):
+        x, y, tile_id = reader.unpack(_DELTA)
+        game_map.set_tile(x, y, SAVE_TILES[tile_id])
+    for _ in range(reader.count()):
+        tier_id, spawn_cycle, seed, x, y, behavior_id = reader.unpack(_SPAWN)
+        # Every spawn of a level was made with the level's boss count, which the game record holds
+        spawn = SpawnDescriptor(TIERS[tier_id], spawn_cycle, seed, behavior=BEHAVIORS[behavior_id],
+                                boss_defeated=game.boss_defeated)
+        game_map.place_enemy(spawn, x, y)
+    game_map.restore_player(player_x, player_y, SAVE_TILES[under_id])
+
+    explored = reader.raw(reader.count())
+    if explored:
+        game_map.enable_fog()
+        game_map.fov.explored[:] = bytes(a | b for a, b in zip(zlib.decompress(explored), game_map.fov.explored))
+
+    hero.player_pos = game_map.player_pos
+    game.hero = hero
+    game.game_map = game_map
+
+
+def write_save(path: str, data: bytes) -> None:
+    """Writes a save atomically: a crash mid-write never leaves a torn save behind."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def read_save(path: str = SAVE_PATH) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class SaveWriter:
+    """Writes saves on a background thread so autosaving never stalls a frame.
+
+    The game state is packed on the caller's thread (it is small and must be
+    consistent); only the disk write happens in the background.
+    """
+
+    def __init__(self) -> None:
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, data: bytes) -> None:
+        self._queue.put((path, data))
+
+    def wait(self) -> None:
+        """Blocks until every submitted save is on disk."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            path, data = self._queue.get()
+            try:
+                write_save(path, data)
+            except OSError as e:
+                print(f"Warning: Could not write save file {path}: {e}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,96 @@
+# game_system/scheduler.py
+
+import heapq
+import itertools
+
+BASE_TURN_DELAY = 0.6  # Seconds of simulation time between turns for a combatant with 0 evade
+SIM_STEP = 1 / 30  # Fixed simulation step in seconds
+
+
+def turn_delay(character) -> float:
+    """Returns the delay before a character acts again; more agile characters act sooner."""
+    return BASE_TURN_DELAY * 100 / (100 + max(character.evade_ch, 0))
+
+
+def initiative_order(characters):
+    """Returns the characters sorted by who acts first."""
+    return sorted(characters, key=turn_delay)
+
+
+class FixedStepClock:
+    """Accumulates frame time and hands out a whole number of fixed simulation steps."""
+
+    def __init__(self, step: float = SIM_STEP, max_steps: int = 8):
+        self.step = step
+        self.max_steps = max_steps  # Caps catch-up after a long frame
+        self.accumulator = 0.0
+
+    def advance(self, dt: float) -> int:
+        """Adds `dt` seconds of frame time and returns how many steps to simulate."""
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step left over, for interpolating between simulation states."""
+        return self.accumulator / self.step
+
+
+class TurnScheduler:
+    """Priority queue of timed actions, advanced in fixed simulation steps."""
+
+    def __init__(self):
+        self.time = 0.0
+        self._queue = []
+        self._counter = itertools.count()  # Keeps FIFO order for actions due at the same time
+
+    def __len__(self):
+        return len(self._queue)
+
+    def schedule(self, delay: float, action, *args) -> list:
+        """Schedules `action(*args)` to run `delay` seconds from now and returns its handle."""
+        entry = [self.time + delay, next(self._counter), action, args]
+        heapq.heappush(self._queue, entry)
+        return entry
+
+    def cancel(self, entry: list) -> None:
+        """Cancels a scheduled action; it is dropped lazily when it reaches the front."""
+        entry[2] = None
+
+    def clear(self) -> None:
+        """Drops every pending action."""
+        self._queue.clear()
+
+    def next_time(self):
+        """Returns the time of the next pending action, or None if idle."""
+        while self._queue and self._queue[0][2] is None:
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+
+    def step(self, dt: float = SIM_STEP) -> int:
+        """Advances time by `dt` and runs every action that came due, returning the count."""
+        self.time += dt
+        ran = 0
+        while self._queue and self._queue[0][0] <= self.time:
+            _, _, action, args = heapq.heappop(self._queue)
+            if action is not None:
+                action(*args)
+                ran += 1
+        return ran
+
+    def run_until_idle(self, max_actions: int = 10000) -> int:
+        """Runs pending actions back to back without waiting, for headless simulation."""
+        ran = 0
+        while ran < max_actions:
+            due = self.next_time()
+            if due is None:
+                break
+            self.time = max(self.time, due)
+            ran += self.step(0.0)
+        return ran
@@ -0,0 +1,81 @@
+# game_system/startup.py
+
+import os
+import sys
+import time
+
+PROFILE_ENV = "DESGOBLIN_PROFILE_STARTUP"
+PROFILE_FLAG = "--profile-startup"
+
+
+def init_pygame() -> None:
+    """Initializes only the pygame modules the game uses; safe to call repeatedly.
+
+    pygame.init() would also bring up audio and joystick support, which is slow to
+    open on some machines and unused here.
+    """
+    import pygame
+    pygame.display.init()
+    pygame.font.init()
+
+
+def process_start_time():
+    """perf_counter() reading at the moment the process started, or None if the OS doesn't say."""
+    try:
+        with open('/proc/self/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        # Field 22 of /proc/self/stat is the start time in clock ticks since boot
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    return time.perf_counter() - max(age, 0.0)
+
+
+class StartupProfiler:
+    """Splits the time from process start to the first menu frame into named phases.
+
+    Each mark() closes a phase that began at the previous mark. When disabled, mark()
+    and first_frame() return immediately.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.phases = []  # (name, seconds)
+        self.reported = False
+        now = time.perf_counter()
+        start = process_start_time() if enabled else None
+        self.origin = start if start is not None else now
+        self._last = self.origin
+        if enabled and start is not None:
+            self.mark("interpreter start")
+
+    def mark(self, name: str) -> None:
+        """Ends the current phase, naming it."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def first_frame(self) -> None:
+        """Called once the first menu frame is on screen; prints the report the first time."""
+        if not self.enabled or self.reported:
+            return
+        self.mark("first menu frame")
+        self.reported = True
+        self.report()
+
+    @property
+    def total(self) -> float:
+        return self._last - self.origin
+
+    def report(self, stream=None) -> None:
+        stream = stream or sys.stdout
+        total = self.total or 1e-9
+        print("Startup profile (process start -> first menu frame):", file=stream)
+        for name, seconds in self.phases:
+            print(f"  {name:<20} {seconds * 1000:8.1f} ms  {seconds / total:6.1%}", file=stream)
+        print(f"  {'total':<20} {self.total * 1000:8.1f} ms", file=stream)
+
+
+profiler = StartupProfiler(enabled=os.environ.get(PROFILE_ENV) == "1" or PROFILE_FLAG in sys.argv)
@@ -0,0 +1,129 @@
+# map_system/connectivity.py
+
+from array import array
+from collections import deque
+
+from map_system.pathfinding import is_passable
+from map_system.tiles import beach, default, lake, plains, river, water
+
+# Blocking terrain a repair may cut through, and what it becomes: water is forded, unfilled land cleared
+CARVE_TILES = {river: beach, lake: beach, water: beach, default: plains}
+
+
+class Components:
+    """Union-find over the cells of a flat mask, indexed x * width + y."""
+
+    __slots__ = ("parent",)
+
+    def __init__(self, size: int) -> None:
+        self.parent = array('I', range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # Path halving
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # The smaller root wins so labels don't depend on merge order
+            if a < b:
+                self.parent[b] = a
+            else:
+                self.parent[a] = b
+
+
+def label_components(mask, width: int) -> Components:
+    """Joins every set cell of the mask with its set neighbours above and to the left.
+
+    Works on horizontal runs: a cell continuing a run just points at the run's
+    parent, and a run is merged with the row above once per overlapping stretch.
+    """
+    components = Components(len(mask))
+    parent, union = components.parent, components.union
+    for i, cell in enumerate(mask):
+        if not cell:
+            continue
+        left = i % width and mask[i - 1]
+        if left:
+            parent[i] = parent[i - 1]
+        if i >= width and mask[i - width] and not (left and mask[i - width - 1]):
+            union(i, i - width)
+    return components
+
+
+def connect_landmarks(game_map, start) -> int:
+    """Makes every landmark reachable on foot from `start`, returning the number of cells carved.
+
+    Labels the player-passable cells into components once; a landmark is reachable
+    when it or a neighbour shares the start's component. For each one that isn't,
+    a 0-1 breadth-first search finds the route crossing the fewest blocking cells
+    (see CARVE_TILES), which are carved and merged into the start's component.
+    Uses no randomness, so the rest of a seed's generation is unaffected.
+    """
+    width, height = game_map.width, game_map.height
+    map_data = game_map.map_data
+    mask = bytearray()
+    for row in map_data:
+        mask.extend(1 if is_passable(tile) else 0 for tile in row)
+    source = start[0] * width + start[1]
+    mask[source] = 1  # The player always stands somewhere
+    components = label_components(mask, width)
+
+    carved = 0
+    for x, y in list(game_map.landmarks):
+        root = components.find(source)
+        goals = {x * width + y}
+        goals.update(nx * width + ny for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)))
+        if any(mask[i] and components.find(i) == root for i in goals):
+            continue
+        for i in _cheapest_route(map_data, mask, width, height, source, goals):
+            cx, cy = divmod(i, width)
+            game_map.set_tile(cx, cy, CARVE_TILES[map_data[cx][cy]])
+            mask[i] = 1
+            for n in (i - 1, i + 1, i - width, i + width):
+                if mask[n]:
+                    components.union(i, n)
+            carved += 1
+    return carved
+
+
+def _cheapest_route(map_data, mask, width, height, source, goals):
+    """Blocking cells on the route from source to any passable-or-carvable goal that crosses the fewest of them."""
+    size = width * height
+    cost = array('H', [0xFFFF]) * size
+    previous = array('i', [-1]) * size
+    cost[source] = 0
+    queue = deque([source])
+    while queue:
+        i = queue.popleft()
+        if i in goals and i != source:
+            break
+        x, y = divmod(i, width)
+        for n, nx, ny in ((i - width, x - 1, y), (i + width, x + 1, y), (i - 1, x, y - 1), (i + 1, x, y + 1)):
+            if not (0 < nx < height - 1 and 0 < ny < width - 1):
+                continue  # Never through the frame
+            if mask[n]:
+                step = 0
+            elif map_data[nx][ny] in CARVE_TILES:
+                step = 1
+            else:
+                continue  # Structures and other fixed terrain
+            if cost[i] + step < cost[n]:
+                cost[n] = cost[i] + step
+                previous[n] = i
+                if step:
+                    queue.append(n)
+                else:
+                    queue.appendleft(n)
+    else:
+        return []
+
+    route = []
+    while i != source:
+        if not mask[i]:
+            route.append(i)
+        i = previous[i]
+    return route
@@ -0,0 +1,130 @@
+# map_system/fov.py
+
+FOV_RADIUS = 8
+
+# Transforms mapping octant-local (dx, dy) onto map offsets: x = dx * xx + dy * xy, y = dx * yx + dy * yy
+_OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+
+def build_opacity_mask(map_data, width: int) -> bytearray:
+    """Flattens the map into a bytearray with 1 for cells that block sight."""
+    mask = bytearray()
+    for row in map_data:
+        mask.extend(1 if tile.opaque else 0 for tile in row[:width])
+    return mask
+
+
+class FieldOfView:
+    """Visible and explored cells around the player, kept as packed bitsets.
+
+    Cell `x * width + y` is bit `i & 7` of byte `i >> 3`. Visibility is recomputed by
+    recursive shadowcasting only when the origin moves or a tile within sight changes
+    opacity; only the bits set by the previous pass are cleared.
+    """
+
+    __slots__ = ("width", "height", "radius", "opaque", "visible", "explored", "origin", "_visible_cells", "_rows")
+
+    def __init__(self, width: int, height: int, opaque: bytearray, radius: int = FOV_RADIUS) -> None:
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.opaque = opaque
+        size = (width * height + 7) >> 3
+        self.visible = bytearray(size)
+        self.explored = bytearray(size)
+        self.origin = None
+        self._visible_cells = []  # Cell indexes set in `visible`
+        # Per octant row: (dx, left slope, right slope, inside radius) for every cell, computed once
+        self._rows = [None] + [
+            [(dx, (dx - 0.5) / (-j + 0.5), (dx + 0.5) / (-j - 0.5), dx * dx + j * j <= radius * radius)
+             for dx in range(-j, 1)]
+            for j in range(1, radius + 1)
+        ]
+
+    def is_visible(self, x: int, y: int) -> bool:
+        i = x * self.width + y
+        return bool(self.visible[i >> 3] >> (i & 7) & 1)
+
+    def is_explored(self, x: int, y: int) -> bool:
+        i = x * self.width + y
+        return bool(self.explored[i >> 3] >> (i & 7) & 1)
+
+    def update(self, origin, force: bool = False) -> bool:
+        """Recomputes visibility from `origin`; returns False if nothing needed recomputing."""
+        if origin == self.origin and not force:
+            return False
+        visible = self.visible
+        for i in self._visible_cells:
+            visible[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        self._visible_cells = []
+        self.origin = origin
+
+        x, y = origin
+        self._mark(x, y)
+        for xx, xy, yx, yy in _OCTANTS:
+            self._cast(x, y, 1, 1.0, 0.0, xx, xy, yx, yy)
+        return True
+
+    def set_opaque(self, x: int, y: int, opaque: bool) -> None:
+        """Updates one cell's opacity, recomputing if it is within sight of the origin."""
+        i = x * self.width + y
+        value = 1 if opaque else 0
+        if self.opaque[i] == value:
+            return
+        self.opaque[i] = value
+        if self.origin is not None:
+            ox, oy = self.origin
+            if max(abs(x - ox), abs(y - oy)) <= self.radius:
+                self.update(self.origin, force=True)
+
+    def _mark(self, x: int, y: int) -> None:
+        i = x * self.width + y
+        bit = 1 << (i & 7)
+        if not self.visible[i >> 3] & bit:
+            self.visible[i >> 3] |= bit
+            self.explored[i >> 3] |= bit
+            self._visible_cells.append(i)
+
+    def _cast(self, cx, cy, row, start, end, xx, xy, yx, yy) -> None:
+        """Scans one octant row by row, recursing past each run of opaque cells."""
+        if start < end:
+            return
+        radius = self.radius
+        width, height, opaque = self.width, self.height, self.opaque
+        visible, explored, visible_cells = self.visible, self.explored, self._visible_cells
+        rows = self._rows
+        new_start = 0.0
+        for j in range(row, radius + 1):
+            dy = -j
+            blocked = False
+            for dx, left_slope, right_slope, in_radius in rows[j]:
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+                x = cx + dx * xx + dy * xy
+                y = cy + dx * yx + dy * yy
+                if not (0 <= x < height and 0 <= y < width):
+                    continue
+                i = x * width + y
+                if in_radius:
+                    bit = 1 << (i & 7)
+                    if not visible[i >> 3] & bit:
+                        visible[i >> 3] |= bit
+                        explored[i >> 3] |= bit
+                        visible_cells.append(i)
+                if blocked:
+                    if opaque[i]:
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif opaque[i] and j < radius:
+                    blocked = True
+                    self._cast(cx, cy, j + 1, start, left_slope, xx, xy, yx, yy)
+                    new_start = right_slope
+            if blocked:
+                break
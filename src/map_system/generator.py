@@ -0,0 +1,229 @@
+# map_system/generator.py
+
+import random
+
+from game_system.profiler import frame_profiler
+from map_system.connectivity import connect_landmarks
+from map_system.pathing import TIER_BEHAVIORS
+from map_system.spatial_hash import Landmark
+from map_system.spawns import SpawnDescriptor
+from map_system.tiles import (TILE_IDS, TILE_TABLE, plains, forest, mountain, lake, brush, desert, swamp, snow, hill,
+                              river, default, frame_tile, village, cave, ruins, shrine_tile, boss_tile, treasure)
+
+# Structure tiles indexed as landmarks for proximity queries
+LANDMARK_TILES = (village, cave, ruins, shrine_tile, boss_tile, treasure)
+
+# (tile, number of patches, min size, max size), painted in this order
+BIOMES = (
+    (plains, 40, 10, 20),   # Increased patch count and size
+    (forest, 30, 8, 15),
+    (mountain, 20, 6, 12),
+    (lake, 15, 6, 10),
+    (brush, 20, 5, 12),
+    (desert, 15, 5, 12),
+    (swamp, 10, 5, 10),
+    (snow, 10, 5, 10),
+    (hill, 15, 5, 12),
+)
+# (structure, tile it is placed on, count, name)
+STRUCTURES = (
+    (village, default, 2, "Village"),
+    (cave, mountain, 3, "Cave"),
+    (ruins, plains, 2, "Ruins"),
+    (shrine_tile, plains, 1, "Shrine"),
+    (treasure, forest, 3, "Treasure"),
+)
+SPAWN_COUNTS = (("low", 5), ("mid", 3), ("high", 2))
+START = (1, 1)  # Where the player enters the map
+
+
+class GenerationParams:
+    """What to generate; the defaults give the game's maps without enemies.
+
+    With `cycle` set, enemy spawns for that cycle and boss count are placed as well,
+    continuing the same RNG stream as Map.select_enemies/place_enemies_on_map.
+    """
+
+    __slots__ = ("biomes", "num_rivers", "structures", "cycle", "boss_defeated")
+
+    def __init__(self, biomes=BIOMES, num_rivers: int = 3, structures=STRUCTURES, cycle: int = None,
+                 boss_defeated: int = 0) -> None:
+        self.biomes = biomes
+        self.num_rivers = num_rivers
+        self.structures = structures
+        self.cycle = cycle
+        self.boss_defeated = boss_defeated
+
+
+class GeneratedMap:
+    """Result of a generation run: the tile grid plus structure and spawn records.
+
+    `grid` holds the shared tile objects (rows of map_data). Pickling stores tile ids
+    instead, so results can be made in worker processes or cached and still refer
+    to the same tiles once loaded.
+    """
+
+    __slots__ = ("seed", "width", "height", "grid", "structures", "spawns", "placement_failures", "carved_cells",
+                 "rng")
+
+    def __init__(self, seed, width, height, grid, structures, spawns, placement_failures, carved_cells, rng):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.grid = grid
+        self.structures = structures  # Landmarks, in placement order
+        self.spawns = spawns  # SpawnDescriptors with their positions
+        self.placement_failures = placement_failures  # Structures that found no spot
+        self.carved_cells = carved_cells  # Fords and trails cut to stranded landmarks
+        self.rng = rng  # Generation RNG, left where generation stopped
+
+    def tile_ids(self) -> bytes:
+        """The grid as one tile id per cell, row by row."""
+        return bytes(TILE_IDS[tile] for row in self.grid for tile in row)
+
+    def __getstate__(self):
+        structures = [(TILE_IDS[landmark.tile], landmark.pos) for landmark in self.structures]
+        return (self.seed, self.width, self.height, self.tile_ids(), structures, self.spawns,
+                self.placement_failures, self.carved_cells, self.rng)
+
+    def __setstate__(self, state):
+        (self.seed, self.width, self.height, ids, structures, self.spawns,
+         self.placement_failures, self.carved_cells, self.rng) = state
+        width = self.width
+        self.grid = [[TILE_TABLE[i] for i in ids[x:x + width]] for x in range(0, len(ids), width)]
+        self.structures = [Landmark(TILE_TABLE[tile_id].name, TILE_TABLE[tile_id], tuple(pos))
+                           for tile_id, pos in structures]
+
+
+def select_spawns(rng, boss_defeated: int, cycle: int) -> list:
+    """Rolls the spawn descriptors of a level; each full Enemy is only built when encountered."""
+    return [SpawnDescriptor(tier, cycle, rng.getrandbits(32), behavior=TIER_BEHAVIORS[tier],
+                            boss_defeated=boss_defeated)
+            for tier, count in SPAWN_COUNTS for _ in range(count)]
+
+
+class MapGenerator:
+    """Generates maps as plain data, without pygame or a display.
+
+    One generator is reused for any number of seeds of its size; passing the grid
+    and rng of an earlier result regenerates into them instead of allocating.
+    The attributes below describe the run in progress.
+    """
+
+    def __init__(self, width: int, height: int, params: GenerationParams = None) -> None:
+        self.width = width
+        self.height = height
+        self.params = params if params is not None else GenerationParams()
+        # Rows copied into the grid by reset_grid()
+        self._edge_row = [frame_tile] * width
+        self._inner_row = [frame_tile] + [default] * (width - 2) + [frame_tile]
+        self.map_data = None
+        self.rng = None
+        self.landmarks = None  # (x, y) -> Landmark
+        self.placement_failures = 0
+
+    def generate(self, seed: int, grid=None, rng=None) -> GeneratedMap:
+        """Runs the generation phases for a seed, each timed by the frame profiler."""
+        if rng is None:
+            rng = random.Random(seed)
+        else:
+            rng.seed(seed)
+        if grid is None:
+            grid = [list(self._edge_row if x in (0, self.height - 1) else self._inner_row) for x in range(self.height)]
+        self.map_data, self.rng, self.landmarks, self.placement_failures = grid, rng, {}, 0
+        params = self.params
+        try:
+            with frame_profiler.scope("map: frame"):
+                self.reset_grid()
+            with frame_profiler.scope("map: biomes"):
+                for tile, num_patches, min_size, max_size in params.biomes:
+                    self.generate_patch_optimized(tile, num_patches, min_size, max_size)
+            with frame_profiler.scope("map: rivers"):
+                self.generate_rivers(params.num_rivers)
+            with frame_profiler.scope("map: structures"):
+                for tile, target_tile, count, name in params.structures:
+                    self.place_structure(tile, target_tile, count, name)
+            with frame_profiler.scope("map: connectivity"):
+                carved_cells = connect_landmarks(self, START)
+            spawns = self.place_spawns(params.boss_defeated, params.cycle) if params.cycle is not None else []
+            return GeneratedMap(seed, self.width, self.height, grid, list(self.landmarks.values()), spawns,
+                                self.placement_failures, carved_cells, rng)
+        finally:
+            self.map_data = self.rng = self.landmarks = None
+
+    def reset_grid(self):
+        """Refills the grid with default tiles inside the frame, overwriting its rows in place."""
+        last = self.height - 1
+        edge_row, inner_row = self._edge_row, self._inner_row
+        for x, row in enumerate(self.map_data):
+            row[:] = edge_row if x == 0 or x == last else inner_row
+
+    def set_tile(self, x, y, tile):
+        """Replaces the terrain at (x, y), keeping the landmark records in sync."""
+        self.map_data[x][y] = tile
+        self.landmarks.pop((x, y), None)
+        if tile in LANDMARK_TILES:
+            self.landmarks[(x, y)] = Landmark(tile.name, tile, (x, y))
+
+    def generate_patch_optimized(self, tile, num_patches, min_size, max_size):
+        """Generates patches with optimized approach."""
+        rng, map_data = self.rng, self.map_data
+        for _ in range(num_patches):
+            x, y = rng.randint(1, self.height - 2), rng.randint(1, self.width - 2)
+            patch_size = rng.randint(min_size, max_size)
+            directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+            for _ in range(patch_size):
+                dx, dy = rng.choice(directions)
+                x, y = min(max(1, x + dx), self.height - 2), min(max(1, y + dy), self.width - 2)
+                if map_data[x][y] == default:
+                    map_data[x][y] = tile
+
+    def generate_rivers(self, num_rivers=3):
+        """Generates rivers using an optimized approach."""
+        rng, map_data = self.rng, self.map_data
+        for _ in range(num_rivers):
+            # Rivers spring from mountains; earlier rivers may have washed the last ones away
+            if not any(mountain in row for row in map_data):
+                break
+            x, y = rng.randint(1, self.height - 2), rng.randint(1, self.width - 2)
+            while map_data[x][y] != mountain:
+                x, y = rng.randint(1, self.height - 2), rng.randint(1, self.width - 2)
+            length = rng.randint(10, 20)
+            for _ in range(length):
+                map_data[x][y] = river
+                dx, dy = rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+                x, y = min(max(1, x + dx), self.height - 2), min(max(1, y + dy), self.width - 2)
+
+    def place_structure(self, structure_tile, target_tile_type, count, name):
+        """Optimized structure placement with limited attempts."""
+        placed_count = 0
+        attempts = 0
+        max_attempts = 100
+        while placed_count < count and attempts < max_attempts:
+            x, y = self.rng.randint(1, self.height - 2), self.rng.randint(1, self.width - 2)
+            if self.map_data[x][y] == target_tile_type:
+                self.set_tile(x, y, structure_tile)
+                placed_count += 1
+                print(f"{name} {placed_count} placed at ({x}, {y}) after {attempts + 1} attempts.")
+            attempts += 1
+        if placed_count < count:
+            self.placement_failures += count - placed_count
+            print(f"Failed to place all {name}s after {max_attempts} attempts.")
+
+    def place_spawns(self, boss_defeated, cycle):
+        """Rolls the level's spawns and gives each a free walkable cell, like Map.place_enemies_on_map."""
+        spawns = select_spawns(self.rng, boss_defeated, cycle)
+        taken = set()
+        for spawn in spawns:
+            for _ in range(201):  # Fail-safe after 200 attempts
+                x, y = self.rng.randint(1, self.height - 2), self.rng.randint(1, self.width - 2)
+                if self.map_data[x][y].walkable and (x, y) not in taken:
+                    spawn.pos = (x, y)
+                    taken.add((x, y))
+                    break
+        return [spawn for spawn in spawns if spawn.pos is not None]
+
+
+def generate_map(seed: int, width: int, height: int, params: GenerationParams = None) -> GeneratedMap:
+    """Generates one map as plain data; see MapGenerator."""
+    return MapGenerator(width, height, params).generate(seed)
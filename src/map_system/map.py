@@ -9,74 +9,168 @@ import random
 from collections import Counter
 from random import randint
 
+import pygame
+
 from map_system.tiles import *
-from battle_system.enemy import generate_enemy
+from map_system.fov import FOV_RADIUS, FieldOfView, build_opacity_mask
+from map_system.occupancy import OccupancyGrid
+from map_system.pathfinding import PathService
+from map_system.generator import LANDMARK_TILES, MapGenerator, select_spawns
+from map_system.pathing import AGGRO_RADIUS, DistanceField, build_walkable_mask, step_enemies
+from map_system.spatial_hash import Landmark, SpatialHash
+
+_fog_images = {}  # Tile image -> darkened copy drawn for explored cells out of sight
+
+
+def fog_image(image):
+    """Returns a darkened copy of a tile image, made once per image."""
+    fogged = _fog_images.get(image)
+    if fogged is None:
+        fogged = image.copy()
+        fogged.fill((90, 90, 90), special_flags=pygame.BLEND_RGB_MULT)
+        _fog_images[image] = fogged
+    return fogged
+
 
 class Map:
     """Class to represent the game map."""
     TILE_SIZE = 16
 
-    def __init__(self, screen: pygame.Surface, width: int, height: int, seed: int = None):
+    def __init__(self, screen: pygame.Surface, width: int, height: int, seed: int = None, generated=None):
         self.width = width
         self.height = height
         self.screen = screen
 
-        # Confirm that self.screen is a Surface
-        assert isinstance(self.screen, pygame.Surface), "screen should be a Pygame Surface"
+        # Confirm that self.screen is a Surface (None for headless maps)
+        assert self.screen is None or isinstance(self.screen, pygame.Surface), "screen should be a Pygame Surface"
 
         self.seed = seed if seed is not None else random.randint(0, 1000000)
-        random.seed(self.seed)
-
-        self.map_data = [[default for _ in range(self.width)] for _ in range(self.height)]
-        self.enemies = []
+        self.generator = MapGenerator(self.width, self.height)
+        self.map_data = None  # Rows of tiles, filled by the generator and regenerated in place
+        self.rng = None  # Private, so maps can be generated off the main thread
+        self.occupancy = OccupancyGrid(self.width, self.height)
+        self.spatial = SpatialHash()  # Enemies, landmarks and the player, for proximity queries
+        self.landmarks = {}  # (x, y) -> Landmark
+        self.deltas = {}  # (x, y) -> tile for every cell changed after generation, for saves
+        self.distance_field = None  # Kept across resets: every compute() overwrites it
+        self._reset_state()
+
+        self.generate(generated)
+        self.record_deltas = True
+
+    def _reset_state(self):
+        """Empties the indexes in place and resets the per-level state before the map is generated."""
+        self.occupancy.clear()
+        self.spatial.clear()
+        self.landmarks.clear()
+        self.deltas.clear()
+        self._walkable = None  # Flat walkable mask, built on first use
+        self.pathfinder = None  # PathService, created on first auto-travel
+        self.fov = None  # FieldOfView once fog of war is enabled
+        self.record_deltas = False
         self.boss_spawned = False
         self.player_pos = (1, 1)
-        self.player_previous_tile = self.map_data[self.player_pos[0]][self.player_pos[1]]
+        self.spatial.insert(player, *self.player_pos)
+        self.player_previous_tile = default
+
+    def generate(self, generated=None):
+        """Generates the map for its seed, or takes over a GeneratedMap made elsewhere.
+
+        Generation itself lives in MapGenerator, which needs no pygame; this adds the
+        landmarks and any spawns to the map's indexes.
+        """
+        if generated is None:
+            generated = self.generator.generate(self.seed, self.map_data, self.rng)
+        self.map_data = generated.grid
+        self.rng = generated.rng
+        self.placement_failures = generated.placement_failures  # Structures that found no spot
+        self.carved_cells = generated.carved_cells  # Fords and trails cut to stranded landmarks
+        for landmark in generated.structures:
+            self.landmarks[landmark.pos] = landmark
+            self.spatial.insert(landmark, *landmark.pos)
+        for spawn in generated.spawns:
+            self.place_enemy(spawn, *spawn.pos)
 
-        self.create_frame()
-        self.fill_default()
-        self.generate_biomes_and_patches()
-        self.generate_rivers()
-        self.place_structures_optimized()
+    @classmethod
+    def from_generated(cls, screen, generated):
+        """Wraps a GeneratedMap, e.g. one made in a worker process, as a playable map."""
+        return cls(screen, generated.width, generated.height, generated.seed, generated=generated)
 
+    @property
+    def enemies(self):
+        """Enemies and spawn descriptors on the map, in placement order."""
+        return self.occupancy
 
     @classmethod
     def generate_map_with_seed(cls, width: int, height: int, seed: int):
         """Generates a map with a specific seed value."""
-        return cls(width, height, seed)
+        return cls(None, width, height, seed)
     
     def draw(self, screen):
-        """Draws the map on the given screen."""
+        """Draws the map on the given screen.
+
+        With fog of war, unexplored cells are skipped, explored cells out of sight are
+        drawn darkened and only enemies in sight are drawn.
+        """
+        fov = self.fov
+        if fov is None:
+            for x in range(self.height):
+                for y in range(self.width):
+                    tile = self.map_data[x][y]
+                    if tile.image:
+                        # Draw each tile image on the screen
+                        self.screen.blit(tile.image, (y * self.TILE_SIZE, x * self.TILE_SIZE))
+
+            # Draw enemies
+            for enemy in self.enemies:
+                if enemy.image:
+                    self.screen.blit(enemy.image, (enemy.pos[1] * self.TILE_SIZE, enemy.pos[0] * self.TILE_SIZE))
+            return
+
+        visible, explored, width = fov.visible, fov.explored, self.width
         for x in range(self.height):
-            for y in range(self.width):
-                tile = self.map_data[x][y]
+            row = self.map_data[x]
+            for y in range(width):
+                i = x * width + y
+                bit = 1 << (i & 7)
+                if not explored[i >> 3] & bit:
+                    continue
+                tile = row[y]
                 if tile.image:
-                    # Draw each tile image on the screen
-                    self.screen.blit(tile.image, (y * self.TILE_SIZE, x * self.TILE_SIZE))
-        
-        # Draw enemies
-        for enemy in self.enemies:
-            if enemy.image:
+                    image = tile.image if visible[i >> 3] & bit else fog_image(tile.image)
+                    self.screen.blit(image, (y * self.TILE_SIZE, x * self.TILE_SIZE))
+
+        px, py = self.player_pos
+        radius = fov.radius
+        for enemy in self.enemies_in_rect(px - radius, py - radius, px + radius, py + radius):
+            if enemy.image and fov.is_visible(*enemy.pos):
                 self.screen.blit(enemy.image, (enemy.pos[1] * self.TILE_SIZE, enemy.pos[0] * self.TILE_SIZE))
 
+    def enable_fog(self, radius=FOV_RADIUS):
+        """Turns on fog of war, revealing the area around the player."""
+        self.fov = FieldOfView(self.width, self.height, build_opacity_mask(self.map_data, self.width), radius)
+        x, y = self.player_pos
+        if self.map_data[x][y] is player:
+            self.fov.opaque[x * self.width + y] = 1 if self.player_previous_tile.opaque else 0
+        self.fov.update(self.player_pos)
+
+    def is_explored(self, x, y):
+        """Whether the player has seen a cell (always True without fog of war)."""
+        return self.fov is None or self.fov.is_explored(x, y)
+
     def reset_map(self, seed):
-        """Resets the map with the provided seed without reinitializing the object."""
-        print(f"Resetting map with seed {seed}...")
-        random.seed(seed)
+        """Regenerates the map for another seed in place, reusing the grid, indexes and buffers.
 
-        # Clear existing map data
-        self.map_data = [[default for _ in range(self.width)] for _ in range(self.height)]
-        self.enemies = []
-        self.boss_spawned = False
-        self.player_pos = (1, 1)
-        self.player_previous_tile = self.map_data[self.player_pos[0]][self.player_pos[1]]
+        Gives the same map as Map(screen, width, height, seed) without allocating new
+        rows or per-cell objects, for level transitions and bulk generation.
+        """
+        print(f"Resetting map with seed {seed}...")
+        self.seed = seed
+        self._reset_state()  # generate() refills the grid
 
         # Regenerate map structures, biomes, rivers, and other elements
-        self.create_frame()
-        self.fill_default()
-        self.generate_biomes_and_patches()
-        self.generate_rivers()
-        self.place_structures_optimized()
+        self.generate()
+        self.record_deltas = True
 
     def place_player(self, hero=None):
         """Places the player on the map, making sure only one instance exists."""
@@ -111,9 +205,9 @@ class Map:
     def create_frame(self):
         """Creates a boundary frame around the map."""
         for x in range(self.width):
-            self.map_data[0][x] = self.map_data[self.height - 1][x] = Tile("=", "=", "grey", walkable=False)
+            self.map_data[0][x] = self.map_data[self.height - 1][x] = frame_tile
         for y in range(self.height):
-            self.map_data[y][0] = self.map_data[y][self.width - 1] = Tile("=", "=", "grey", walkable=False)
+            self.map_data[y][0] = self.map_data[y][self.width - 1] = frame_tile
 
     def fill_default(self):
         """Fills the internal part of the map with default tiles."""
@@ -121,73 +215,6 @@ class Map:
             for y in range(1, self.width - 1):
                 self.map_data[x][y] = default
 
-    def generate_biomes_and_patches(self):
-        """Generates biome patches in large blocks to reduce redundant random calls."""
-        biome_types = [
-            (plains, 40, 10, 20),   # Increased patch count and size
-            (forest, 30, 8, 15),
-            (mountain, 20, 6, 12),
-            (lake, 15, 6, 10),
-            (brush, 20, 5, 12),
-            (desert, 15, 5, 12),
-            (swamp, 10, 5, 10),
-            (snow, 10, 5, 10),
-            (hill, 15, 5, 12)
-        ]
-        for tile, num_patches, min_size, max_size in biome_types:
-            self.generate_patch_optimized(tile, num_patches, min_size, max_size)
-
-    def generate_patch_optimized(self, tile, num_patches, min_size, max_size):
-        """Generates patches with optimized approach."""
-        for _ in range(num_patches):
-            x, y = random.randint(1, self.height - 2), random.randint(1, self.width - 2)
-            patch_size = random.randint(min_size, max_size)
-            directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-            for _ in range(patch_size):
-                dx, dy = random.choice(directions)
-                x, y = min(max(1, x + dx), self.height - 2), min(max(1, y + dy), self.width - 2)
-                if self.map_data[x][y] == default:
-                    self.map_data[x][y] = tile
-
-    def generate_rivers(self, num_rivers=3):
-        """Generates rivers using an optimized approach."""
-        for _ in range(num_rivers):
-            x, y = random.randint(1, self.height - 2), random.randint(1, self.width - 2)
-            while self.map_data[x][y] != mountain:
-                x, y = random.randint(1, self.height - 2), random.randint(1, self.width - 2)
-            length = random.randint(10, 20)
-            for _ in range(length):
-                self.map_data[x][y] = river
-                dx, dy = random.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
-                x, y = min(max(1, x + dx), self.height - 2), min(max(1, y + dy), self.width - 2)
-
-    def place_structures_optimized(self):
-        """Places structures with reduced random retries."""
-        structure_params = [
-            (village, default, 2, "Village"),
-            (cave, mountain, 3, "Cave"),
-            (ruins, plains, 2, "Ruins"),
-            (shrine_tile, plains, 1, "Shrine"),
-            (treasure, forest, 3, "Treasure"),
-        ]
-        for tile, target_tile, count, name in structure_params:
-            self.place_structure(tile, target_tile, count, name)
-
-    def place_structure(self, structure_tile, target_tile_type, count, name):
-        """Optimized structure placement with limited attempts."""
-        placed_count = 0
-        attempts = 0
-        max_attempts = 100
-        while placed_count < count and attempts < max_attempts:
-            x, y = random.randint(1, self.height - 2), random.randint(1, self.width - 2)
-            if self.map_data[x][y] == target_tile_type:
-                self.map_data[x][y] = structure_tile
-                placed_count += 1
-                print(f"{name} {placed_count} placed at ({x}, {y}) after {attempts + 1} attempts.")
-            attempts += 1
-        if placed_count < count:
-            print(f"Failed to place all {name}s after {max_attempts} attempts.")
-
     def update_player_position(self, old_x, old_y, new_x, new_y):
         """Updates the player's position on the map."""
         self.map_data[old_x, old_y] = self.player_previous_tile
@@ -248,40 +275,133 @@ class Map:
         
         self.map_data[new_x][new_y] = player
         self.player_pos = (new_x, new_y)
+        self.spatial.move(player, new_x, new_y)
+        if self.fov is not None:
+            self.fov.update(self.player_pos)
+
+    def set_tile(self, x, y, tile):
+        """Replaces the terrain at (x, y), keeping the landmark index in sync.
+
+        If the player is standing there, the new tile is what they leave behind.
+        """
+        if (x, y) == self.player_pos and self.map_data[x][y] is player:
+            self.player_previous_tile = tile
+        else:
+            self.map_data[x][y] = tile
+        if self._walkable is not None:
+            self._walkable[x * self.width + y] = 1 if tile.walkable else 0
+        if self.pathfinder is not None:
+            self.pathfinder.tile_changed(x, y, tile)
+        if self.fov is not None:
+            self.fov.set_opaque(x, y, tile.opaque)
+        if self.record_deltas:
+            self.deltas[(x, y)] = tile
+
+        landmark = self.landmarks.pop((x, y), None)
+        if landmark is not None:
+            self.spatial.remove(landmark)
+        if tile in LANDMARK_TILES:
+            landmark = Landmark(tile.name, tile, (x, y))
+            self.landmarks[(x, y)] = landmark
+            self.spatial.insert(landmark, x, y)
 
     def select_enemies(self, boss_defeated, cycle):
-        """Selects a list of enemies to place on the map."""
-        level_multiplier = 1 + (boss_defeated * 0.2) + (cycle * 0.2)
-        enemies_list = []
-        for _ in range(5):
-            enemy = generate_enemy("low", cycle)
-            enemy.scale_stats(level_multiplier)
-            enemies_list.append(enemy)
-        for _ in range(3):
-            enemy = generate_enemy("mid", cycle)
-            enemy.scale_stats(level_multiplier)
-            enemies_list.append(enemy)
-        for _ in range(2):
-            enemy = generate_enemy("high", cycle)
-            enemy.scale_stats(level_multiplier)
-            enemies_list.append(enemy)
-        return enemies_list
+        """Selects the enemies to place on the map as spawn descriptors.
+
+        Each full Enemy is only built when encountered; cycle and boss scaling come
+        from the balance table inside generate_enemy.
+        """
+        return select_spawns(self.rng, boss_defeated, cycle)
+
+    def enemy_at(self, x, y):
+        """Returns the enemy or spawn descriptor at a position, or None."""
+        return self.occupancy.get(x, y)
+
+    def remove_enemy(self, enemy):
+        """Removes a defeated enemy or its spawn descriptor from the map."""
+        self.occupancy.remove(enemy)
+        self.spatial.remove(enemy)
+
+    def place_enemy(self, enemy, x, y):
+        """Puts an enemy or spawn descriptor on a given cell; returns False if it is taken."""
+        if not self.occupancy.place(enemy, x, y):
+            return False
+        self.spatial.insert(enemy, x, y)
+        enemy.underlying_tile = self.map_data[x][y]
+        return True
+
+    def restore_player(self, x, y, under_tile):
+        """Puts the player marker on (x, y) standing over `under_tile`, e.g. when loading a save."""
+        self.player_previous_tile = under_tile
+        self.map_data[x][y] = player
+        self.player_pos = (x, y)
+        self.spatial.move(player, x, y)
+        if self._walkable is not None:
+            self._walkable[x * self.width + y] = 1 if under_tile.walkable else 0
+        if self.fov is not None:
+            self.fov.update(self.player_pos)
+
+    def move_enemy(self, enemy, x, y):
+        """Moves an enemy to a free cell; returns False if the cell is taken."""
+        if not self.occupancy.move(enemy, x, y):
+            return False
+        self.spatial.move(enemy, x, y)
+        return True
+
+    def enemies_near(self, x, y, radius):
+        """Enemies within `radius` tiles of (x, y)."""
+        return self.spatial.query_radius(x, y, radius, predicate=self.occupancy.__contains__)
+
+    def enemies_in_rect(self, x0, y0, x1, y1):
+        """Enemies inside a rectangle of tiles (inclusive), e.g. the visible viewport."""
+        return self.spatial.query_rect(x0, y0, x1, y1, predicate=self.occupancy.__contains__)
+
+    def walkable_mask(self):
+        """Flat walkable mask of the terrain (the tile under the player, not the player marker)."""
+        if self._walkable is None:
+            self._walkable = build_walkable_mask(self.map_data, self.width)
+            x, y = self.player_pos
+            if self.map_data[x][y] is player:
+                self._walkable[x * self.width + y] = 1 if self.player_previous_tile.walkable else 0
+        return self._walkable
+
+    def get_pathfinder(self):
+        """Returns the map's PathService, creating it on first use."""
+        if self.pathfinder is None:
+            self.pathfinder = PathService(self)
+        return self.pathfinder
+
+    def advance_enemies(self, aggro_radius=AGGRO_RADIUS):
+        """Moves roaming enemies near the player one step and returns those that reached it.
+
+        A single distance field from the player is computed per turn and shared by all of them.
+        """
+        x, y = self.player_pos
+        nearby = self.enemies_near(x, y, aggro_radius)
+        if not nearby:
+            return []
+        if self.distance_field is None:
+            self.distance_field = DistanceField(self.width, self.height)
+        # Leave room for detours around lakes and rivers
+        self.distance_field.compute(self.walkable_mask(), self.player_pos, max_distance=2 * aggro_radius + 2)
+        return step_enemies(self, self.distance_field, nearby)
+
+    def nearest_landmark(self, x, y, name, predicate=None):
+        """The closest landmark with that tile name ("village", "shrine"...), or None."""
+        found = self.spatial.nearest(
+            x, y, 1,
+            predicate=lambda e: isinstance(e, Landmark) and e.name == name and (predicate is None or predicate(e)))
+        return found[0] if found else None
 
     def clear_map(self):
-        """Clears the current map."""
-        self.map_data = [[default for _ in range(self.width)] for _ in range(self.height)]
-        self.create_frame()
-        self.fill_default()
-        self.generate_patches()
-        self.place_structures()
-        self.enemies = []
-        self.boss_spawned = False
+        """Clears the current map, regenerating its seed in place."""
+        self.reset_map(self.seed)
 
     def is_tile_empty(self, x, y):
         """Check if a tile is empty and suitable for enemy placement."""
         tile = self.map_data[x][y]
-        # A tile is empty if it's walkable and not occupied by 'E' or 'P'
-        return tile.walkable and tile.symbol_raw not in ['P'] and tile.enemy is None
+        # A tile is empty if it's walkable, not the player and not occupied by an enemy
+        return tile.walkable and tile.symbol_raw not in ['P'] and not self.occupancy.is_occupied(x, y)
 
     def count_available_tiles(self):
         """Counts the number of available tiles for enemy placement."""
@@ -296,12 +416,12 @@ class Map:
         """Calculates the number of walkable and occupied tiles."""
         walkable_tiles = 0
         occupied_tiles = 0
-        for row in self.map_data:
-            for tile in row:
+        for x, row in enumerate(self.map_data):
+            for y, tile in enumerate(row):
                 if tile.walkable:
                     walkable_tiles += 1
                     # Count the number of occupied tiles (by structures or enemies)
-                    if tile.enemy or tile == village or tile == cave or tile == ruins:
+                    if self.occupancy.is_occupied(x, y) or tile == village or tile == cave or tile == ruins:
                         occupied_tiles += 1
 
     def place_enemies_on_map(self, enemies_list):
@@ -312,16 +432,14 @@ class Map:
             attempts = 0
 
             while not placed:
-                x = random.randint(1, self.height - 2)
-                y = random.randint(1, self.width - 2)
+                x = self.rng.randint(1, self.height - 2)
+                y = self.rng.randint(1, self.width - 2)
                 attempts += 1
 
                 # Check if the tile is suitable for placing an enemy
                 if self.is_tile_empty(x, y):
-                    # Place enemy on the tile
-                    enemy.pos = (x, y)
-                    enemy.underlying_tile = self.map_data[x][y]  # Store the underlying tile
-                    self.enemies.append(enemy)
+                    # Place enemy on the tile (also stores the underlying tile)
+                    self.place_enemy(enemy, x, y)
                     placed = True
                 elif attempts > 200:  # Fail-safe after 200 attempts
                     break
@@ -332,12 +450,12 @@ class Map:
         attempts = 0
         max_attempts = 100
         while attempts < max_attempts:
-            x = random.randint(1, self.height - 2)
-            y = random.randint(1, self.width - 2)
+            x = self.rng.randint(1, self.height - 2)
+            y = self.rng.randint(1, self.width - 2)
 
             # Check that the boss tile is a walkable tile and not overlapping with other encounters or structures
             if self.is_tile_empty(x, y) and self.map_data[x][y].walkable:
-                self.map_data[x][y] = boss_tile
+                self.set_tile(x, y, boss_tile)
                 print(f"Boss placed at ({x}, {y}) after {attempts + 1} attempts.")
                 return (x, y)
             attempts += 1
@@ -346,5 +464,5 @@ class Map:
 
     def swap_for_shrine(self, x, y):
         """Swaps the defeated boss tile with a shrine tile."""
-        self.map_data[x][y] = shrine_tile
+        self.set_tile(x, y, shrine_tile)
         print(f"Shrine placed at ({x}, {y}) after boss defeated.")
\ No newline at end of file
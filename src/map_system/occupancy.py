@@ -0,0 +1,72 @@
+# map_system/occupancy.py
+
+
+class OccupancyGrid:
+    """Entities standing on the map, kept apart from the shared Tile instances.
+
+    Cells live in a flat list indexed by `x * width + y`, and every entity remembers
+    its cell, so lookups, moves and removals are O(1). Iterating yields entities in
+    placement order, which is also the draw order.
+    """
+
+    __slots__ = ("width", "height", "cells", "positions")
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.cells = [None] * (width * height)
+        self.positions = {}  # Entity -> cell index
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        return iter(list(self.positions))
+
+    def __contains__(self, entity):
+        return entity in self.positions
+
+    def get(self, x: int, y: int):
+        """Returns the entity at (x, y), or None."""
+        if 0 <= x < self.height and 0 <= y < self.width:
+            return self.cells[x * self.width + y]
+        return None
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        return self.get(x, y) is not None
+
+    def place(self, entity, x: int, y: int) -> bool:
+        """Puts an entity on a free cell and updates its `pos`; returns False if the cell is taken.
+
+        Raises ValueError for a cell outside the grid, which would otherwise wrap onto another row.
+        """
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            raise ValueError(f"Cell ({x}, {y}) is outside the {self.height}x{self.width} grid")
+        index = x * self.width + y
+        occupant = self.cells[index]
+        if occupant is not None and occupant is not entity:
+            return False
+        previous = self.positions.get(entity)
+        if previous is not None:
+            self.cells[previous] = None
+        self.cells[index] = entity
+        self.positions[entity] = index
+        entity.pos = (x, y)
+        return True
+
+    move = place
+
+    def remove(self, entity) -> bool:
+        """Takes an entity off the grid; returns False if it was not on it."""
+        index = self.positions.pop(entity, None)
+        if index is None:
+            return False
+        self.cells[index] = None
+        return True
+
+    def clear(self) -> None:
+        """Empties the grid in place; only the occupied cells are touched."""
+        cells = self.cells
+        for index in self.positions.values():
+            cells[index] = None
+        self.positions.clear()
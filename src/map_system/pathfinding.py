@@ -0,0 +1,115 @@
+# map_system/pathfinding.py
+
+import heapq
+from collections import OrderedDict
+
+# Tiles the player's movement refuses even though they are walkable (see Game.move_player)
+PLAYER_BLOCKED_SYMBOLS = ('#', '~')
+
+
+def is_passable(tile) -> bool:
+    """Whether auto-travel may route the player across a tile."""
+    return tile.walkable and tile.symbol_raw not in PLAYER_BLOCKED_SYMBOLS
+
+
+class PathService:
+    """A* paths for the player over the map, cached by (start, goal).
+
+    Every cached path is indexed by the cells it crosses; when Map.set_tile changes a
+    cell, only the paths through that cell are dropped. The goal cell may be a
+    structure the player cannot walk through (village, shrine, treasure).
+    """
+
+    def __init__(self, game_map, cache_size: int = 256) -> None:
+        self.width = game_map.width
+        self.height = game_map.height
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (start, goal) -> tuple of steps, least recently used first
+        self.paths_through = {}  # Cell index -> set of cache keys whose path crosses it
+        self.hits = 0
+        self.misses = 0
+
+        self.passable = bytearray()
+        for row in game_map.map_data:
+            self.passable.extend(1 if is_passable(tile) else 0 for tile in row[:self.width])
+        x, y = game_map.player_pos
+        if game_map.map_data[x][y].symbol_raw == 'P':
+            self.passable[x * self.width + y] = 1 if is_passable(game_map.player_previous_tile) else 0
+
+    def find_path(self, start, goal):
+        """Returns the steps from `start` to `goal` (excluding start), or None if unreachable."""
+        key = (start, goal)
+        path = self.cache.get(key)
+        if path is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        path = self._search(start, goal)
+        if path is None:
+            return None  # Not cached: any tile change could open a route
+        self.cache[key] = path
+        for x, y in path:
+            self.paths_through.setdefault(x * self.width + y, set()).add(key)
+        if len(self.cache) > self.cache_size:
+            self._drop(next(iter(self.cache)))
+        return path
+
+    def _search(self, start, goal):
+        width, height, passable = self.width, self.height, self.passable
+        start_index = start[0] * width + start[1]
+        goal_index = goal[0] * width + goal[1]
+        goal_x, goal_y = goal
+        if start_index == goal_index:
+            return ()
+
+        came_from = {start_index: -1}
+        cost = {start_index: 0}
+        heap = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start_index)]
+        while heap:
+            _, g, index = heapq.heappop(heap)
+            if index == goal_index:
+                break
+            if g > cost[index]:
+                continue  # Stale heap entry
+            x, y = divmod(index, width)
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if not (0 <= nx < height and 0 <= ny < width):
+                    continue
+                neighbour = nx * width + ny
+                if not passable[neighbour] and neighbour != goal_index:
+                    continue
+                new_cost = g + 1
+                if new_cost < cost.get(neighbour, new_cost + 1):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = index
+                    heapq.heappush(heap, (new_cost + abs(nx - goal_x) + abs(ny - goal_y), new_cost, neighbour))
+        else:
+            return None
+
+        steps = []
+        index = goal_index
+        while index != start_index:
+            steps.append(divmod(index, width))
+            index = came_from[index]
+        steps.reverse()
+        return tuple(steps)
+
+    def _drop(self, key) -> None:
+        path = self.cache.pop(key, None)
+        if path is None:
+            return
+        for x, y in path:
+            keys = self.paths_through.get(x * self.width + y)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.paths_through[x * self.width + y]
+
+    def tile_changed(self, x: int, y: int, tile) -> None:
+        """Updates passability of a cell and drops the cached paths crossing it."""
+        index = x * self.width + y
+        self.passable[index] = 1 if is_passable(tile) else 0
+        for key in list(self.paths_through.get(index, ())):
+            self._drop(key)
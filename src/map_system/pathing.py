@@ -0,0 +1,107 @@
+# map_system/pathing.py
+
+from array import array
+
+UNREACHED = 0xFFFF
+AGGRO_RADIUS = 8
+
+# Roaming behavior per enemy tier: weak enemies run from the player, the rest hunt it
+TIER_BEHAVIORS = {"low": "flee", "mid": "chase", "high": "chase"}
+
+
+def build_walkable_mask(map_data, width: int) -> bytearray:
+    """Flattens the map into a bytearray with 1 for walkable cells, indexed x * width + y."""
+    mask = bytearray()
+    for row in map_data:
+        mask.extend(1 if tile.walkable else 0 for tile in row[:width])
+    return mask
+
+
+class DistanceField:
+    """Step distances from one source cell over a walkable mask (a Dijkstra map).
+
+    One field is computed per turn from the player's position and shared by every
+    roaming enemy, which then only compares its neighbours' distances. Cells beyond
+    `max_distance` or cut off from the source stay UNREACHED.
+    """
+
+    __slots__ = ("width", "height", "distances", "source", "_blank")
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self._blank = array('H', [UNREACHED]) * (width * height)
+        self.distances = array('H', self._blank)
+        self.source = None
+
+    def compute(self, walkable: bytearray, source, max_distance: int = UNREACHED - 1) -> None:
+        """Breadth-first fill from `source`; the source cell counts as reachable whatever its tile."""
+        width, size = self.width, self.width * self.height
+        distances = self.distances
+        distances[:] = self._blank
+        start = source[0] * width + source[1]
+        distances[start] = 0
+        self.source = source
+
+        frontier = [start]
+        distance = 0
+        while frontier and distance < max_distance:
+            distance += 1
+            next_frontier = []
+            for index in frontier:
+                column = index % width
+                for neighbour in (index - width, index + width,
+                                  index - 1 if column > 0 else -1,
+                                  index + 1 if column < width - 1 else -1):
+                    if 0 <= neighbour < size and walkable[neighbour] and distances[neighbour] == UNREACHED:
+                        distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+
+    def distance(self, x: int, y: int) -> int:
+        return self.distances[x * self.width + y]
+
+    def neighbours(self, x: int, y: int):
+        """In-bounds orthogonal neighbours of (x, y)."""
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < self.height and 0 <= ny < self.width:
+                yield nx, ny
+
+
+def step_enemies(game_map, field: DistanceField, enemies) -> list:
+    """Moves each roaming enemy one step along the field.
+
+    Chasers take the neighbour closest to the source, fleers the one farthest away;
+    an enemy only moves if that improves on its current cell. Chasers whose best step
+    is the source cell have reached the player and are returned instead of moving.
+    """
+    walkable, width = game_map.walkable_mask(), field.width
+    occupancy = game_map.occupancy
+    reached = []
+    for enemy in enemies:
+        behavior = getattr(enemy, "behavior", "idle")
+        if behavior == "idle" or enemy.pos is None:
+            continue
+        x, y = enemy.pos
+        current = field.distance(x, y)
+        if current == UNREACHED:
+            continue
+
+        best, best_distance = None, current
+        for nx, ny in field.neighbours(x, y):
+            distance = field.distance(nx, ny)
+            if distance == UNREACHED:
+                continue
+            if distance != 0 and (not walkable[nx * width + ny] or occupancy.is_occupied(nx, ny)):
+                continue
+            if (distance < best_distance) if behavior == "chase" else (distance > best_distance):
+                best, best_distance = (nx, ny), distance
+
+        if best is None:
+            continue
+        if best_distance == 0:
+            if behavior == "chase":
+                reached.append(enemy)
+        elif game_map.move_enemy(enemy, *best):
+            enemy.underlying_tile = game_map.map_data[best[0]][best[1]]
+    return reached
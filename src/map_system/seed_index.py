@@ -0,0 +1,313 @@
+# map_system/seed_index.py
+
+import argparse
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from map_system.generator import MapGenerator
+from map_system.pathfinding import is_passable
+from map_system.pathing import UNREACHED, DistanceField
+from map_system.tiles import (plains, forest, mountain, lake, brush, desert, swamp, snow, hill, river, default,
+                              village, cave, ruins, shrine_tile, treasure)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INDEX_PATH = os.path.join(PROJECT_ROOT, 'index', 'seeds.idx')
+
+MAX_SEED_VALUE = 1000000
+MAP_WIDTH = 30  # The size Game plays on
+MAP_HEIGHT = 15
+START = (1, 1)
+CHUNK_SIZE = 500  # Seeds per worker task
+
+INDEX_MAGIC = b'DGSI'
+INDEX_VERSION = 3
+_HEADER = struct.Struct('<4sHHHIH')  # magic, version, map width, map height, rows, columns
+_ORDER_ITEMSIZE = array('I').itemsize  # Bytes per row in a stored sort order
+
+STRUCTURES = (("villages", village), ("caves", cave), ("ruins", ruins), ("shrines", shrine_tile),
+              ("treasures", treasure))
+BIOMES = (("plains", plains), ("forest", forest), ("mountain", mountain), ("lake", lake), ("brush", brush),
+          ("desert", desert), ("swamp", swamp), ("snow", snow), ("hill", hill), ("river", river),
+          ("unfilled", default))
+
+# Column name -> array typecode, in row order
+COLUMNS = (
+    [("seed", 'I')]
+    + [(name, 'B') for name, _ in STRUCTURES]
+    + [("shrine_distance", 'H'),  # Steps from START to the shrine, UNREACHED if there is no way
+       ("villages_reachable", 'B'),
+       ("placement_failures", 'B'),
+       ("carved_cells", 'H')]  # Cells the connectivity pass cut to reach stranded landmarks
+    + [(f"{name}_pct", 'B') for name, _ in BIOMES]  # Percent of the interior covered by each biome
+)
+
+
+_generated = {}  # (width, height) -> (MapGenerator, last GeneratedMap), regenerated in place for every seed
+
+
+def extract_features(seed: int, width: int = MAP_WIDTH, height: int = MAP_HEIGHT) -> tuple:
+    """Generates a seed's map and returns its feature row, in COLUMNS order."""
+    generator, previous = _generated.get((width, height)) or (MapGenerator(width, height), None)
+    if previous is None:
+        generated = generator.generate(seed)
+    else:
+        generated = generator.generate(seed, previous.grid, previous.rng)
+    _generated[(width, height)] = (generator, generated)
+    map_data = generated.grid
+    counts = {}
+    for row in map_data[1:-1]:
+        for tile in row[1:-1]:
+            counts[tile] = counts.get(tile, 0) + 1
+    interior = (width - 2) * (height - 2)
+
+    # Player step distances from START; structures are entered from a neighbouring cell
+    passable = bytearray()
+    for row in map_data:
+        passable.extend(1 if is_passable(tile) else 0 for tile in row)
+    field = DistanceField(width, height)
+    field.compute(passable, START)
+
+    def steps_to(x, y):
+        best = min((field.distance(nx, ny) for nx, ny in field.neighbours(x, y)), default=UNREACHED)
+        return UNREACHED if best == UNREACHED else best + 1
+
+    shrine_distance = UNREACHED
+    villages_reachable = 0
+    for landmark in generated.structures:
+        x, y = landmark.pos
+        if landmark.name == "shrine":
+            shrine_distance = min(shrine_distance, steps_to(x, y))
+        elif landmark.name == "village" and steps_to(x, y) != UNREACHED:
+            villages_reachable += 1
+
+    return ((seed,)
+            + tuple(counts.get(tile, 0) for _, tile in STRUCTURES)
+            + (shrine_distance, villages_reachable, min(generated.placement_failures, 255),
+               generated.carved_cells)
+            + tuple(round(counts.get(tile, 0) * 100 / interior) for _, tile in BIOMES))
+
+
+def _sort_column(column):
+    """Row order that sorts a column, and the column's values in that order."""
+    order = array('I', sorted(range(len(column)), key=column.__getitem__))
+    return order, array(column.typecode, (column[i] for i in order))
+
+
+def _quiet_worker():
+    """Pool initializer: map generation prints every placement, which would swamp the indexer."""
+    sys.stdout = open(os.devnull, 'w')
+
+
+def _index_chunk(seeds):
+    return [extract_features(seed) for seed in seeds]
+
+
+class SeedIndex:
+    """Map features of many seeds, stored column by column.
+
+    Each column is an array with one entry per row; query() filters rows by exact
+    values or inclusive ranges, starting from the most selective condition through
+    sorted views of the columns. The sorted views are made once when the index is
+    built and stored with it; a loaded index reads each one from the file data the
+    first time its column is queried.
+    """
+
+    def __init__(self, columns: dict, width: int = MAP_WIDTH, height: int = MAP_HEIGHT, sorted_views: dict = None,
+                 data: bytes = None) -> None:
+        self.columns = columns  # name -> array
+        self.width = width
+        self.height = height
+        self._sorted = sorted_views if sorted_views is not None else {}  # name -> (row order, values in that order)
+        self._data = data  # File data holding the sorted views not read yet
+        self._sorted_offsets = {}  # name -> offset of its sorted view in _data
+
+    def __len__(self):
+        return len(self.columns["seed"])
+
+    @classmethod
+    def build(cls, seeds, workers: int = None, progress=None) -> 'SeedIndex':
+        """Generates every seed's map on a process pool and collects the features."""
+        from multiprocessing import Pool
+
+        seeds = list(seeds)
+        columns = {name: array(typecode) for name, typecode in COLUMNS}
+        column_arrays = [columns[name] for name, _ in COLUMNS]
+        chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, len(seeds), CHUNK_SIZE)]
+        done = 0
+        with Pool(workers, initializer=_quiet_worker) as pool:
+            for rows in pool.imap(_index_chunk, chunks):
+                for row in rows:
+                    for column, value in zip(column_arrays, row):
+                        column.append(value)
+                done += len(rows)
+                if progress:
+                    progress(done, len(seeds))
+        return cls(columns, sorted_views={name: _sort_column(column) for name, column in columns.items()})
+
+    # --- File ---
+
+    def to_bytes(self) -> bytes:
+        """Packs the header, then per column its name, typecode, values, sorted row order and sorted values."""
+        out = bytearray(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.width, self.height, len(self), len(COLUMNS)))
+        for name, typecode in COLUMNS:
+            encoded = name.encode('utf-8')
+            out += struct.pack('<B', len(encoded)) + encoded + typecode.encode('ascii')
+            out += self.columns[name].tobytes()
+            order, values = self._sorted_view(name)
+            out += order.tobytes()
+            out += values.tobytes()
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'SeedIndex':
+        magic, version, width, height, rows, count = _HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("Not a seed index or unsupported version")
+        offset = _HEADER.size
+        columns = {}
+        sorted_offsets = {}
+        for _ in range(count):
+            length = data[offset]
+            name = data[offset + 1:offset + 1 + length].decode('utf-8')
+            typecode = chr(data[offset + 1 + length])
+            offset += length + 2
+            column = array(typecode)
+            size = rows * column.itemsize
+            column.frombytes(data[offset:offset + size])
+            offset += size
+            columns[name] = column
+            sorted_offsets[name] = offset  # Row order, then the sorted values; read on first query
+            offset += rows * _ORDER_ITEMSIZE + size
+        index = cls(columns, width, height, data=data)
+        index._sorted_offsets = sorted_offsets
+        return index
+
+    def save(self, path: str = INDEX_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_PATH) -> 'SeedIndex':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    # --- Queries ---
+
+    def _sorted_view(self, name):
+        """(row order, values in that order) of a column, read from the file data or sorted on first use."""
+        view = self._sorted.get(name)
+        if view is None:
+            column = self.columns[name]
+            offset = self._sorted_offsets.get(name)
+            if offset is None:
+                view = _sort_column(column)
+            else:
+                rows = len(column)
+                order, values = array('I'), array(column.typecode)
+                order.frombytes(self._data[offset:offset + rows * _ORDER_ITEMSIZE])
+                offset += rows * _ORDER_ITEMSIZE
+                values.frombytes(self._data[offset:offset + rows * values.itemsize])
+                view = (order, values)
+            self._sorted[name] = view
+        return view
+
+    def _rows_in_range(self, name, low, high):
+        """Rows whose value in a column lies in [low, high], from the column's sorted view."""
+        order, values = self._sorted_view(name)
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return order[start:end]
+
+    def query(self, limit: int = None, **conditions) -> list:
+        """Returns the seeds matching every condition, in seed order.
+
+        Each condition is column=value for an exact match or column=(low, high) for an
+        inclusive range, either end None for open, e.g.
+        query(shrine_distance=(None, 15), villages=2).
+        """
+        if not conditions:
+            seeds = list(self.columns["seed"])
+            return seeds[:limit] if limit is not None else seeds
+        ranges = []
+        for name, condition in conditions.items():
+            if name not in self.columns:
+                raise ValueError(f"Unknown seed index column: {name}")
+            low, high = condition if isinstance(condition, tuple) else (condition, condition)
+            ranges.append((name, low, high))
+
+        # Start from the smallest candidate set and check the other conditions row by row
+        candidates = min((self._rows_in_range(*r) for r in ranges), key=len)
+        checks = [(self.columns[name], low, high) for name, low, high in ranges]
+        seeds = self.columns["seed"]
+        matches = sorted(seeds[row] for row in candidates
+                         if all((low is None or column[row] >= low) and (high is None or column[row] <= high)
+                                for column, low, high in checks))
+        return matches[:limit] if limit is not None else matches
+
+    def features(self, seed: int) -> dict:
+        """Feature values of one seed."""
+        rows = self._rows_in_range("seed", seed, seed)
+        if not rows:
+            raise KeyError(seed)
+        return {name: self.columns[name][rows[0]] for name, _ in COLUMNS}
+
+
+def _parse_condition(text):
+    """Parses 'name=5', 'name=3:', 'name=:15' or 'name=3:15'."""
+    name, _, value = text.partition('=')
+    if ':' in value:
+        low, high = value.split(':', 1)
+        return name, (int(low) if low else None, int(high) if high else None)
+    return name, int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the seed feature index.")
+    parser.add_argument("--index", default=INDEX_PATH, help="index file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index a range of seeds")
+    build.add_argument("--start", type=int, default=0)
+    build.add_argument("--end", type=int, default=MAX_SEED_VALUE, help="last seed (inclusive)")
+    build.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    query = commands.add_parser("query", help="list seeds matching conditions such as shrine_distance=:15 villages=2")
+    query.add_argument("conditions", nargs="*")
+    query.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+
+        def progress(done, total):
+            print(f"\rIndexed {done}/{total} seeds", end="", flush=True)
+
+        index = SeedIndex.build(range(args.start, args.end + 1), args.workers, progress)
+        index.save(args.index)
+        print(f"\nWrote {len(index)} seeds to {args.index} in {time.perf_counter() - started:.1f}s")
+        return 0
+
+    try:
+        index = SeedIndex.load(args.index)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read seed index {args.index}: {e}")
+        return 2
+    try:
+        seeds = index.query(limit=args.limit, **dict(_parse_condition(c) for c in args.conditions))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    for seed in seeds:
+        print(seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
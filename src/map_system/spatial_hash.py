@@ -0,0 +1,163 @@
+# map_system/spatial_hash.py
+
+from typing import Callable, List, Optional
+
+DEFAULT_CELL_SIZE = 8
+
+
+class Landmark:
+    """A structure on the map (village, cave, shrine...) indexed for proximity queries."""
+
+    __slots__ = ("name", "tile", "pos")
+
+    def __init__(self, name: str, tile, pos) -> None:
+        self.name = name
+        self.tile = tile
+        self.pos = pos
+
+    def __repr__(self):
+        return f"Landmark({self.name!r}, pos={self.pos})"
+
+
+class SpatialHash:
+    """Uniform-grid spatial hash over map entities.
+
+    Entities are bucketed by the `cell_size` x `cell_size` block containing them, so
+    radius, rectangle and nearest queries only visit nearby buckets. Moves within a
+    block just update the stored position.
+    """
+
+    __slots__ = ("cell_size", "buckets", "positions")
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self.buckets = {}  # (cell_x, cell_y) -> {entity: None}, insertion ordered
+        self.positions = {}  # Entity -> (x, y)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, entity):
+        return entity in self.positions
+
+    def _cell(self, x: int, y: int):
+        return x // self.cell_size, y // self.cell_size
+
+    def position(self, entity):
+        return self.positions.get(entity)
+
+    def insert(self, entity, x: int, y: int) -> None:
+        """Adds an entity, or moves it if it is already indexed."""
+        if entity in self.positions:
+            self.move(entity, x, y)
+            return
+        self.positions[entity] = (x, y)
+        self.buckets.setdefault(self._cell(x, y), {})[entity] = None
+
+    def move(self, entity, x: int, y: int) -> None:
+        old_x, old_y = self.positions[entity]
+        self.positions[entity] = (x, y)
+        old_cell, new_cell = self._cell(old_x, old_y), self._cell(x, y)
+        if old_cell != new_cell:
+            self._discard(entity, old_cell)
+            self.buckets.setdefault(new_cell, {})[entity] = None
+
+    def remove(self, entity) -> bool:
+        position = self.positions.pop(entity, None)
+        if position is None:
+            return False
+        self._discard(entity, self._cell(*position))
+        return True
+
+    def _discard(self, entity, cell) -> None:
+        bucket = self.buckets[cell]
+        del bucket[entity]
+        if not bucket:
+            del self.buckets[cell]
+
+    def clear(self) -> None:
+        """Empties the index in place."""
+        self.buckets.clear()
+        self.positions.clear()
+
+    def query_rect(self, x0: int, y0: int, x1: int, y1: int, predicate: Callable = None) -> List:
+        """Entities with x0 <= x <= x1 and y0 <= y <= y1."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        positions, buckets = self.positions, self.buckets
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = buckets.get((cx, cy))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    x, y = positions[entity]
+                    if x0 <= x <= x1 and y0 <= y <= y1 and (predicate is None or predicate(entity)):
+                        found.append(entity)
+        return found
+
+    def query_radius(self, x: int, y: int, radius: float, predicate: Callable = None) -> List:
+        """Entities within Euclidean distance `radius` of (x, y)."""
+        reach = int(radius)
+        limit = radius * radius
+        positions = self.positions
+        found = []
+        for entity in self.query_rect(x - reach, y - reach, x + reach, y + reach, predicate):
+            ex, ey = positions[entity]
+            if (ex - x) ** 2 + (ey - y) ** 2 <= limit:
+                found.append(entity)
+        return found
+
+    def nearest(self, x: int, y: int, k: int = 1, predicate: Callable = None,
+                max_radius: Optional[float] = None) -> List:
+        """The `k` entities closest to (x, y), nearest first.
+
+        Buckets are searched in growing rings around (x, y) until no unsearched ring
+        can hold anything closer than the k-th candidate.
+        """
+        if not self.buckets or k <= 0:
+            return []
+        size = self.cell_size
+        cx, cy = self._cell(x, y)
+        last_ring = max(max(abs(bx - cx), abs(by - cy)) for bx, by in self.buckets)
+        if max_radius is not None:
+            last_ring = min(last_ring, int(max_radius) // size + 1)
+        limit = None if max_radius is None else max_radius * max_radius
+        positions, buckets = self.positions, self.buckets
+
+        candidates = []  # (squared distance, entity)
+        for ring in range(last_ring + 1):
+            for cell in _ring_cells(cx, cy, ring):
+                bucket = buckets.get(cell)
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    if predicate is not None and not predicate(entity):
+                        continue
+                    ex, ey = positions[entity]
+                    distance = (ex - x) ** 2 + (ey - y) ** 2
+                    if limit is None or distance <= limit:
+                        candidates.append((distance, entity))
+            if len(candidates) >= k:
+                candidates.sort(key=lambda c: c[0])
+                del candidates[k:]
+                # Anything in an unsearched ring is at least ring * size + 1 tiles away
+                bound = ring * size + 1
+                if candidates[-1][0] <= bound * bound:
+                    break
+        candidates.sort(key=lambda c: c[0])
+        return [entity for _, entity in candidates[:k]]
+
+
+def _ring_cells(cx: int, cy: int, ring: int):
+    """Cells at Chebyshev distance `ring` from (cx, cy)."""
+    if ring == 0:
+        yield cx, cy
+        return
+    for dx in range(-ring, ring + 1):
+        yield cx + dx, cy - ring
+        yield cx + dx, cy + ring
+    for dy in range(-ring + 1, ring):
+        yield cx - ring, cy + dy
+        yield cx + ring, cy + dy
@@ -0,0 +1,40 @@
+# map_system/spawns.py
+
+import random
+
+
+class SpawnDescriptor:
+    """Lightweight record of an enemy waiting on the map.
+
+    Only the tier, cycle, bosses defeated, RNG seed, position and roaming behavior are
+    stored; the full Enemy is built deterministically from them when the player runs into it.
+    """
+
+    __slots__ = ("tier", "cycle", "seed", "pos", "underlying_tile", "behavior", "boss_defeated")
+
+    def __init__(self, tier: str, cycle: int, seed: int, pos=None, behavior: str = "idle",
+                 boss_defeated: int = 0) -> None:
+        self.tier = tier
+        self.cycle = cycle
+        self.seed = seed
+        self.pos = pos
+        self.underlying_tile = None
+        self.behavior = behavior  # Roaming behavior: "idle", "chase" or "flee"
+        self.boss_defeated = boss_defeated  # Bosses beaten in the cycle when the level was made
+
+    def __repr__(self):
+        return f"SpawnDescriptor({self.tier!r}, cycle={self.cycle}, seed={self.seed}, pos={self.pos})"
+
+    @property
+    def image(self):
+        """Map sprite of the tier, shared with materialized enemies."""
+        from battle_system.enemy import get_enemy_image
+        return get_enemy_image(self.tier)
+
+    def materialize(self):
+        """Builds the Enemy this descriptor stands for; the same seed gives the same enemy."""
+        from battle_system.enemy import generate_enemy
+        enemy = generate_enemy(self.tier, self.cycle, rng=random.Random(self.seed), boss_defeated=self.boss_defeated)
+        enemy.pos = self.pos
+        enemy.underlying_tile = self.underlying_tile
+        return enemy
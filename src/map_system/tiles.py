@@ -1,6 +1,5 @@
 # map_system/tiles.py
 
-import pygame
 import os
 
 # ANSI escape sequences for colors
@@ -27,20 +26,24 @@ ansi_colors = {
 class Tile:
     """Class to represent a map tile."""
 
+    __slots__ = ("name", "symbol_raw", "symbol", "walkable", "opaque", "visited", "image")
+
     tile_types = set()
 
-    def __init__(self, name: str, symbol: str, color: str, colored: bool = True, walkable: bool = True, visited=False):
+    def __init__(self, name: str, symbol: str, color: str, colored: bool = True, walkable: bool = True, visited=False,
+                 opaque: bool = False):
         self.name = name  # Name used for loading the image (should match the filename)
         self.symbol_raw = symbol
         self.symbol = f"{color}{symbol}{ansi_colors['reset']}" if colored else symbol
         self.walkable = walkable  # Indicates if the tile can be walked on or have enemies
+        self.opaque = opaque      # Blocks line of sight for the fog of war
         self.visited = visited    # For tiles like villages that can be visited
         self.image = None 
-        self.enemy = None 
         Tile.tile_types.add(name)
 
 def load_image(image_name):
     """Loads an image from the assets directory."""
+    import pygame  # Only the images need pygame; tiles themselves are plain data
     # Go up three levels: map_system -> src -> root
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
     # Look directly in 'assets', removing the 'png' subfolder
@@ -54,27 +57,37 @@ def load_image(image_name):
         placeholder.fill((255, 0, 255))  # Magenta color to indicate missing texture
         return placeholder
 
+# Tile images by tile name, filled by load_tile_images()
+tile_images = {}
+_tile_images_converted = False
+
 def load_tile_images():
-    """Loads images for all tiles."""
-    # Ensure Pygame is initialized before calling this function
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    assets_dir = os.path.join(project_root, 'assets')
+    """Loads images for all tiles once; later calls are no-ops.
 
-    for tile in [plains, forest, brush, mountain, water, lake, desert, swamp, snow, hill, river, beach, cave, ruins, shrine_tile, boss_tile, default, player, village, treasure]:
-        image_path = os.path.join(assets_dir, f"{tile.name}.png")
-        if os.path.exists(image_path):
-            tile.image = pygame.image.load(image_path).convert_alpha()
-        else:
-            # Handle missing image file
-            print(f"Warning: Image file {image_path} not found.")
-            placeholder = pygame.Surface((32, 32))
-            placeholder.fill((255, 0, 255))  # Magenta color to indicate missing texture
-            tile.image = placeholder
+    Call after the display is created so images are converted for fast blitting. Images
+    loaded before that are loaded again, converted, on the next call.
+    """
+    global _tile_images_converted
+    import pygame
+
+    if _tile_images_converted:
+        return
+    convert = pygame.display.get_surface() is not None
+    for tile in ALL_TILES:
+        image = load_image(tile.name)
+        if convert:
+            image = image.convert_alpha()
+        tile.image = tile_images[tile.name] = image
+    _tile_images_converted = convert
 
 enemy_images = {}
 
 def load_enemy_images():
-    """Loads images for enemies."""
+    """Loads images for enemies once; later calls are no-ops."""
+    import pygame
+
+    if len(enemy_images) == 3:
+        return
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
     assets_dir = os.path.join(project_root, 'assets')
 
@@ -88,35 +101,11 @@ def load_enemy_images():
             placeholder.fill((255, 0, 0))  # Red color for missing image
             enemy_images[tier] = placeholder
 
-# Load images for tiles
-tile_images = {
-    "plains": load_image("plains"),
-    "forest": load_image("forest"),
-    "brush": load_image("brush"),
-    "mountain": load_image("mountain"),
-    "water": load_image("water"),
-    "lake": load_image("lake"),
-    "desert": load_image("desert"),
-    "swamp": load_image("swamp"),
-    "snow": load_image("snow"),
-    "hill": load_image("hill"),
-    "river": load_image("river"),
-    "beach": load_image("beach"),
-    "cave": load_image("cave"),
-    "ruins": load_image("ruins"),
-    "shrine": load_image("shrine"),
-    "boss": load_image("boss"),
-    "default": load_image("default"),
-    "player": load_image("player"),
-    "village": load_image("village"),
-    "treasure": load_image("treasure"),
-}
-
 # Define tiles with names matching their image filenames
 plains = Tile("plains", ";", ansi_colors.get('yellow', ''), walkable=True)
-forest = Tile("forest", "8", ansi_colors.get('green', ''), walkable=True)
+forest = Tile("forest", "8", ansi_colors.get('green', ''), walkable=True, opaque=True)
 brush = Tile("brush", "^", ansi_colors.get('magenta', ''), walkable=True)
-mountain = Tile("mountain", "A", ansi_colors.get('white', ''), walkable=True)
+mountain = Tile("mountain", "A", ansi_colors.get('white', ''), walkable=True, opaque=True)
 water = Tile("water", "~", ansi_colors.get('blue', ''), walkable=False)
 lake = Tile("lake", "§", ansi_colors.get('cyan', ''), walkable=False)
 desert = Tile("desert", ".", ansi_colors.get('bright_yellow', ''), walkable=True)
@@ -134,26 +123,13 @@ player = Tile("player", "P", ansi_colors.get('green', ''), walkable=False)
 village = Tile("village", "V", ansi_colors.get('green', ''), walkable=False, visited=False)
 treasure = Tile("treasure", "T", ansi_colors.get('yellow', ''), walkable=False)
 treasure_empty = Tile("treasure_empty", "t", ansi_colors.get('yellow', ''), walkable=True)
+frame_tile = Tile("=", "=", "grey", walkable=False)  # Map border, shared by every border cell; has no image
+
+# Every named tile, in the order their images are loaded
+ALL_TILES = (plains, forest, brush, mountain, water, lake, desert, swamp, snow, hill, river, beach, cave, ruins,
+             shrine_tile, boss_tile, default, player, village, treasure, treasure_empty)
 
-# Assign images to tiles
-plains.image = tile_images["plains"]
-forest.image = tile_images["forest"]
-brush.image = tile_images["brush"]
-mountain.image = tile_images["mountain"]
-water.image = tile_images["water"]
-lake.image = tile_images["lake"]
-desert.image = tile_images["desert"]
-swamp.image = tile_images["swamp"]
-snow.image = tile_images["snow"]
-hill.image = tile_images["hill"]
-river.image = tile_images["river"]
-beach.image = tile_images["beach"]
-cave.image = tile_images["cave"]
-ruins.image = tile_images["ruins"]
-shrine_tile.image = tile_images["shrine"]
-boss_tile.image = tile_images["boss"]
-default.image = tile_images["default"]
-player.image = tile_images["player"]
-village.image = tile_images["village"]
-treasure.image = tile_images["treasure"]
-treasure_empty.image = load_image("treasure_empty")
+# Terrain tiles by id, for saves and generated maps; append new tiles at the end to keep old saves loadable
+TILE_TABLE = (plains, forest, brush, mountain, water, lake, desert, swamp, snow, hill, river, beach,
+              cave, ruins, shrine_tile, boss_tile, default, village, treasure, treasure_empty, frame_tile)
+TILE_IDS = {tile: tile_id for tile_id, tile in enumerate(TILE_TABLE)}
@@ -0,0 +1,193 @@
+"""Microbenchmarks for map generation, placement, combat and rendering hot paths.
+
+Not collected by pytest. Runs headless under the dummy SDL driver:
+
+    python tests/benchmark.py                      # run and print timings
+    python tests/benchmark.py --save               # store them as the baseline
+    python tests/benchmark.py --compare            # flag regressions against the baseline
+    python tests/benchmark.py --compare --threshold 0.25 --filter map_
+
+Baselines are machine specific, so the default baseline file is not committed.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(base_path, 'src'))
+
+BASELINE_PATH = os.path.join(base_path, 'tests', 'benchmark_baseline.json')
+DEFAULT_THRESHOLD = 0.15  # Flag benchmarks more than 15% slower than the baseline
+MAP_SEED = 5  # Generates quickly at every benchmarked size
+MAP_SIZES = ((30, 15), (60, 40), (120, 80))
+
+
+class Benchmark:
+    """One timed callable; `setup` runs untimed before every call and returns its arguments."""
+
+    __slots__ = ("name", "func", "setup", "number")
+
+    def __init__(self, name, func, setup=None, number=100):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.number = number
+
+    def run(self, repeat):
+        """Returns the per-call time in microseconds of each repeat."""
+        func, setup = self.func, self.setup
+        samples = []
+        for _ in range(repeat):
+            total = 0.0
+            for _ in range(self.number):
+                args = setup() if setup else ()
+                start = perf_counter()
+                func(*args)
+                total += perf_counter() - start
+            samples.append(total / self.number * 1e6)
+        return samples
+
+
+def build_benchmarks():
+    """Builds every benchmark; needs pygame initialized with a display."""
+    import pygame
+
+    from battle_system.enemy import generate_enemy
+    from battle_system.hero import Hero
+    from battle_system.item import create_item_from_name
+    from battle_system.weapon import generate_weapon
+    from game_system.engine import GameEngine
+    from game_system.main import Game
+    from map_system.map import Map
+
+    surface = pygame.Surface((1, 1))
+    benchmarks = []
+
+    for width, height in MAP_SIZES:
+        benchmarks.append(Benchmark(f"map_init_{width}x{height}",
+                                    lambda w=width, h=height: Map(surface, w, h, seed=MAP_SEED), number=10))
+
+    game_map = Map(surface, 30, 15, seed=MAP_SEED)
+    benchmarks.append(Benchmark("refill_tile", lambda: game_map.refill_tile(5, 5), number=2000))
+    benchmarks.append(Benchmark("count_available_tiles", game_map.count_available_tiles, number=200))
+
+    enemies = game_map.select_enemies(0, 1)
+
+    def clear_enemies():
+        for enemy in list(game_map.enemies):
+            game_map.remove_enemy(enemy)
+        game_map.rng.seed(MAP_SEED)
+        return (enemies,)
+
+    benchmarks.append(Benchmark("place_enemies_on_map", game_map.place_enemies_on_map, setup=clear_enemies, number=200))
+
+    benchmarks.append(Benchmark("generate_enemy", lambda: generate_enemy("mid", 1), number=2000))
+    benchmarks.append(Benchmark("generate_weapon", lambda: generate_weapon("high", 1), number=2000))
+    benchmarks.append(Benchmark("create_item_from_name", lambda: create_item_from_name("Small Health Potion"),
+                                number=20000))
+
+    hero = Hero(name="Hero", health=150)
+    enemy = generate_enemy("mid", 1, rng=random.Random(MAP_SEED))
+
+    def reset_combatants():
+        hero.health, enemy.health = hero.health_max, enemy.health_max
+        return (enemy,)
+
+    benchmarks.append(Benchmark("character_attack", hero.attack, setup=reset_combatants, number=2000))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        screen = pygame.display.set_mode((Game.SCREEN_WIDTH, Game.SCREEN_HEIGHT))
+        game = Game(screen, engine=GameEngine(screen))  # No save path: nothing is written to disk
+        game.engine.new_game(seed=MAP_SEED)
+        game.engine.log_messages.extend(f"Log line {i}" for i in range(20))
+    benchmarks.append(Benchmark("game_display_ui", game.display_ui, number=100))
+    return benchmarks
+
+
+def run_benchmarks(name_filter=None, repeat=5):
+    """Runs the suite and returns {name: {"min_us", "median_us"}}."""
+    from game_system.startup import init_pygame
+
+    init_pygame()
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):  # Map generation is chatty
+        benchmarks = build_benchmarks()
+    for benchmark in benchmarks:
+        if name_filter and name_filter not in benchmark.name:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            samples = benchmark.run(repeat)
+        results[benchmark.name] = {"min_us": round(min(samples), 3), "median_us": round(statistics.median(samples), 3)}
+        print(f"{benchmark.name:<24} min {results[benchmark.name]['min_us']:>12.2f} us"
+              f"   median {results[benchmark.name]['median_us']:>12.2f} us")
+    return results
+
+
+def save_baseline(results, path):
+    data = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    print(f"Baseline written to {path}")
+
+
+def compare(results, baseline, threshold):
+    """Compares min times against a baseline; returns the names that regressed beyond `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<24} (no baseline)")
+            continue
+        before, after = baseline[name]["min_us"], result["min_us"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<24} {before:>12.2f} -> {after:>12.2f} us  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the desgoblin microbenchmarks.")
+    parser.add_argument("--save", nargs="?", const=BASELINE_PATH, help="write the results as a JSON baseline")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown reported as a regression (default 0.15)")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repeats per benchmark (best is kept)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)["results"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: Could not read baseline {args.compare}: {e}")
+            return 2
+
+    results = run_benchmarks(args.filter, args.repeat)
+    if args.save:
+        save_baseline(results, args.save)
+    if baseline is not None:
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
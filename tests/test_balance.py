@@ -0,0 +1,45 @@
+import random
+
+from battle_system import balance
+from battle_system.enemy import generate_enemy
+from map_system.spawns import SpawnDescriptor
+
+
+def test_simulate_fight_is_deterministic():
+    """Identical seeds must produce identical headless fights."""
+    hero = balance.reference_hero(balance.DEFAULT_BALANCE, "mid", 1)
+    enemy = (60, 5, 10, 3, 9)
+    first = balance.simulate_fight(hero, enemy, random.Random(7))
+    second = balance.simulate_fight(hero, enemy, random.Random(7))
+    assert first == second
+    assert 1 <= first[1] <= balance.MAX_ROUNDS
+
+
+def test_tune_emits_table_used_by_generators():
+    """The balancer fills the tuned section and generate_enemy picks it up."""
+    table = balance.tune(cycles=(1,), fights=40, workers=2, refinements=0)
+    for tier in balance.TIERS:
+        entry = table["tuned"][tier]["1"]
+        assert entry["health"] > 0 and entry["damage"] > 0
+        assert 0.0 <= entry["win_rate"] <= 1.0
+
+    table["tuned"]["low"]["1"]["health"] = 10.0
+    balance.set_balance_table(table)
+    try:
+        random.seed(3)
+        enemy = generate_enemy("low", cycle=1)
+        # Lowest possible low-tier health is 10 * 1.2 cycle scaling * 10.0 tuned
+        assert enemy.health >= 120
+    finally:
+        balance.set_balance_table(None)
+
+
+def test_enemies_scale_with_bosses_defeated():
+    """Each boss beaten in a cycle makes its later enemies stronger, from the same rolls."""
+    base = generate_enemy("mid", 1, rng=random.Random(5))
+    scaled = generate_enemy("mid", 1, rng=random.Random(5), boss_defeated=2)
+    assert scaled.name == base.name
+    assert scaled.health_max > base.health_max and scaled.weapon.damage > base.weapon.damage
+
+    spawn = SpawnDescriptor("mid", 1, 5, boss_defeated=2)  # Map spawns carry the level's boss count
+    assert spawn.materialize().health_max == scaled.health_max
@@ -0,0 +1,47 @@
+import pygame
+
+from battle_system.enemy import generate_boss
+from battle_system.hero import Hero
+
+
+def test_boss_finishes_armored_hero_with_firestorm():
+    """Firestorm ignores armor, so it is the only way to finish a heavily armored hero."""
+    pygame.init()
+    try:
+        boss = generate_boss(0)
+        hero = Hero(name="Hero", health=150)
+        hero.health = 40
+        hero.armor = 200
+        hero.evade_ch = 0
+        assert boss.choose_action(hero) == "Firestorm"
+    finally:
+        pygame.quit()
+
+
+def test_boss_decision_is_bounded_and_deterministic():
+    """The node budget bounds the search, and the same state always gets the same action."""
+    pygame.init()
+    try:
+        boss = generate_boss(0)
+        hero = Hero(name="Hero", health=150)
+        boss.ai.node_budget = 100
+        action = boss.choose_action(hero)
+        assert action in ["attack"] + boss.skills
+        assert boss.ai.last_depth >= 1
+        assert len(boss.ai.cache) <= 100
+        depth = boss.ai.last_depth
+
+        hero.health = 60
+        boss.choose_action(hero)  # Earlier decisions must not change later ones
+        hero.health = 150
+        assert boss.choose_action(hero) == action and boss.ai.last_depth == depth
+
+        hero.health_max = 300  # Leaf scores use the maxima, so they are part of the stats key
+        boss.choose_action(hero)
+        assert boss.ai.hero_max == 300
+
+        message = boss.perform_action("Tail Swipe", hero)
+        assert "Tail Swipe" in message
+        assert boss.skill_cooldowns["Tail Swipe"] == boss.skill_rules["Tail Swipe"]["cooldown"]
+    finally:
+        pygame.quit()
@@ -0,0 +1,35 @@
+import pygame
+
+from battle_system.combat_profile import TABLE_SIZE, CombatProfile
+from battle_system.hero import Hero
+from battle_system.weapon import Weapon
+
+
+def test_profile_is_cached_and_invalidated_by_stat_changes():
+    """The profile is reused between swings and rebuilt after equipping or levelling up."""
+    pygame.init()
+    try:
+        hero = Hero(name="Hero", health=150)
+        profile = hero.profile
+        assert hero.profile is profile
+        assert profile.damage_ranges["normal"] == (1, 2)
+        assert profile.mitigate(3) == 1  # Armor 5 floors damage at 1
+
+        hero.equip_weapon(Weapon(name="Long Sword", weapon_type="sharp", damage=20, value=30, tier="high"))
+        assert hero.profile is not profile
+        assert hero.profile.damage_ranges["heavy"] == (16, 30)
+
+        armored = hero.profile
+        hero.level_up()
+        assert hero.profile is not armored
+        assert hero.profile.mitigate(20) == 20 - hero.armor
+    finally:
+        pygame.quit()
+
+
+def test_profile_tables_are_capped_for_huge_damage():
+    profile = CombatProfile(10 ** 5, crit_ch=10, evade_ch=5, armor=7)
+    assert len(profile.crit_damage) <= TABLE_SIZE and len(profile.damage_taken) <= TABLE_SIZE
+    assert profile.crit(120000) == 180000
+    assert profile.mitigate(180000) == 180000 - 7
+    assert profile.mitigate(100) == 93 and profile.crit(100) == 150
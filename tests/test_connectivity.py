@@ -0,0 +1,57 @@
+from map_system.connectivity import connect_landmarks, label_components
+from map_system.map import Map
+from map_system.pathfinding import is_passable
+from map_system.pathing import UNREACHED, DistanceField
+from map_system.spatial_hash import SpatialHash
+from map_system.tiles import beach, default, plains, river, shrine_tile, village
+
+
+def test_label_components_joins_runs():
+    mask = bytearray([1, 1, 0, 1,
+                      0, 1, 0, 1,
+                      1, 1, 0, 0,
+                      0, 0, 1, 1])
+    components = label_components(mask, 4)
+    assert components.find(0) == components.find(8) == components.find(5)
+    assert components.find(3) == components.find(7) != components.find(0)
+    assert components.find(14) == components.find(15) not in (components.find(0), components.find(3))
+
+
+def _walled_map():
+    """A 20x12 map of plains with a river wall at column 10 and a shrine and village cut off behind it."""
+    game_map = Map(None, 20, 12, seed=3)
+    game_map.landmarks = {}
+    game_map.spatial = SpatialHash()
+    for x in range(1, game_map.height - 1):
+        for y in range(1, game_map.width - 1):
+            game_map.map_data[x][y] = river if y == 10 else plains
+    game_map.set_tile(5, 15, shrine_tile)
+    for y in range(13, 18):  # A village boxed in by unfilled land
+        game_map.map_data[2][y] = default
+    game_map.map_data[1][15] = game_map.map_data[3][15] = default
+    game_map.map_data[1][14] = game_map.map_data[1][16] = default
+    game_map.set_tile(1, 15, village)
+    return game_map
+
+
+def test_connect_landmarks_carves_fords():
+    game_map = _walled_map()
+    carved = connect_landmarks(game_map, (1, 1))
+    assert carved == 2  # One ford and one cleared cell
+    assert sum(row[10] is beach for row in game_map.map_data) == 1
+
+    passable = bytearray()
+    for row in game_map.map_data:
+        passable.extend(1 if is_passable(tile) else 0 for tile in row)
+    field = DistanceField(game_map.width, game_map.height)
+    field.compute(passable, (1, 1))
+    for x, y in ((5, 15), (1, 15)):
+        assert min(field.distance(nx, ny) for nx, ny in field.neighbours(x, y)) != UNREACHED
+
+    assert connect_landmarks(game_map, (1, 1)) == 0  # Already connected
+
+
+def test_generated_maps_are_completable():
+    for seed in range(20):
+        game_map = Map(None, 30, 15, seed=seed)
+        assert connect_landmarks(game_map, (1, 1)) == 0
@@ -0,0 +1,52 @@
+import random
+
+import pygame
+import pytest
+
+from battle_system.enemy import generate_enemy
+from battle_system.enemy_pool import EnemyPool
+from battle_system.weapon import Weapon
+
+
+def test_pool_stores_large_population_compactly():
+    """10,000 enemies fit in a few hundred kilobytes and materialize on demand."""
+    pygame.init()
+    try:
+        rng = random.Random(1)
+        pool = EnemyPool()
+        for i in range(10000):
+            pool.spawn(("low", "mid", "high")[i % 3], cycle=1, pos=(i % 100, i // 100), rng=rng)
+        assert len(pool) == 10000
+        assert pool.nbytes() < 10000 * 40
+
+        view = pool.view(4)
+        assert view.tier == "mid" and view.pos == (4, 0) and view.alive
+        enemy = view.materialize()
+        assert enemy.name == view.name and enemy.weapon.name == view.weapon_name
+        assert enemy.health == view.health
+
+        pool.remove(4)
+        assert len(pool) == 9999
+        assert pool.add(generate_enemy("high", 2)) == 4
+
+        late = pool.spawn("low", cycle=300, rng=rng)  # Past the range of a byte
+        assert pool.materialize(late).weapon.cycle == 300
+
+        stray = generate_enemy("low")
+        stray.weapon = Weapon("Rusty Spork", "sharp")
+        with pytest.raises(ValueError, match="Rusty Spork"):
+            pool.add(stray)
+    finally:
+        pygame.quit()
+
+
+def test_entities_use_slots():
+    """Slotted entity types carry no per-instance __dict__."""
+    pygame.init()
+    try:
+        enemy = generate_enemy("low")
+        assert not hasattr(enemy, "__dict__")
+        assert not hasattr(enemy.weapon, "__dict__")
+        assert enemy.image is generate_enemy("low").image  # Shared tier sprite
+    finally:
+        pygame.quit()
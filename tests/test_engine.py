@@ -0,0 +1,197 @@
+import random
+
+import pytest
+
+from game_system.engine import GameEngine
+from game_system.levels import LevelPregenerator, build_level
+from map_system.spawns import SpawnDescriptor
+from map_system.tiles import plains, shrine_tile, treasure, treasure_empty
+
+
+def _play(engine, steps, rng):
+    """Random bot: wanders, fights every battle and answers prompts."""
+    moves = ((0, 1), (0, -1), (1, 0), (-1, 0))
+    battles = 0
+    for _ in range(steps):
+        if not engine.running:
+            break
+        mode = engine.mode
+        if mode == "battle":
+            observation = engine.attack()
+            battles += 1
+        elif mode == "prompt":
+            observation = engine.choose({"loot": "s", "village": "4"}.get(engine.prompt, "b"))
+        else:
+            observation = engine.move(*rng.choice(moves))
+        assert observation.player_pos == engine.game_map.player_pos
+    return battles
+
+
+def test_headless_engine_plays_without_a_window():
+    engine = GameEngine()
+    observation = engine.new_game(seed=5)
+    assert observation.mode == "explore" and engine.game_map.screen is None
+
+    battles = _play(engine, 2000, random.Random(1))
+    assert battles > 0
+    assert engine.mode in ("explore", "prompt", "defeat")
+    if engine.mode == "defeat":
+        assert not engine.running and not engine.hero.alive
+
+
+def test_commands_and_observations():
+    engine = GameEngine()
+    engine.new_game(seed=5)
+    engine.observe()
+    observation = engine.apply(("inventory",))
+    assert observation.mode == "prompt" and observation.prompt == "inventory"
+    assert "Inventory:" in observation.messages
+    assert engine.move(0, 1).player_pos == engine.hero.player_pos  # Ignored while a prompt is open
+    observation = engine.apply(("choose", "b"))
+    assert observation.mode == "explore" and observation.messages == []
+    try:
+        engine.apply(("dance",))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown commands should be rejected")
+
+
+def test_boss_victory_starts_next_level_without_nesting():
+    engine = GameEngine()
+    engine.new_game(seed=5)
+    engine.total_bosses = 2
+    hero = engine.hero
+    hero.health_max = hero.health = 10 ** 6
+    hero.weapon.damage = 10 ** 5
+    hero.invalidate_profile()
+
+    # Put a shrine next to the player and walk into it
+    x, y = engine.hero.player_pos
+    engine.game_map.set_tile(x, y + 1, shrine_tile)
+    observation = engine.move(0, 1)
+    assert observation.mode == "battle" and observation.enemy is not None
+    next_seed = engine.next_seed
+    assert next_seed is not None  # The next level is being generated during the fight
+    while engine.in_battle:
+        observation = engine.attack()
+
+    assert engine.boss_defeated == 1 and engine.cycle == 2
+    assert engine.running and observation.mode == "explore"
+    assert "Starting New Game+2" in observation.messages
+    assert engine.seed == next_seed and engine.next_seed is None
+
+
+def test_pregenerated_level_matches_a_synchronous_build():
+    pregenerator = LevelPregenerator()
+    pregenerator.request(None, 30, 15, 11, 1, 2)
+    assert pregenerator.take(30, 15, 12, 1, 2) is None  # Different seed: dropped, built by the caller
+    pregenerator.request(None, 30, 15, 11, 1, 2)
+    prepared = pregenerator.take(30, 15, 11, 1, 2)
+    expected = build_level(None, 30, 15, 11, 1, 2)
+    assert [[tile.symbol_raw for tile in row] for row in prepared.map_data] == \
+           [[tile.symbol_raw for tile in row] for row in expected.map_data]
+    assert [(e.pos, e.seed, e.cycle) for e in prepared.enemies] == [(e.pos, e.seed, e.cycle) for e in expected.enemies]
+    assert pregenerator.take(30, 15, 11, 1, 2) is None  # Handed over once
+
+    pregenerator.request(None, 30, 2, 11, 1, 2)  # No interior: fails in the background
+    with pytest.raises(ValueError):
+        pregenerator.take(30, 2, 11, 1, 2)
+
+    pregenerator.recycle(prepared)
+    pregenerator.request(None, 30, 15, 12, 1, 2)
+    reused = pregenerator.take(30, 15, 12, 1, 2)
+    assert reused is prepared and reused.seed == 12  # Regenerated in place
+    assert [[tile.symbol_raw for tile in row] for row in reused.map_data] == \
+           [[tile.symbol_raw for tile in row] for row in build_level(None, 30, 15, 12, 1, 2).map_data]
+
+
+def test_last_boss_offers_new_game_plus_with_a_pregenerated_level():
+    engine = GameEngine()
+    engine.new_game(seed=5)
+    hero = engine.hero
+    hero.health_max = hero.health = 10 ** 6
+    hero.weapon.damage = 10 ** 5
+    hero.invalidate_profile()
+
+    engine.shrine_encounter()
+    next_seed = engine.next_seed
+    assert next_seed is not None
+    while engine.in_battle:
+        engine.attack()
+    assert engine.prompt == "new_game_plus" and engine.running
+
+    observation = engine.choose("y")
+    assert observation.mode == "explore"
+    assert engine.cycle == 2 and engine.boss_defeated == 0
+    assert engine.seed == next_seed and engine.next_seed is None
+
+    engine.shrine_encounter()
+    while engine.in_battle:
+        engine.attack()
+    assert engine.choose("n").mode == "victory"
+
+
+def test_neighbouring_enemies_attack_as_a_group():
+    engine = GameEngine()
+    engine.new_game(seed=5)
+    game_map = engine.game_map
+    for enemy in list(game_map.enemies):
+        game_map.remove_enemy(enemy)
+    hero = engine.hero
+    hero.health_max = hero.health = 10 ** 6
+    hero.weapon.damage = 10 ** 5
+    hero.invalidate_profile()
+
+    x, y = hero.player_pos
+    spawns = [SpawnDescriptor("low", 1, seed) for seed in (1, 2)]
+    for spawn, cell in zip(spawns, ((x, y + 1), (x, y + 2))):
+        game_map.set_tile(*cell, plains)
+        game_map.place_enemy(spawn, *cell)
+    observation = engine.move(0, 1)
+    assert observation.mode == "battle" and engine.party_battle is not None
+    assert len(engine.party_battle.combatants) == 3
+    while engine.in_battle:
+        engine.attack()
+
+    assert engine.party_battle is None and len(game_map.enemies) == 0
+    assert engine.prompt == "loot" and hero.player_pos == (x, y + 1)
+
+
+def test_autosaves_never_lose_or_repeat_loot(tmp_path):
+    path = str(tmp_path / "autosave.sav")
+    engine = GameEngine(save_path=path)
+    engine.new_game(seed=5)
+    game_map = engine.game_map
+    for enemy in list(game_map.enemies):
+        game_map.remove_enemy(enemy)
+    hero = engine.hero
+    hero.health_max = hero.health = 10 ** 6
+    hero.weapon.damage = 10 ** 5
+    hero.invalidate_profile()
+    x, y = hero.player_pos
+
+    # Quitting at the treasure prompt saves an empty chest
+    game_map.set_tile(x, y + 1, treasure)
+    engine.move(0, 1)
+    assert engine.prompt == "loot"
+    engine.close()
+    loaded = GameEngine(save_path=path)
+    assert loaded.load_save()
+    assert loaded.hero.player_pos == (x, y + 1) and loaded.game_map.player_previous_tile is treasure_empty
+    assert (x, y + 1) not in loaded.game_map.landmarks
+    engine.choose("s")
+
+    # A won fight is saved with the loot decision and the hero on the enemy's cell
+    spawn = SpawnDescriptor("low", 1, 3)
+    game_map.set_tile(x, y + 2, plains)
+    game_map.place_enemy(spawn, x, y + 2)
+    engine.move(0, 1)
+    while engine.in_battle:
+        engine.attack()
+    engine.choose("p")
+    engine.save_writer.wait()
+    loaded = GameEngine(save_path=path)
+    assert loaded.load_save()
+    assert loaded.hero.player_pos == (x, y + 2) and loaded.game_map.enemy_at(x, y + 2) is None
+    assert loaded.hero.weapon.name == hero.weapon.name != "Fists"
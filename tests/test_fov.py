@@ -0,0 +1,38 @@
+from map_system.fov import FieldOfView
+
+
+def _field(width=20, height=20, walls=(), radius=5):
+    opaque = bytearray(width * height)
+    for x, y in walls:
+        opaque[x * width + y] = 1
+    return FieldOfView(width, height, opaque, radius)
+
+
+def test_walls_cast_shadows_and_stay_visible():
+    fov = _field(walls=[(10, 12)])
+    fov.update((10, 10))
+    assert fov.is_visible(10, 10)
+    assert fov.is_visible(10, 11)
+    assert fov.is_visible(10, 12)  # The wall itself is seen
+    assert not fov.is_visible(10, 13)  # Directly behind it
+    assert not fov.is_visible(10, 14)
+    assert fov.is_visible(8, 14)
+    assert not fov.is_visible(10, 16)  # Beyond the radius
+    assert not fov.is_visible(4, 10)
+
+
+def test_explored_cells_persist_and_updates_are_incremental():
+    fov = _field()
+    fov.update((5, 5))
+    assert not fov.update((5, 5))
+    fov.update((14, 14))
+    assert not fov.is_visible(5, 5)
+    assert fov.is_explored(5, 5)
+    assert fov.is_visible(14, 14)
+    assert not fov.is_explored(0, 19)
+
+    fov.set_opaque(14, 15, True)
+    assert fov.is_visible(14, 15)
+    assert not fov.is_visible(14, 17)
+    fov.set_opaque(14, 15, False)
+    assert fov.is_visible(14, 17)
@@ -0,0 +1,62 @@
+import os
+import pickle
+import subprocess
+import sys
+
+from map_system.generator import GenerationParams, MapGenerator, generate_map
+from map_system.map import Map
+from map_system.tiles import TILE_TABLE, frame_tile
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def test_generate_map_with_seed():
+    game_map = Map.generate_map_with_seed(30, 15, 7)
+    assert (game_map.width, game_map.height, game_map.seed) == (30, 15, 7)
+    assert game_map.screen is None
+    assert all(tile is frame_tile for tile in game_map.map_data[0])
+
+
+def test_generator_matches_map_and_its_spawns():
+    for seed in (0, 11, 42):
+        game_map = Map(None, 30, 15, seed=seed)
+        spawns = game_map.select_enemies(1, 2)
+        game_map.place_enemies_on_map(spawns)
+        generated = MapGenerator(30, 15, GenerationParams(cycle=2, boss_defeated=1)).generate(seed)
+        assert generated.grid == game_map.map_data
+        assert [landmark.pos for landmark in generated.structures] == list(game_map.landmarks)
+        assert (generated.placement_failures, generated.carved_cells) == (game_map.placement_failures,
+                                                                         game_map.carved_cells)
+        assert [(s.tier, s.seed, s.pos) for s in generated.spawns] == [(s.tier, s.seed, s.pos) for s in spawns]
+
+
+def test_generator_reuses_grid_and_wraps_into_a_map():
+    generator = MapGenerator(30, 15)
+    first = generator.generate(3)
+    rows = list(first.grid)
+    second = generator.generate(5, first.grid, first.rng)
+    assert second.grid is first.grid and all(a is b for a, b in zip(rows, second.grid))
+    assert second.grid == generate_map(5, 30, 15).grid
+
+    game_map = Map.from_generated(None, generate_map(5, 30, 15))
+    assert game_map.map_data == Map(None, 30, 15, seed=5).map_data
+    assert set(game_map.landmarks) == {landmark.pos for landmark in second.structures}
+
+
+def test_generated_map_pickles_as_tile_ids():
+    generated = generate_map(9, 30, 15, GenerationParams(cycle=1))
+    loaded = pickle.loads(pickle.dumps(generated))
+    assert all(a is b for row_a, row_b in zip(generated.grid, loaded.grid) for a, b in zip(row_a, row_b))
+    assert [(l.tile, l.pos) for l in loaded.structures] == [(l.tile, l.pos) for l in generated.structures]
+    assert loaded.structures[0].tile in TILE_TABLE
+    assert [s.pos for s in loaded.spawns] == [s.pos for s in generated.spawns]
+
+
+def test_generator_imports_without_pygame():
+    script = ("import sys; sys.modules['pygame'] = None\n"
+              "from map_system.generator import generate_map\n"
+              "print(len(generate_map(1, 30, 15).structures))")
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=SRC))
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout.split()[-1]) > 0
@@ -0,0 +1,53 @@
+import pygame
+import pytest
+
+from battle_system.hero import Hero
+from battle_system.inventory import Inventory
+from battle_system.item import (ITEM_REGISTRY, Cure, Throwable, create_item_from_name, generate_cure,
+                                generate_throwable, get_item_shop_stock)
+
+
+def test_registry_returns_shared_prototypes():
+    potion = create_item_from_name("Small Health Potion")
+    assert isinstance(potion, Cure)
+    assert potion is generate_cure("small")
+    assert potion is ITEM_REGISTRY.by_id(potion.item_id)
+    assert isinstance(generate_throwable("mids"), Throwable)
+    assert create_item_from_name("Dragon Scale") is None
+    assert get_item_shop_stock() is get_item_shop_stock()
+
+
+def test_inventory_stacks_items():
+    inventory = Inventory()
+    potion = generate_cure("small")
+    bomb = generate_throwable("mids")
+    for _ in range(300):
+        inventory.add(potion)
+    inventory.add("Bomb", 2)
+
+    assert len(inventory) == 302
+    assert inventory.stacks() == [(potion, 300), (bomb, 2)]
+    assert inventory.take(1) is bomb
+    assert inventory.take(1) is bomb
+    assert inventory.stacks() == [(potion, 300)]
+    assert not inventory.remove(bomb)
+    assert inventory.remove(potion, 300)
+    assert not inventory
+
+    assert inventory.count("Dragon Scale") == 0  # Not an item
+    assert not inventory.remove("Dragon Scale")
+    with pytest.raises(KeyError):
+        inventory.add("Dragon Scale")
+
+
+def test_using_a_stacked_cure_heals_hero():
+    pygame.init()
+    try:
+        hero = Hero("Hero", 100)
+        hero.health = 50
+        hero.items.add(generate_cure("small"), 3)
+        hero.items.take(0).use(hero)
+        assert hero.health == 65
+        assert hero.items.count("Small Health Potion") == 2
+    finally:
+        pygame.quit()
@@ -5,7 +5,7 @@ import random as rand
 import pytest
 
 from map_system.map import Map
-from map_system.tiles import load_tile_images
+from map_system.tiles import frame_tile, load_tile_images
 from battle_system.enemy import generate_enemy
 
 class MapTester:
@@ -89,6 +89,52 @@ def test_map_system_load():
     finally:
         pygame.quit()
 
+def test_spawn_descriptors_materialize_deterministically():
+    """Maps store spawn descriptors; the same descriptor always builds the same enemy."""
+    try:
+        tester = MapTester(headless=True)
+        spawns = tester.game_map.select_enemies(0, 1)
+        tester.game_map.place_enemies_on_map(spawns)
+        spawn = spawns[0]
+        first, second = spawn.materialize(), spawn.materialize()
+        assert first is not second
+        assert (first.name, first.health, first.weapon.name) == (second.name, second.health, second.weapon.name)
+        assert first.pos == spawn.pos
+        assert tester.game_map.enemy_at(*spawn.pos) is spawn
+    finally:
+        pygame.quit()
+
+def test_landmarks_and_enemies_are_spatially_indexed():
+    """Structures and placed spawns are found through the map's spatial hash."""
+    try:
+        tester = MapTester(headless=True)
+        game_map = tester.game_map
+        for (x, y), landmark in game_map.landmarks.items():
+            assert game_map.map_data[x][y] is landmark.tile
+            assert game_map.nearest_landmark(x, y, landmark.name) is landmark
+
+        spawn = next(iter(game_map.enemies))
+        x, y = spawn.pos
+        assert spawn in game_map.enemies_near(x, y, 1)
+        assert spawn in game_map.enemies_in_rect(x, y, x, y)
+    finally:
+        pygame.quit()
+
+def test_reset_map_regenerates_in_place():
+    """reset_map() reuses the map's rows and gives the same map as a fresh one for that seed."""
+    game_map = Map(None, 30, 15, seed=5)
+    rows, first_row = game_map.map_data, game_map.map_data[0]
+    cells, buckets = game_map.occupancy.cells, game_map.spatial.buckets
+    game_map.place_enemies_on_map(game_map.select_enemies(0, 1))
+    game_map.reset_map(11)
+    fresh = Map(None, 30, 15, seed=11)
+    assert game_map.map_data is rows and rows[0] is first_row
+    assert game_map.occupancy.cells is cells and game_map.spatial.buckets is buckets
+    assert len(game_map.occupancy) == 0 and not any(cells)
+    assert game_map.seed == 11 and game_map.map_data == fresh.map_data
+    assert game_map.landmarks.keys() == fresh.landmarks.keys()
+    assert all(tile is frame_tile for tile in rows[0] + rows[-1] + [row[0] for row in rows])
+
 if __name__ == "__main__":
     # If you run this file manually, it opens the window and runs the loop
     tester = MapTester(headless=False)
@@ -0,0 +1,37 @@
+import pytest
+
+from map_system.occupancy import OccupancyGrid
+from map_system.spawns import SpawnDescriptor
+
+
+def test_place_move_and_remove_are_tracked_per_cell():
+    grid = OccupancyGrid(width=10, height=5)
+    first = SpawnDescriptor("low", 0, seed=1)
+    second = SpawnDescriptor("mid", 0, seed=2)
+
+    assert grid.place(first, 2, 3)
+    assert first.pos == (2, 3)
+    assert grid.get(2, 3) is first
+    assert grid.get(3, 2) is None
+    assert not grid.place(second, 2, 3)  # Cell already taken
+
+    assert grid.place(second, 4, 9)
+    assert grid.move(first, 1, 1)
+    assert not grid.is_occupied(2, 3)
+    assert grid.get(1, 1) is first
+    assert list(grid) == [first, second]
+
+    assert grid.remove(first)
+    assert not grid.remove(first)
+    assert grid.get(1, 1) is None
+    assert len(grid) == 1
+    assert grid.get(-1, 0) is None
+
+
+def test_place_rejects_cells_outside_the_grid():
+    grid = OccupancyGrid(width=10, height=5)
+    spawn = SpawnDescriptor("low", 0, seed=1)
+    for x, y in ((-1, 0), (0, -1), (5, 0), (0, 10)):
+        with pytest.raises(ValueError):
+            grid.place(spawn, x, y)
+    assert len(grid) == 0 and spawn.pos is None
@@ -0,0 +1,30 @@
+import random
+
+import pygame
+
+from battle_system.enemy import generate_enemy
+from battle_system.hero import Hero
+from battle_system.party import PartyBattle
+from battle_system.weapon import Weapon
+
+
+def test_party_battle_resolves_rounds_over_arrays():
+    """A party fights a 12-enemy group to the end, with health synced back to objects."""
+    pygame.init()
+    try:
+        random.seed(11)
+        heroes = [Hero(name=f"Hero {i}", health=400) for i in range(3)]
+        for hero in heroes:
+            hero.equip_weapon(Weapon(name="Long Sword", weapon_type="sharp", damage=25, value=30, tier="high"))
+        enemies = [generate_enemy(tier, 0) for tier in ["low"] * 8 + ["mid"] * 4]
+
+        battle = PartyBattle(heroes, enemies, rng=random.Random(5))
+        log = battle.resolve_round()
+        assert battle.round == 1 and log
+        assert all(c.health == hp for c, hp in zip(battle.combatants, battle.health))
+
+        assert battle.run() is True
+        assert battle.finished
+        assert all(not enemy.alive for enemy in enemies)
+    finally:
+        pygame.quit()
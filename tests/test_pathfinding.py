@@ -0,0 +1,57 @@
+import pygame
+
+from map_system.map import Map
+from map_system.tiles import plains, river, village
+
+
+def _open_map():
+    """A 30x20 map of plains inside the frame with a village at (5, 15)."""
+    game_map = Map(pygame.Surface((1, 1)), 30, 20, seed=3)
+    for x in range(1, game_map.height - 1):
+        for y in range(1, game_map.width - 1):
+            game_map.map_data[x][y] = plains
+    game_map.landmarks = {}
+    game_map.spatial.clear()
+    game_map.player_pos = (5, 5)
+    game_map.set_tile(5, 15, village)
+    return game_map
+
+
+def test_paths_reach_structures_and_are_cached():
+    pygame.init()
+    try:
+        game_map = _open_map()
+        landmark = game_map.nearest_landmark(5, 5, "village")
+        assert landmark.pos == (5, 15)
+
+        paths = game_map.get_pathfinder()
+        path = paths.find_path((5, 5), landmark.pos)
+        assert len(path) == 10 and path[-1] == (5, 15)
+        assert all(abs(ax - bx) + abs(ay - by) == 1 for (ax, ay), (bx, by) in zip(((5, 5),) + path, path))
+        assert paths.find_path((5, 5), (5, 15)) is path
+        assert paths.hits == 1
+    finally:
+        pygame.quit()
+
+
+def test_only_paths_through_changed_tiles_are_invalidated():
+    pygame.init()
+    try:
+        game_map = _open_map()
+        paths = game_map.get_pathfinder()
+        to_village = paths.find_path((5, 5), (5, 15))
+        elsewhere = paths.find_path((12, 2), (15, 2))
+
+        blocked = to_village[3]
+        game_map.set_tile(blocked[0], blocked[1], river)
+        assert paths.find_path((12, 2), (15, 2)) is elsewhere
+        detour = paths.find_path((5, 5), (5, 15))
+        assert blocked not in detour
+        assert len(detour) == 12
+
+        # Wall off the village completely
+        for x, y in ((4, 15), (6, 15), (5, 14), (5, 16)):
+            game_map.set_tile(x, y, river)
+        assert paths.find_path((5, 5), (5, 15)) is None
+    finally:
+        pygame.quit()
@@ -0,0 +1,62 @@
+import pygame
+
+from map_system.map import Map
+from map_system.pathing import UNREACHED, DistanceField
+from map_system.spawns import SpawnDescriptor
+from map_system.tiles import plains, river
+
+
+def _open_map():
+    """A 30x20 map of plains inside the frame, with a river wall at column 10 open only on row 1."""
+    game_map = Map(pygame.Surface((1, 1)), 30, 20, seed=3)
+    for x in range(1, game_map.height - 1):
+        for y in range(1, game_map.width - 1):
+            game_map.map_data[x][y] = river if y == 10 and x != 1 else plains
+    game_map.landmarks = {}
+    game_map.spatial.clear()
+    game_map.player_pos = (5, 5)
+    game_map.spatial.insert(game_map.map_data[5][5], 5, 5)
+    return game_map
+
+
+def test_distance_field_routes_around_walls():
+    pygame.init()
+    try:
+        game_map = _open_map()
+        field = DistanceField(game_map.width, game_map.height)
+        field.compute(game_map.walkable_mask(), (5, 5))
+        assert field.distance(5, 5) == 0
+        assert field.distance(5, 8) == 3
+        assert field.distance(5, 10) == UNREACHED  # River
+        assert field.distance(5, 11) == 4 + 6 + 4  # Up to the ford on row 1 and back down
+        assert field.distance(0, 0) == UNREACHED  # Frame
+
+        field.compute(game_map.walkable_mask(), (5, 5), max_distance=3)
+        assert field.distance(5, 8) == 3
+        assert field.distance(5, 9) == UNREACHED
+    finally:
+        pygame.quit()
+
+
+def test_roaming_enemies_chase_and_flee():
+    pygame.init()
+    try:
+        game_map = _open_map()
+        chaser = SpawnDescriptor("high", 0, seed=1, behavior="chase")
+        fleer = SpawnDescriptor("low", 0, seed=2, behavior="flee")
+        idle = SpawnDescriptor("mid", 0, seed=3)
+        for spawn, (x, y) in ((chaser, (5, 8)), (fleer, (7, 5)), (idle, (3, 5))):
+            game_map.occupancy.place(spawn, x, y)
+            game_map.spatial.insert(spawn, x, y)
+
+        assert game_map.advance_enemies() == []
+        assert chaser.pos == (5, 7)
+        assert fleer.pos == (8, 5)
+        assert idle.pos == (3, 5)
+        assert game_map.enemy_at(5, 7) is chaser and game_map.enemy_at(5, 8) is None
+
+        game_map.advance_enemies()
+        assert game_map.advance_enemies() == [chaser]  # Adjacent: it attacks instead of moving
+        assert chaser.pos == (5, 6)
+    finally:
+        pygame.quit()
@@ -0,0 +1,60 @@
+import csv
+import json
+
+import pygame
+
+from game_system.profiler import FrameProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = FrameProfiler()
+    profiler.begin_frame()
+    with profiler.scope("work"):
+        pass
+    profiler.end_frame()
+    assert not profiler.frames
+    assert profiler.scope("a") is profiler.scope("b")  # Shared null scope
+
+
+def test_frames_scopes_and_exports(tmp_path):
+    profiler = FrameProfiler(window=3)
+    profiler.toggle()
+    with profiler.scope("map: biomes"):  # Outside a frame: attached to the next one
+        pass
+    for _ in range(5):
+        profiler.begin_frame()
+        with profiler.scope("outer"):
+            with profiler.scope("inner"):
+                pass
+        profiler.end_frame()
+
+    assert len(profiler.frames) == 3  # Rolling window
+    events = profiler.frames[-1][2]
+    assert [(name, depth) for name, _, _, depth in events] == [("inner", 1), ("outer", 0)]
+    assert set(profiler.scope_averages_ms()) == {"inner", "outer"}
+
+    csv_path, trace_path = profiler.export(str(tmp_path))
+    with open(csv_path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["frame", "scope", "start_ms", "duration_ms", "depth"]
+    assert len(rows) == 1 + 3 * 3
+    with open(trace_path) as f:
+        trace = json.load(f)["traceEvents"]
+    assert len(trace) == 9 and all(event["ph"] == "X" for event in trace)
+
+
+def test_overlay_draws():
+    pygame.init()
+    try:
+        surface = pygame.Surface((400, 300))
+        profiler = FrameProfiler()
+        profiler.toggle()
+        profiler.begin_frame()
+        with profiler.scope("map draw"):
+            pass
+        profiler.end_frame()
+        profiler.draw_overlay(surface, pygame.font.Font(None, 18))
+        budget_line = surface.get_at((400 - 10 - 60, 10 + 30))  # Half-way up the graph
+        assert budget_line.r > 0 and budget_line.g > 0 and budget_line.b == 0
+    finally:
+        pygame.quit()
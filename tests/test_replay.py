@@ -0,0 +1,108 @@
+import random
+import time
+
+from battle_system.enemy import Boss
+from game_system.engine import GameEngine
+from game_system.replay import InputRecorder, iter_records, read_recording, replay, state_digest
+from game_system.save import capture
+
+
+def _record_session(steps=1500):
+    """Plays a bot session in real-time mode, recording every command like the pygame client does."""
+    engine = GameEngine(realtime=True)
+    recorder = InputRecorder(rng_seed=42)
+    bot = random.Random(7)  # The bot's own choices are not part of the game's RNG stream
+    moves = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+    def command(name, *args):
+        seed = engine.seed
+        recorder.record(name, args)
+        engine.apply((name,) + args)
+        if engine.seed != seed:
+            recorder.checkpoint(engine)
+
+    command("new_game")
+    for _ in range(steps):
+        if not engine.running:
+            break
+        if engine.in_battle:
+            command("submit", "attack")
+            for _ in range(bot.randint(1, 40)):
+                command("wait", 0.016)
+        elif engine.prompt is not None:
+            command("choose", {"loot": bot.choice("ps"), "village": "4"}.get(engine.prompt, "b"))
+        elif bot.random() < 0.05:
+            command("travel", bot.choice(("village", "treasure")))
+            for _ in range(bot.randint(1, 30)):
+                command("wait", 0.017)
+        else:
+            command("move", *bot.choice(moves))
+    recorder.finish(engine)
+    return engine, recorder.to_bytes()
+
+
+def test_replay_reproduces_the_recorded_session():
+    engine, data = _record_session()
+    realtime, rng_seed, body = read_recording(data)
+    assert realtime and rng_seed == 42
+    assert len(data) < 4096  # Frame runs are merged and the body is compressed
+
+    ops = [op for op, _ in iter_records(body)]
+    result = replay(data)
+    assert result.ok, result.mismatches
+    assert result.commands > 0 and result.frames > 0
+    assert len(ops) >= result.commands
+    assert state_digest(result.engine) == state_digest(engine)
+    assert result.engine.hero.player_pos == engine.hero.player_pos
+
+
+def test_replay_reports_divergence():
+    _, data = _record_session(300)
+    realtime, rng_seed, body = read_recording(data)
+    tampered = InputRecorder(realtime=realtime, rng_seed=rng_seed + 1)
+    tampered.records = bytearray(body)
+    assert not replay(tampered.to_bytes()).ok
+
+
+def _record_boss_fight(rounds=12):
+    """Records a session that loads a game beside the shrine, walks in and fights the boss."""
+    engine = GameEngine(realtime=True)
+    recorder = InputRecorder(rng_seed=5)
+    engine.new_game(seed=321)
+    (x, y), = [pos for pos, landmark in engine.game_map.landmarks.items() if landmark.name == "shrine"]
+    for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+        if engine.game_map.map_data[x + dx][y + dy].walkable and engine.game_map.enemy_at(x + dx, y + dy) is None:
+            break
+    engine.move_hero(x + dx, y + dy)
+    engine.hero.health = engine.hero.health_max = 2000  # Long enough for the boss to use its skills
+
+    def command(name, *args):
+        recorder.record(name, args)
+        engine.apply((name,) + args)
+
+    command("load", capture(engine))
+    command("move", -dx, -dy)
+    assert isinstance(engine.current_enemy, Boss)
+    for _ in range(rounds):
+        if not engine.in_battle:
+            break
+        command("submit", "attack")
+        for _ in range(30):
+            command("wait", 0.016)
+    recorder.finish(engine)
+    return engine, recorder.to_bytes()
+
+
+def test_replay_reproduces_a_boss_fight_on_a_slow_machine(monkeypatch):
+    engine, data = _record_boss_fight()
+    assert engine.hero.health < 2000  # The boss got its turns
+    clock = [0.0]
+
+    def slow_clock():  # Every reading is a second later, as if each search step stalled
+        clock[0] += 1.0
+        return clock[0]
+
+    monkeypatch.setattr(time, "perf_counter", slow_clock)
+    result = replay(data)
+    assert result.ok, result.mismatches
+    assert result.engine.battle_log == engine.battle_log
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pygame
+
+from battle_system.hero import Hero
+from battle_system.item import generate_cure
+from game_system.save import SaveWriter, capture, read_save, restore
+from map_system.map import Map
+from map_system.tiles import treasure_empty
+
+
+def _new_game(seed=5, cycle=2):
+    screen = pygame.Surface((1, 1))
+    game = SimpleNamespace(screen=screen, seed=seed, cycle=cycle, boss_defeated=1, hero=Hero("Hero", 150))
+    game.game_map = Map(screen, 30, 15, seed=seed)
+    game.game_map.place_enemies_on_map(game.game_map.select_enemies(game.boss_defeated, game.cycle))
+    game.game_map.enable_fog()
+    return game
+
+
+def test_save_round_trip_restores_map_changes_and_hero(tmp_path):
+    pygame.init()
+    try:
+        game = _new_game()
+        game_map = game.game_map
+        treasure_pos = next(pos for pos, landmark in game_map.landmarks.items() if landmark.name == "treasure")
+        game_map.set_tile(*treasure_pos, treasure_empty)
+        defeated = next(iter(game_map.enemies))
+        game_map.remove_enemy(defeated)
+        game_map.update_player_position(1, 1, 1, 2)
+        game.hero.items.add(generate_cure("small"), 4)
+        game.hero.cashpile = 321
+        game.hero.level_up()
+
+        data = capture(game)
+        assert len(data) < 1024
+
+        writer = SaveWriter()
+        path = str(tmp_path / "autosave.sav")
+        writer.submit(path, data)
+        writer.wait()
+
+        loaded = SimpleNamespace(screen=game.screen)
+        restore(loaded, read_save(path))
+        loaded_map = loaded.game_map
+        assert (loaded.seed, loaded.cycle, loaded.boss_defeated) == (5, 2, 1)
+        assert loaded_map.map_data[treasure_pos[0]][treasure_pos[1]] is treasure_empty
+        assert treasure_pos not in loaded_map.landmarks
+        assert loaded_map.enemy_at(*defeated.pos) is None
+        assert sorted((e.pos, e.seed) for e in loaded_map.enemies) == sorted((e.pos, e.seed) for e in game_map.enemies)
+        assert loaded_map.player_pos == loaded.hero.player_pos == (1, 2)
+        assert loaded_map.fov.explored == game_map.fov.explored
+
+        hero = loaded.hero
+        assert (hero.level, hero.cashpile, hero.health_max, hero.armor) == (2, 321, 160, 6)
+        assert hero.weapon.name == "Fists"
+        assert hero.items.count("Small Health Potion") == 4
+    finally:
+        pygame.quit()
+
+
+def test_save_round_trip_past_cycle_255():
+    pygame.init()
+    try:
+        game = _new_game(cycle=300)
+        loaded = SimpleNamespace(screen=game.screen)
+        restore(loaded, capture(game))
+        assert loaded.cycle == 300
+        assert sorted((e.pos, e.seed, e.cycle) for e in loaded.game_map.enemies) == \
+            sorted((e.pos, e.seed, e.cycle) for e in game.game_map.enemies)
+        assert all(e.cycle == 300 for e in loaded.game_map.enemies)
+    finally:
+        pygame.quit()
@@ -0,0 +1,28 @@
+from game_system.scheduler import FixedStepClock, TurnScheduler
+
+
+def test_scheduler_runs_actions_in_time_order():
+    """Actions fire in due order, only once their time is reached, and can be cancelled."""
+    scheduler = TurnScheduler()
+    fired = []
+    scheduler.schedule(0.5, fired.append, "late")
+    scheduler.schedule(0.1, fired.append, "early")
+    cancelled = scheduler.schedule(0.2, fired.append, "cancelled")
+    scheduler.cancel(cancelled)
+
+    scheduler.step(0.05)
+    assert fired == []
+    scheduler.step(0.1)
+    assert fired == ["early"]
+    assert scheduler.run_until_idle() == 1
+    assert fired == ["early", "late"]
+    assert scheduler.next_time() is None
+
+
+def test_fixed_step_clock_is_independent_of_frame_rate():
+    """The same wall time yields the same number of simulation steps at any frame rate."""
+    fast, slow = FixedStepClock(step=0.1), FixedStepClock(step=0.1)
+    fast_steps = sum(fast.advance(1 / 60) for _ in range(60))
+    slow_steps = sum(slow.advance(1 / 10) for _ in range(10))
+    assert fast_steps in (9, 10) and slow_steps in (9, 10)
+    assert 0.0 <= fast.alpha < 1.0
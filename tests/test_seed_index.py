@@ -0,0 +1,37 @@
+import contextlib
+import io
+
+from map_system.seed_index import COLUMNS, SeedIndex, extract_features, main
+
+
+def _features(seed):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return dict(zip((name for name, _ in COLUMNS), extract_features(seed)))
+
+
+def test_extract_features_describes_the_map():
+    features = _features(3)
+    assert features["seed"] == 3
+    assert features["shrines"] == 1
+    assert 0 < features["shrine_distance"] < 0xFFFF
+    assert features["villages_reachable"] <= features["villages"]
+    assert 95 <= sum(value for name, value in features.items() if name.endswith("_pct")) <= 105
+    assert _features(3) == features  # Deterministic per seed
+
+
+def test_index_round_trip_and_query(tmp_path):
+    index = SeedIndex.build(range(12), workers=2)
+    assert list(index.columns["seed"]) == list(range(12))
+
+    path = str(tmp_path / "seeds.idx")
+    index.save(path)
+    loaded = SeedIndex.load(path)
+    assert not loaded._sorted  # Sorted views stay in the file data until a query needs them
+    assert loaded.features(5) == index.features(5)
+    assert list(loaded._sorted) == ["seed"] and loaded._sorted["seed"] == index._sorted["seed"]
+
+    expected = [seed for seed in range(12)
+                if index.features(seed)["shrine_distance"] <= 15 and index.features(seed)["villages"] >= 1]
+    assert loaded.query(shrine_distance=(None, 15), villages=(1, None)) == expected
+    assert loaded.query(villages=2, limit=1) == [s for s in range(12) if index.features(s)["villages"] == 2][:1]
+    assert main(["--index", path, "query", "bogus=1"]) == 2
@@ -0,0 +1,49 @@
+import random
+
+from map_system.spatial_hash import SpatialHash
+
+
+class Marker:
+    def __init__(self, name):
+        self.name = name
+
+
+def _distance(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def test_queries_match_brute_force_after_moves():
+    rng = random.Random(7)
+    index = SpatialHash(cell_size=8)
+    markers = [Marker(i) for i in range(400)]
+    for marker in markers:
+        index.insert(marker, rng.randrange(200), rng.randrange(300))
+    for marker in markers[::3]:
+        index.move(marker, rng.randrange(200), rng.randrange(300))
+    for marker in markers[::7]:
+        index.remove(marker)
+    live = {m: index.position(m) for m in markers if m in index}
+
+    for _ in range(50):
+        x, y = rng.randrange(200), rng.randrange(300)
+        radius = rng.uniform(1, 40)
+        expected = {m for m, pos in live.items() if _distance(pos, (x, y)) <= radius * radius}
+        assert set(index.query_radius(x, y, radius)) == expected
+
+        x1, y1 = x + rng.randrange(30), y + rng.randrange(30)
+        expected = {m for m, (px, py) in live.items() if x <= px <= x1 and y <= py <= y1}
+        assert set(index.query_rect(x, y, x1, y1)) == expected
+
+        nearest = index.nearest(x, y, k=5)
+        expected = sorted(_distance(pos, (x, y)) for pos in live.values())[:5]
+        assert [_distance(live[m], (x, y)) for m in nearest] == expected
+
+
+def test_nearest_respects_predicate_and_radius():
+    index = SpatialHash(cell_size=4)
+    village, cave = Marker("village"), Marker("cave")
+    index.insert(village, 40, 40)
+    index.insert(cave, 2, 2)
+    assert index.nearest(0, 0, predicate=lambda m: m.name == "village") == [village]
+    assert index.nearest(0, 0, max_radius=10, predicate=lambda m: m.name == "village") == []
+    assert index.nearest(0, 0) == [cave]
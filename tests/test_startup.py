@@ -0,0 +1,34 @@
+import io
+
+import pygame
+
+from game_system.startup import StartupProfiler
+from map_system import tiles
+
+
+def test_tile_images_load_once_after_display_exists():
+    pygame.init()
+    try:
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        tiles.load_tile_images()
+        image = tiles.plains.image
+        assert image is not None and tiles.tile_images["plains"] is image
+        assert tiles.treasure_empty.image is not None
+        tiles.load_tile_images()
+        assert tiles.plains.image is image  # Second call is a no-op
+    finally:
+        pygame.quit()
+
+
+def test_profiler_reports_phases_once():
+    profiler = StartupProfiler(enabled=True)
+    profiler.mark("imports")
+    out = io.StringIO()
+    profiler.report(out)
+    assert "imports" in out.getvalue()
+    assert profiler.total >= sum(seconds for _, seconds in profiler.phases[1:])
+
+    disabled = StartupProfiler()
+    disabled.mark("imports")
+    disabled.first_frame()
+    assert disabled.phases == [] and not disabled.reported
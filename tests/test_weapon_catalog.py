@@ -0,0 +1,39 @@
+import random
+
+from battle_system.weapon import generate_weapon
+from battle_system.weapon_catalog import CATALOG_SOURCE, WeaponCatalog, load_catalog, parse_weapon_list
+
+
+def test_catalog_indexes_full_weapon_list():
+    """The whole list is parsed and indexed by tier, type and natural flag."""
+    catalog = parse_weapon_list()
+    assert len(catalog) > 500
+    assert sum(len(catalog.ids(tier)) for tier in ("low", "mid", "high")) == len(catalog)
+    dagger = catalog.find("Dagger")
+    assert catalog.tier(dagger) == "low" and catalog.weapon_type(dagger) == "sharp"
+    assert all(catalog.natural[i] for i in catalog.ids("high", natural=True))
+    assert all(catalog.weapon_type(i) == "whip" for i in catalog.ids("low", weapon_type="whip"))
+    sharp = catalog.ids("high", weapon_type="sharp", natural=False)
+    assert sharp and all(catalog.weapon_type(i) == "sharp" and not catalog.natural[i] for i in sharp)
+    assert len(catalog.ids("high", weapon_type="sharp", natural=True)) == 0  # Both filters apply
+
+
+def test_catalog_binary_cache_round_trip(tmp_path):
+    """The binary cache reloads an identical catalog and is rejected once the source changes."""
+    cache_path = str(tmp_path / "weapons.bin")
+    parsed = load_catalog(cache_path=cache_path)
+    cached = load_catalog(cache_path=cache_path)
+    assert cached.names == parsed.names
+    assert list(cached.ids("mid", natural=False)) == list(parsed.ids("mid", natural=False))
+    with open(cache_path, 'rb') as f:
+        assert WeaponCatalog.from_bytes(f.read(), 0, 0) is None
+
+
+def test_generate_weapon_samples_catalog_filters():
+    """Shop-style picks never return natural weapons."""
+    rng = random.Random(4)
+    catalog = parse_weapon_list(CATALOG_SOURCE)
+    for _ in range(50):
+        weapon = generate_weapon("mid", cycle=2, rng=rng, natural=False)
+        weapon_id = catalog.find(weapon.name[:-2])
+        assert weapon.name.endswith("+2") and not catalog.natural[weapon_id]